@@ -24,6 +24,45 @@ def random_rgb(exemption_list: Optional[ValuesView[RGB]] = None) -> RGB:
 
     return new_color
 
+def id_to_rgb(shape_id: int) -> RGB:
+    """
+    Encodes an id into a color for color picking, each channel holds 8 bits of the id.
+
+    Arguments:
+        shape_id (int): An id between 0 and 16,777,215
+
+    Raises:
+        ValueError: If the id does not fit in 24 bits.
+
+    Returns:
+        RGB: The red, green and blue floats, each an exact multiple of 1 / 255.
+
+    Examples:
+        >>> id_to_rgb(256)
+        (0.0, 0.00392156862745098, 0.0)
+    """
+    if shape_id < 0 or shape_id > 0xFFFFFF:
+        raise ValueError('Id must fit in 24 bits to be encoded into a color')
+
+    return ((shape_id >> 16 & 0xFF) / 255, (shape_id >> 8 & 0xFF) / 255, (shape_id & 0xFF) / 255)
+
+def rgb_to_id(rgb: Iterable[int]) -> int:
+    """
+    Decodes the id encoded by id_to_rgb from the bytes read back from the picking pass.
+
+    Arguments:
+        rgb (Iterable[int]): The red, green and blue bytes between 0 - 255.
+
+    Returns:
+        int: The decoded id.
+
+    Examples:
+        >>> rgb_to_id((0, 1, 0))
+        256
+    """
+    red, green, blue = (int(color) for color in rgb)
+    return red << 16 | green << 8 | blue
+
 def rgb_to_hex(rgb: Tuple[float, float, float]) -> str:
     """
     Convert a tuple of three floats representing RGB values to a hexadecimal color string.
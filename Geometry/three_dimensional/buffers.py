@@ -1,4 +1,8 @@
 from custom_types import RGB
-from typing import Dict
+from typing import Dict, Iterator
+from itertools import count
 
-buffer_colors: Dict[int, RGB] = {}
\ No newline at end of file
+buffer_colors: Dict[int, RGB] = {}
+
+# 0 is kept for the empty background of the picking pass
+shape_ids: Iterator[int] = count(1)
\ No newline at end of file
@@ -0,0 +1,322 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Dict
+from numpy import cross, einsum, errstate, float64, fmax, fmin, inf, maximum, minimum, where
+from custom_types import *
+
+if TYPE_CHECKING:
+    from geometry.three_dimensional.shape import Shape
+
+BOUNDING_BOX: TypeAlias = NDArray # (2, 3) array of the minimum and maximum corners
+
+def ray_box_distance(origin: NDArray, inverse_direction: NDArray, box: BOUNDING_BOX) -> Optional[float]:
+    """
+    Returns the distance along the ray to where it enters the box
+
+    Arguments:
+        origin (NDArray): The start of the ray.
+        inverse_direction (NDArray): 1 divided by each component of the rays direction.
+        box (BOUNDING_BOX): The minimum and maximum corners of the box.
+
+    Returns:
+        The distance or None if the ray misses the box
+    """
+    with errstate(invalid='ignore'):
+        near_planes: NDArray = (box[0] - origin) * inverse_direction
+        far_planes: NDArray = (box[1] - origin) * inverse_direction
+
+    # fmin and fmax ignore the nan of a ray that lies on a plane of the box
+    entry_distance: float = max(fmin(near_planes, far_planes).max(), 0.0)
+    exit_distance: float = fmax(near_planes, far_planes).min()
+
+    return entry_distance if entry_distance <= exit_distance else None
+
+def ray_triangles_distance(origin: NDArray, direction: NDArray, triangles: NDArray) -> Optional[float]:
+    """
+    Returns the distance along the ray to the nearest triangle it hits (Moller-Trumbore on every triangle at once)
+
+    Arguments:
+        origin (NDArray): The start of the ray.
+        direction (NDArray): The direction of the ray.
+        triangles (NDArray): A (M, 3, 3) array of the triangles corners.
+
+    Returns:
+        The distance or None if the ray misses every triangle
+    """
+    first_corners: NDArray = triangles[:, 0].astype(float64)
+    first_edges: NDArray = triangles[:, 1] - first_corners
+    second_edges: NDArray = triangles[:, 2] - first_corners
+
+    direction_cross_edge: NDArray = cross(direction, second_edges)
+    determinants: NDArray = einsum('ij,ij->i', first_edges, direction_cross_edge)
+
+    # rays parallel to a triangle and degenerate triangles (like the poles of a sphere) can not be hit
+    facing: NDArray = abs(determinants) > 1e-12
+    inverse_determinants: NDArray = 1 / where(facing, determinants, 1)
+
+    to_origin: NDArray = origin - first_corners
+    u: NDArray = einsum('ij,ij->i', to_origin, direction_cross_edge) * inverse_determinants
+
+    origin_cross_edge: NDArray = cross(to_origin, first_edges)
+    v: NDArray = (origin_cross_edge @ direction) * inverse_determinants
+    distances: NDArray = einsum('ij,ij->i', second_edges, origin_cross_edge) * inverse_determinants
+
+    hits: NDArray = facing & (u >= 0) & (v >= 0) & (u + v <= 1) & (distances >= 0)
+
+    return float(distances[hits].min()) if hits.any() else None
+
+def surface_area(box: BOUNDING_BOX) -> float:
+    """
+    Returns the surface area of the box, used as the cost of a node in the hierarchy
+
+    Arguments:
+        box (BOUNDING_BOX): The minimum and maximum corners of the box.
+    """
+    width, height, depth = box[1] - box[0]
+    return 2 * (width * height + height * depth + depth * width)
+
+def merge_boxes(first_box: BOUNDING_BOX, second_box: BOUNDING_BOX) -> BOUNDING_BOX:
+    """
+    Returns the smallest box enclosing both boxes
+
+    Arguments:
+        first_box (BOUNDING_BOX): The first box.
+        second_box (BOUNDING_BOX): The second box.
+    """
+    merged_box: BOUNDING_BOX = first_box.copy()
+    merged_box[0] = minimum(first_box[0], second_box[0])
+    merged_box[1] = maximum(first_box[1], second_box[1])
+
+    return merged_box
+
+class BoundingVolume:
+    """
+    A node of the BoundingVolumeHierarchy, leaves hold a shape and branches hold two nodes
+    """
+
+    def __init__(self, box: BOUNDING_BOX, shape: Optional[Shape] = None) -> None:
+        """
+        Initializes the node
+
+        Arguments:
+            box (BOUNDING_BOX): The box enclosing the shape or both children.
+            shape (Optional[Shape]): The shape of a leaf, None for branches. Defaults to None.
+
+        Attributes:
+            parent (Optional[BoundingVolume]): The branch holding this node, None for the root.
+            left (Optional[BoundingVolume]): The first child of a branch.
+            right (Optional[BoundingVolume]): The second child of a branch.
+        """
+        self.box: BOUNDING_BOX = box
+        self.shape: Optional[Shape] = shape
+
+        self.parent: Optional[BoundingVolume] = None
+        self.left: Optional[BoundingVolume] = None
+        self.right: Optional[BoundingVolume] = None
+
+    def is_leaf(self) -> bool:
+        """
+        Checks if the node holds a shape
+        """
+        return self.shape is not None
+
+    def children(self) -> Tuple['BoundingVolume', 'BoundingVolume']:
+        """
+        Returns the left and right child of the branch
+        """
+        assert self.left is not None and self.right is not None, 'a branch always holds two nodes'
+        return self.left, self.right
+
+    def refit(self) -> None:
+        """
+        Shrinks or grows the box of the branch to enclose both children
+        """
+        left, right = self.children()
+        self.box = merge_boxes(left.box, right.box)
+
+class BoundingVolumeHierarchy:
+    """
+    Tree of the shapes world bounding boxes for ray casting, changed one shape at a time.
+
+    Shapes are inserted next to the node that grows the least, and a shape that moved or resized
+    is removed and inserted again the next time the hierarchy is used, so a ray only visits
+    the branches whose boxes it passes through.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initializes an empty hierarchy
+
+        Attributes:
+            root (Optional[BoundingVolume]): The top node of the tree.
+            leaves (Dict[int, BoundingVolume]): The leaf of each shape by the shapes id.
+            outdated_shapes (Dict[int, Shape]): The shapes whose bounding box changed since the last refit.
+        """
+        self.root: Optional[BoundingVolume] = None
+        self.leaves: Dict[int, BoundingVolume] = {}
+        self.outdated_shapes: Dict[int, Shape] = {}
+
+    def insert(self, shape: Shape) -> None:
+        """
+        Adds the shape to the hierarchy
+
+        Arguments:
+            shape (Shape): The shape to be added.
+        """
+        if shape.id in self.leaves:
+            self.remove(shape)
+
+        leaf: BoundingVolume = BoundingVolume(shape.world_bounding_box(), shape)
+        self.leaves[shape.id] = leaf
+
+        if self.root is None:
+            self.root = leaf
+            return
+
+        sibling: BoundingVolume = self.root
+
+        # walk down the children that need to grow the least to enclose the new leaf
+        while not sibling.is_leaf():
+            left, right = sibling.children()
+            left_growth: float = surface_area(merge_boxes(left.box, leaf.box)) - surface_area(left.box)
+            right_growth: float = surface_area(merge_boxes(right.box, leaf.box)) - surface_area(right.box)
+            sibling = left if left_growth <= right_growth else right
+
+        branch: BoundingVolume = BoundingVolume(merge_boxes(sibling.box, leaf.box))
+        branch.parent = sibling.parent
+        branch.left = sibling
+        branch.right = leaf
+
+        self.__replace_child(sibling, branch)
+
+        sibling.parent = branch
+        leaf.parent = branch
+
+        self.__refit_ancestors(branch.parent)
+
+    def remove(self, shape: Shape) -> None:
+        """
+        Removes the shape from the hierarchy
+
+        Arguments:
+            shape (Shape): The shape to be removed.
+        """
+        self.outdated_shapes.pop(shape.id, None)
+        leaf: Optional[BoundingVolume] = self.leaves.pop(shape.id, None)
+
+        if leaf is None:
+            return
+
+        branch: Optional[BoundingVolume] = leaf.parent
+
+        if branch is None:
+            self.root = None
+            return
+
+        # the sibling takes the place of the branch that held both leaves
+        left, right = branch.children()
+        sibling: BoundingVolume = right if left is leaf else left
+        sibling.parent = branch.parent
+
+        self.__replace_child(branch, sibling)
+        self.__refit_ancestors(sibling.parent)
+
+    def invalidate(self, shape: Shape) -> None:
+        """
+        Marks the bounding box of the shape as changed, it is updated by the next refit
+
+        Arguments:
+            shape (Shape): The shape that moved or resized.
+        """
+        if shape.id in self.leaves:
+            self.outdated_shapes[shape.id] = shape
+
+    def refit(self) -> None:
+        """
+        Inserts every shape that changed since the last refit again
+        """
+        outdated_shapes: List[Shape] = list(self.outdated_shapes.values())
+        self.outdated_shapes.clear()
+
+        for shape in outdated_shapes:
+            self.insert(shape)
+
+    def raycast(self, origin: NDArray, direction: NDArray) -> Optional[Shape]:
+        """
+        Returns the nearest shape hit by the ray
+
+        Arguments:
+            origin (NDArray): The start of the ray in world space.
+            direction (NDArray): The normalized direction of the ray in world space.
+        """
+        self.refit()
+
+        if self.root is None:
+            return None
+
+        with errstate(divide='ignore'):
+            inverse_direction: NDArray = where(direction != 0, 1 / where(direction != 0, direction, 1), inf)
+
+        nearest_shape: Optional[Shape] = None
+        nearest_distance: float = inf
+
+        root_distance: Optional[float] = ray_box_distance(origin, inverse_direction, self.root.box)
+        nodes: List[Tuple[float, BoundingVolume]] = [] if root_distance is None else [(root_distance, self.root)]
+
+        while len(nodes) > 0:
+            entry_distance, node = nodes.pop()
+
+            # boxes that start behind the nearest hit can not hold a nearer shape
+            if entry_distance > nearest_distance:
+                continue
+
+            if node.shape is not None:
+                distance: Optional[float] = node.shape.ray_distance(origin, direction)
+
+                if distance is not None and distance < nearest_distance:
+                    nearest_distance = distance
+                    nearest_shape = node.shape
+
+                continue
+
+            children: List[Tuple[float, BoundingVolume]] = []
+
+            for child in node.children():
+                child_distance: Optional[float] = ray_box_distance(origin, inverse_direction, child.box)
+
+                if child_distance is not None:
+                    children.append((child_distance, child))
+
+            # the nearer child is visited first so the farther one can be skipped
+            children.sort(key=lambda child: child[0], reverse=True)
+            nodes.extend(children)
+
+        return nearest_shape
+
+    def __replace_child(self, node: BoundingVolume, replacement: BoundingVolume) -> None:
+        """
+        Puts the replacement where the node was in its parent, or at the root
+
+        Arguments:
+            node (BoundingVolume): The node being replaced.
+            replacement (BoundingVolume): The node taking its place.
+        """
+        parent: Optional[BoundingVolume] = replacement.parent
+
+        if parent is None:
+            self.root = replacement
+        elif parent.left is node:
+            parent.left = replacement
+        else:
+            parent.right = replacement
+
+    def __refit_ancestors(self, node: Optional[BoundingVolume]) -> None:
+        """
+        Updates the boxes from the node up to the root
+
+        Arguments:
+            node (Optional[BoundingVolume]): The first branch to be refitted.
+        """
+        while node is not None:
+            node.refit()
+            node = node.parent
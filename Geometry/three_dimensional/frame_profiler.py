@@ -0,0 +1,270 @@
+from geometry.three_dimensional.shape import Shape
+from typing import Any, Callable, Deque, Dict, Set, Type
+from collections import deque
+from time import perf_counter_ns
+from numpy import array, percentile
+from custom_types import *
+from os import makedirs, path
+
+import json
+
+PHASE: TypeAlias = Tuple[str, str, int, int, int] # name, category, start and duration in nanoseconds, shape id or -1
+
+CANVAS_CATEGORY: str = 'canvas'
+SHAPE_CATEGORY: str = 'shape'
+METHOD_CATEGORY: str = 'shape method'
+
+# Shape methods timed while profiling, every subclass overrides them and calls the base method
+PROFILED_METHODS: Dict[str, str] = {
+    'attach_texture': 'texture bind',
+    'draw_grid': 'selection overlay'
+}
+
+class ProfiledFrame:
+    """
+    The timed phases of one frame
+    """
+
+    def __init__(self, start: int, duration: int, phases: List[PHASE]) -> None:
+        """
+        Initializes a finished frame
+
+        Arguments:
+            start (int): When the frame started in nanoseconds, from perf_counter_ns.
+            duration (int): How long the frame took in nanoseconds.
+            phases (List[PHASE]): The phases timed since the previous frame, a picking pass is timed between frames.
+        """
+        self.start: int = start
+        self.duration: int = duration
+        self.phases: List[PHASE] = phases
+
+    def phase_durations(self) -> Dict[str, int]:
+        """
+        Returns the nanoseconds spent in each phase, the draws of every shape add up to 'shape draws'
+        """
+        durations: Dict[str, int] = { 'frame': self.duration }
+
+        for name, category, _, duration, _ in self.phases:
+            phase_name: str = 'shape draws' if category == SHAPE_CATEGORY else name
+            durations[phase_name] = durations.get(phase_name, 0) + duration
+
+        return durations
+
+class FrameProfiler:
+    """
+    Times the phases of the frames drawn by the Canvas, the last frames are kept in a ring buffer.
+
+    While it is disabled nothing is timed and the Shape methods are left untouched.
+    Enabling it swaps the methods of PROFILED_METHODS of every shape class for timing ones,
+    the Canvas times the passes and the draw of every shape itself while it is enabled.
+    """
+
+    def __init__(self, capacity: int = 600) -> None:
+        """
+        Initializes a disabled profiler
+
+        Arguments:
+            capacity (int): The number of frames kept, the oldest frame is dropped for a new one. Defaults to 600
+
+        Attributes:
+            enabled (bool): If the frames are being timed.
+            frames (Deque[ProfiledFrame]): The last finished frames, oldest first.
+            phases (List[PHASE]): The phases of the frame being drawn.
+            frame_start (int): When the frame being drawn started in nanoseconds.
+            timing_methods (Set[str]): The profiled methods being timed, a method calling its base method is timed once.
+            originals (Dict[Tuple[type, str], Callable]): The swapped methods by class and name.
+        """
+        self.enabled: bool = False
+        self.frames: Deque[ProfiledFrame] = deque(maxlen=capacity)
+
+        self.phases: List[PHASE] = []
+        self.frame_start: int = 0
+
+        self.timing_methods: Set[str] = set()
+        self.originals: Dict[Tuple[type, str], Callable] = {}
+
+    def enable(self) -> None:
+        """
+        Starts timing the frames
+        """
+        if self.enabled:
+            return
+
+        shape_classes: List[Type[Shape]] = Shape.__subclasses__()
+
+        for shape_class in shape_classes:
+            shape_classes.extend(subclass for subclass in shape_class.__subclasses__() if subclass not in shape_classes)
+
+        profiled_classes: List[type] = [Shape, *shape_classes]
+
+        for shape_class in profiled_classes:
+            for method_name, phase_name in PROFILED_METHODS.items():
+                if method_name not in shape_class.__dict__:
+                    continue
+
+                method: Callable = shape_class.__dict__[method_name]
+                self.originals[(shape_class, method_name)] = method
+                setattr(shape_class, method_name, self.__timing(phase_name, method))
+
+        self.frames.clear()
+        self.phases = []
+        self.enabled = True
+
+    def disable(self) -> None:
+        """
+        Stops timing the frames and puts the Shape methods back, the timed frames are kept
+        """
+        for (shape_class, method_name), method in self.originals.items():
+            setattr(shape_class, method_name, method)
+
+        self.originals.clear()
+        self.timing_methods.clear()
+        self.enabled = False
+
+    def begin_frame(self) -> None:
+        """
+        Starts timing a frame
+        """
+        self.frame_start = perf_counter_ns()
+
+    def end_frame(self) -> None:
+        """
+        Stores the timed frame in the ring buffer
+        """
+        self.frames.append(ProfiledFrame(self.frame_start, perf_counter_ns() - self.frame_start, self.phases))
+        self.phases = []
+
+    def record(self, name: str, category: str, start: int, shape_id: int = -1) -> None:
+        """
+        Adds a phase that started at start and ends now to the frame being drawn
+
+        Arguments:
+            name (str): The name of the phase.
+            category (str): CANVAS_CATEGORY, SHAPE_CATEGORY or METHOD_CATEGORY.
+            start (int): When the phase started in nanoseconds, from perf_counter_ns.
+            shape_id (int): The id of the shape the phase drew, -1 if it is not a single shape. Defaults to -1
+        """
+        self.phases.append((name, category, start, perf_counter_ns() - start, shape_id))
+
+    def percentiles(self, ranks: Tuple[float, ...] = (50, 95, 99)) -> Dict[str, Tuple[float, ...]]:
+        """
+        Returns the percentiles of the milliseconds spent in each phase per frame, over the frames in the ring buffer.
+        A frame that did not have a phase spent 0 milliseconds in it.
+
+        Arguments:
+            ranks (Tuple[float, ...]): The percentiles to be computed. Defaults to (50, 95, 99)
+        """
+        frame_durations: List[Dict[str, int]] = [frame.phase_durations() for frame in self.frames]
+        phase_names: List[str] = sorted({ name for durations in frame_durations for name in durations })
+        results: Dict[str, Tuple[float, ...]] = {}
+
+        for phase_name in phase_names:
+            milliseconds = array([durations.get(phase_name, 0) for durations in frame_durations]) / 1e6
+            results[phase_name] = tuple(float(value) for value in percentile(milliseconds, ranks))
+
+        return results
+
+    def report(self) -> str:
+        """
+        Returns the p50, p95 and p99 of every phase in milliseconds, as shown over the canvas
+        """
+        lines: List[str] = [f'{f"{len(self.frames)} frames":<17} {"p50":>8} {"p95":>8} {"p99":>8}']
+
+        for phase_name, (p50, p95, p99) in self.percentiles().items():
+            lines.append(f'{phase_name:<17} {p50:>8.2f} {p95:>8.2f} {p99:>8.2f}')
+
+        return '\n'.join(lines)
+
+    def chrome_trace(self, frame_count: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Returns the last frames as Chrome trace events, opened by chrome://tracing or Perfetto
+
+        Arguments:
+            frame_count (Optional[int]): The number of frames, None for every frame in the ring buffer. Defaults to None
+        """
+        frames: List[ProfiledFrame] = list(self.frames)
+
+        if frame_count is not None:
+            frames = frames[-frame_count:]
+
+        events: List[Dict[str, Any]] = []
+
+        for number, frame in enumerate(frames):
+            events.append(FrameProfiler.__trace_event('frame', 'frame', frame.start, frame.duration, { 'frame': number }))
+
+            for name, category, start, duration, shape_id in frame.phases:
+                arguments: Dict[str, Any] = { 'shape id': shape_id } if shape_id >= 0 else {}
+                events.append(FrameProfiler.__trace_event(name, category, start, duration, arguments))
+
+        return { 'traceEvents': events, 'displayTimeUnit': 'ms' }
+
+    def dump_chrome_trace(self, file_path: str, frame_count: Optional[int] = None) -> int:
+        """
+        Writes the last frames as a Chrome trace event file
+
+        Arguments:
+            file_path (str): Where the trace is saved.
+            frame_count (Optional[int]): The number of frames, None for every frame in the ring buffer. Defaults to None
+
+        Returns:
+            The number of frames written
+        """
+        trace: Dict[str, Any] = self.chrome_trace(frame_count)
+        directory: str = path.dirname(file_path)
+
+        if directory:
+            makedirs(directory, exist_ok=True)
+
+        with open(file_path, 'w') as file:
+            json.dump(trace, file)
+
+        return sum(1 for event in trace['traceEvents'] if event['cat'] == 'frame')
+
+    @staticmethod
+    def __trace_event(name: str, category: str, start: int, duration: int, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Returns a complete event of the Chrome trace event format, its times are in microseconds
+
+        Arguments:
+            name (str): The name of the event.
+            category (str): The category of the event.
+            start (int): When the event started in nanoseconds.
+            duration (int): How long the event took in nanoseconds.
+            arguments (Dict[str, Any]): Shown with the event.
+        """
+        return {
+            'name': name,
+            'cat': category,
+            'ph': 'X',
+            'ts': start / 1e3,
+            'dur': duration / 1e3,
+            'pid': 1,
+            'tid': 1,
+            'args': arguments
+        }
+
+    def __timing(self, phase_name: str, method: Callable) -> Callable:
+        """
+        Returns a method that times the call as a phase of the shape then calls the original method
+
+        Arguments:
+            phase_name (str): The name of the phase.
+            method (Callable): The original method.
+        """
+        def timed(shape: Shape, *args: Any, **kwargs: Any) -> Any:
+            # an override calling the base method is already being timed
+            if phase_name in self.timing_methods:
+                return method(shape, *args, **kwargs)
+
+            self.timing_methods.add(phase_name)
+            start: int = perf_counter_ns()
+
+            try:
+                return method(shape, *args, **kwargs)
+            finally:
+                self.timing_methods.discard(phase_name)
+                self.record(phase_name, METHOD_CATEGORY, start, shape.id)
+
+        return timed
+
+frame_profiler: FrameProfiler = FrameProfiler()
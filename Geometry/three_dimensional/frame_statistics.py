@@ -0,0 +1,250 @@
+from typing import Any, Callable, Dict, Union
+from collections import Counter
+from types import ModuleType
+from custom_types import *
+
+import OpenGL.GLU as GLU
+import OpenGL.GL as GL
+
+ONSCREEN_PASS: str = 'onscreen'
+PICKING_PASS: str = 'picking'
+
+# What is being drawn, a shape id or one of the sources that are not a shape
+SOURCE: TypeAlias = Union[int, str]
+CANVAS_SOURCE: str = 'canvas'
+GRID_SOURCE: str = 'grid'
+BATCH_SOURCE: str = 'batch'
+
+STATE_CHANGES: Tuple[str, ...] = (
+    'glEnable', 'glDisable', 'glEnableClientState', 'glDisableClientState',
+    'glBindTexture', 'glBindBuffer', 'glBindFramebuffer', 'glBlendFunc',
+    'glLineWidth', 'glPointSize', 'glPolygonMode', 'glScissor', 'glTexGen',
+    'glColor', 'glClearColor', 'glMatrixMode', 'glPushAttrib', 'glPopAttrib'
+)
+
+class DrawCounts:
+    """
+    The OpenGL calls, vertices and state changes of one source in one pass
+    """
+
+    def __init__(self) -> None:
+        """
+        Initializes empty counts
+
+        Attributes:
+            calls (int): The number of OpenGL calls.
+            vertices (int): The number of vertices sent by the draw calls.
+            state_changes (int): The number of calls that change the OpenGL state, like binds and enables.
+            functions (Counter[str]): The number of calls by function name.
+        """
+        self.calls: int = 0
+        self.vertices: int = 0
+        self.state_changes: int = 0
+        self.functions: Counter[str] = Counter()
+
+    def add(self, other: 'DrawCounts') -> None:
+        """
+        Adds the counts of another source or pass to these counts
+
+        Arguments:
+            other (DrawCounts): The counts to be added.
+        """
+        self.calls += other.calls
+        self.vertices += other.vertices
+        self.state_changes += other.state_changes
+        self.functions.update(other.functions)
+
+class FrameStatistics:
+    """
+    Counts the OpenGL calls of every frame by pass and by what is being drawn.
+
+    While it is disabled the OpenGL functions are left untouched, so it costs nothing.
+    Enabling it swaps the functions of OpenGL.GL and OpenGL.GLU for counting ones,
+    which works because every module calls them through the module attributes.
+    The Canvas sets pass_name and source while drawing, the calls are counted under them.
+    """
+
+    def __init__(self, modules: Tuple[ModuleType, ...] = (GL, GLU)) -> None:
+        """
+        Initializes disabled statistics
+
+        Arguments:
+            modules (Tuple[ModuleType, ...]): The modules whose functions are counted. Defaults to OpenGL.GL and OpenGL.GLU
+
+        Attributes:
+            enabled (bool): If the calls are being counted.
+            pass_name (str): The pass being drawn, ONSCREEN_PASS or PICKING_PASS.
+            source (SOURCE): What is being drawn, a shape id, GRID_SOURCE, BATCH_SOURCE or CANVAS_SOURCE.
+            counts (Dict[Tuple[str, SOURCE], DrawCounts]): The counts of the frame being drawn by pass and source.
+            last_frame (Dict[Tuple[str, SOURCE], DrawCounts]): The counts of the last finished frame by pass and source.
+            frame_count (int): The number of frames finished since the statistics were enabled.
+            originals (Dict[Tuple[ModuleType, str], Callable]): The swapped functions by module and name.
+        """
+        self.modules: Tuple[ModuleType, ...] = modules
+        self.enabled: bool = False
+
+        self.pass_name: str = ONSCREEN_PASS
+        self.source: SOURCE = CANVAS_SOURCE
+
+        self.counts: Dict[Tuple[str, SOURCE], DrawCounts] = {}
+        self.last_frame: Dict[Tuple[str, SOURCE], DrawCounts] = {}
+        self.frame_count: int = 0
+
+        self.originals: Dict[Tuple[ModuleType, str], Callable] = {}
+
+    def enable(self) -> None:
+        """
+        Starts counting the calls
+        """
+        if self.enabled:
+            return
+
+        for module in self.modules:
+            for name in dir(module):
+                function: Any = getattr(module, name)
+
+                if not name.startswith('gl') or not callable(function):
+                    continue
+
+                self.originals[(module, name)] = function
+                setattr(module, name, self.__counting(name, function))
+
+        self.counts = {}
+        self.last_frame = {}
+        self.frame_count = 0
+        self.enabled = True
+
+    def disable(self) -> None:
+        """
+        Stops counting the calls and puts the OpenGL functions back
+        """
+        for (module, name), function in self.originals.items():
+            setattr(module, name, function)
+
+        self.originals.clear()
+        self.enabled = False
+
+        self.pass_name = ONSCREEN_PASS
+        self.source = CANVAS_SOURCE
+
+    def end_frame(self) -> None:
+        """
+        Keeps the counts of the frame as the last frame and starts counting the next one
+        """
+        self.last_frame = self.counts
+        self.counts = {}
+        self.frame_count += 1
+
+        self.pass_name = ONSCREEN_PASS
+        self.source = CANVAS_SOURCE
+
+    def totals(self) -> DrawCounts:
+        """
+        Returns the counts of every pass and source of the last frame added together
+        """
+        totals: DrawCounts = DrawCounts()
+
+        for counts in self.last_frame.values():
+            totals.add(counts)
+
+        return totals
+
+    def by_pass(self) -> Dict[str, DrawCounts]:
+        """
+        Returns the counts of the last frame by pass
+        """
+        passes: Dict[str, DrawCounts] = {}
+
+        for (pass_name, _), counts in self.last_frame.items():
+            passes.setdefault(pass_name, DrawCounts()).add(counts)
+
+        return passes
+
+    def by_source(self, pass_name: Optional[str] = None) -> Dict[SOURCE, DrawCounts]:
+        """
+        Returns the counts of the last frame by shape id or other source
+
+        Arguments:
+            pass_name (Optional[str]): Only count this pass, None for both. Defaults to None
+        """
+        sources: Dict[SOURCE, DrawCounts] = {}
+
+        for (counted_pass, source), counts in self.last_frame.items():
+            if pass_name is None or counted_pass == pass_name:
+                sources.setdefault(source, DrawCounts()).add(counts)
+
+        return sources
+
+    def report(self, top: int = 5) -> str:
+        """
+        Returns the totals of the last frame by pass and the sources with the most calls, as shown by the HUD
+
+        Arguments:
+            top (int): The number of sources listed. Defaults to 5
+        """
+        lines: List[str] = [f'frame {self.frame_count}']
+
+        for pass_name, counts in sorted(self.by_pass().items()):
+            lines.append(f'{pass_name:<9} {counts.calls:>6} calls {counts.vertices:>8} vertices {counts.state_changes:>6} states')
+
+        sources: List[Tuple[SOURCE, DrawCounts]] = sorted(self.by_source().items(), key=lambda item: item[1].calls, reverse=True)
+
+        for source, counts in sources[:top]:
+            name: str = f'shape {source}' if isinstance(source, int) else source
+            lines.append(f'{name:<9} {counts.calls:>6} calls {counts.vertices:>8} vertices {counts.state_changes:>6} states')
+
+        return '\n'.join(lines)
+
+    def __counting(self, name: str, function: Callable) -> Callable:
+        """
+        Returns a function that counts the call under the current pass and source then calls the original function
+
+        Arguments:
+            name (str): The name of the function.
+            function (Callable): The original function.
+        """
+        changes_state: bool = name.startswith(STATE_CHANGES)
+        vertex_count: Callable[[Tuple[Any, ...]], int] = FrameStatistics.__vertex_counter(name)
+
+        def counted(*args: Any, **kwargs: Any) -> Any:
+            key: Tuple[str, SOURCE] = (self.pass_name, self.source)
+            counts: Optional[DrawCounts] = self.counts.get(key, None)
+
+            if counts is None:
+                counts = self.counts[key] = DrawCounts()
+
+            counts.calls += 1
+            counts.functions[name] += 1
+            counts.vertices += vertex_count(args)
+
+            if changes_state:
+                counts.state_changes += 1
+
+            return function(*args, **kwargs)
+
+        return counted
+
+    @staticmethod
+    def __vertex_counter(name: str) -> Callable[[Tuple[Any, ...]], int]:
+        """
+        Returns how the number of vertices a function sends is read from its arguments
+
+        Arguments:
+            name (str): The name of the function.
+        """
+        if name == 'glDrawArrays':
+            return lambda args: int(args[2])
+
+        if name == 'glDrawElements':
+            return lambda args: int(args[1])
+
+        if name == 'gluSphere':
+            # a strip of quads for every stack with two vertices per slice
+            return lambda args: (int(args[2]) + 1) * int(args[3]) * 2
+
+        if name.startswith('glVertex') and not name.startswith(('glVertexPointer', 'glVertexAttrib')):
+            return lambda args: 1
+
+        return lambda args: 0
+
+frame_statistics: FrameStatistics = FrameStatistics()
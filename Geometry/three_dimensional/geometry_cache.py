@@ -0,0 +1,158 @@
+from geometry.three_dimensional.vertex_buffer import VertexBuffer
+from collections import OrderedDict
+from numpy import ascontiguousarray
+from custom_types import *
+
+from typing import Any, Callable, Hashable
+
+GEOMETRY_KEY: TypeAlias = Tuple[Hashable, ...]
+
+class Mesh:
+    """
+    Immutable vertices that can be shared by several shapes along with their vertex buffer.
+    """
+
+    def __init__(self, key: Optional[GEOMETRY_KEY], vertices: VERTICES) -> None:
+        """
+        Initializes the mesh
+
+        Arguments:
+            key (Optional[GEOMETRY_KEY]): The key of the mesh in the cache, None if the mesh is not cached.
+            vertices (VERTICES): The vertices of the mesh, stored as a read only float32 array.
+
+        Attributes:
+            references (int): The number of shapes using the mesh.
+            vertex_buffer (VertexBuffer): The GPU copy of the vertices.
+            triangles (Optional[NDArray[float32]]): The triangles of the mesh, set by Shape.triangles when first needed.
+        """
+        self.key: Optional[GEOMETRY_KEY] = key
+        self.vertices: VERTICES = ascontiguousarray(vertices, dtype=float32).reshape(-1, 3)
+        self.vertices.flags.writeable = False
+        self.vertex_buffer: VertexBuffer = VertexBuffer()
+        self.triangles: Optional[NDArray[float32]] = None
+        self.references: int = 0
+
+class GeometryCache:
+    """
+    Process wide cache of meshes keyed by the shape class and the parameters that generated it.
+
+    Meshes are reference counted, once no shape uses a mesh it stays in the cache
+    until it becomes the least recently used one and the cache is over capacity.
+    """
+
+    def __init__(self, capacity: int = 256) -> None:
+        """
+        Initializes the cache
+
+        Arguments:
+            capacity (int): The number of meshes kept before unused meshes are evicted. Defaults to 256
+        """
+        self.capacity: int = capacity
+        self.meshes: OrderedDict[GEOMETRY_KEY, Mesh] = OrderedDict()
+
+    @staticmethod
+    def key(shape_class: type, parameters: Tuple[Any, ...]) -> GEOMETRY_KEY:
+        """
+        Creates the cache key for a shape class and its generating parameters.
+        Floats are rounded so that values which drifted from repeated resizing still match.
+
+        Arguments:
+            shape_class (type): The class of the shape.
+            parameters (Tuple[Any, ...]): The parameters used to generate the vertices.
+        """
+        return (shape_class, *(round(parameter, 6) if isinstance(parameter, float) else parameter for parameter in parameters))
+
+    def acquire(self, key: GEOMETRY_KEY, generate_vertices: Callable[[], VERTICES]) -> Mesh:
+        """
+        Returns the mesh for the key, generating it if it is not yet cached.
+
+        Arguments:
+            key (GEOMETRY_KEY): The key of the mesh.
+            generate_vertices (Callable[[], VERTICES]): Generates the vertices on a cache miss.
+        """
+        mesh: Optional[Mesh] = self.meshes.get(key, None)
+
+        if mesh is None:
+            mesh = Mesh(key, generate_vertices())
+            self.meshes[key] = mesh
+        else:
+            self.meshes.move_to_end(key)
+
+        mesh.references += 1
+        self.__evict()
+
+        return mesh
+
+    def create(self, vertices: VERTICES) -> Mesh:
+        """
+        Returns an uncached mesh, used for geometry that is not generated from parameters.
+
+        Arguments:
+            vertices (VERTICES): The vertices of the mesh.
+        """
+        mesh: Mesh = Mesh(None, vertices)
+        mesh.references += 1
+
+        return mesh
+
+    def retain(self, mesh: Mesh) -> Mesh:
+        """
+        Adds a reference to a mesh that is already in use
+
+        Arguments:
+            mesh (Mesh): The mesh to be shared.
+        """
+        mesh.references += 1
+
+        if mesh.key is not None and mesh.key in self.meshes:
+            self.meshes.move_to_end(mesh.key)
+
+        return mesh
+
+    def release(self, mesh: Mesh) -> None:
+        """
+        Removes a reference to the mesh. Uncached meshes free their vertex buffer right away.
+
+        Arguments:
+            mesh (Mesh): The mesh that is no longer used.
+        """
+        mesh.references -= 1
+
+        if mesh.references > 0:
+            return
+
+        if mesh.key is None or mesh.key not in self.meshes:
+            mesh.vertex_buffer.delete()
+            return
+
+        self.__evict()
+
+    def clear(self) -> None:
+        """
+        Removes all unused meshes from the cache
+        """
+        for key, mesh in list(self.meshes.items()):
+            if mesh.references > 0:
+                continue
+
+            del self.meshes[key]
+            mesh.vertex_buffer.delete()
+
+    def __evict(self) -> None:
+        """
+        Removes the least recently used unused meshes while the cache is over capacity
+        """
+        if len(self.meshes) <= self.capacity:
+            return
+
+        for key, mesh in list(self.meshes.items()):
+            if len(self.meshes) <= self.capacity:
+                return
+
+            if mesh.references > 0:
+                continue
+
+            del self.meshes[key]
+            mesh.vertex_buffer.delete()
+
+geometry_cache: GeometryCache = GeometryCache()
@@ -0,0 +1,37 @@
+from numpy import arange, float32, zeros
+from custom_types import *
+
+def grid_lines(distance: int, opacity: float) -> Tuple[VERTICES, NDArray[float32]]:
+    """
+    Returns the vertices and colors of the grid lines on the floor, the lines through the origin are the axes
+
+    Arguments:
+        distance (int): How far the grid lines reach from the origin.
+        opacity (float): The opacity of the grid lines that are not axes.
+    """
+    green: RGBA = (0.0, 1.0, 0.0, 0.4)
+    red: RGBA = (1.0, 0.0, 0.0, 0.4)
+    default_color: RGBA = (0.7, 0.7, 0.7, opacity)
+
+    indices = arange(-distance, distance + 1)
+    line_count: int = len(indices)
+
+    vertices: VERTICES = zeros((line_count * 4, 3), dtype=float32)
+    colors = zeros((line_count * 4, 4), dtype=float32)
+
+    x_axis_lines: slice = slice(0, line_count * 2)
+    y_axis_lines: slice = slice(line_count * 2, line_count * 4)
+
+    # Lines along the X-axis go from (index, -distance) to (index, distance)
+    vertices[x_axis_lines, 0] = indices.repeat(2)
+    vertices[x_axis_lines, 1] = [-distance, distance] * line_count
+
+    # Lines along the Y-axis go from (-distance, index) to (distance, index)
+    vertices[y_axis_lines, 0] = [-distance, distance] * line_count
+    vertices[y_axis_lines, 1] = indices.repeat(2)
+
+    colors[:] = default_color
+    colors[distance * 2:distance * 2 + 2] = green
+    colors[line_count * 2 + distance * 2:line_count * 2 + distance * 2 + 2] = red
+
+    return vertices, colors
@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Sequence
+from math import cos, radians, sin, tan
+from numpy import array, asarray, eye, float64, floating, hstack, inf, maximum, newaxis, ones, where
+from numpy.linalg import inv, norm
+from numpy.typing import NDArray
+from custom_types import *
+
+if TYPE_CHECKING:
+    from geometry.three_dimensional.shape import Shape
+
+MATRIX: TypeAlias = NDArray[float64] # 4x4 matrix that multiplies column vectors, like OpenGL
+
+def perspective_matrix(field_of_view: float, aspect: float, near: float, far: float) -> MATRIX:
+    """
+    Returns the same matrix as gluPerspective
+
+    Arguments:
+        field_of_view (float): The vertical field of view in degrees.
+        aspect (float): The width divided by the height of the viewport.
+        near (float): The distance to the near clipping plane.
+        far (float): The distance to the far clipping plane.
+    """
+    focal_length: float = 1 / tan(radians(field_of_view) / 2)
+
+    return array([
+        (focal_length / aspect, 0, 0, 0),
+        (0, focal_length, 0, 0),
+        (0, 0, (far + near) / (near - far), 2 * far * near / (near - far)),
+        (0, 0, -1, 0)
+    ], dtype=float64)
+
+def rotation_matrix(angle: float, x: float, y: float, z: float) -> MATRIX:
+    """
+    Returns the same matrix as glRotatef
+
+    Arguments:
+        angle (float): The angle in degrees.
+        x (float): The x component of the axis.
+        y (float): The y component of the axis.
+        z (float): The z component of the axis.
+    """
+    axis: NDArray[float64] = array((x, y, z), dtype=float64)
+    x, y, z = axis / norm(axis)
+
+    cosine: float = cos(radians(angle))
+    sine: float = sin(radians(angle))
+    one_minus_cosine: float = 1 - cosine
+
+    return array([
+        (x * x * one_minus_cosine + cosine, x * y * one_minus_cosine - z * sine, x * z * one_minus_cosine + y * sine, 0),
+        (y * x * one_minus_cosine + z * sine, y * y * one_minus_cosine + cosine, y * z * one_minus_cosine - x * sine, 0),
+        (x * z * one_minus_cosine - y * sine, y * z * one_minus_cosine + x * sine, z * z * one_minus_cosine + cosine, 0),
+        (0, 0, 0, 1)
+    ], dtype=float64)
+
+def translation_matrix(x: float, y: float, z: float) -> MATRIX:
+    """
+    Returns the same matrix as glTranslatef
+
+    Arguments:
+        x (float): The translation along the x axis.
+        y (float): The translation along the y axis.
+        z (float): The translation along the z axis.
+    """
+    matrix: MATRIX = eye(4, dtype=float64)
+    matrix[:3, 3] = (x, y, z)
+
+    return matrix
+
+def view_matrix(camera_x: float, camera_y: float, camera_translation: Sequence[float], camera_sensitivity: float) -> MATRIX:
+    """
+    Returns the camera transform the Canvas applies before drawing the shapes
+
+    Arguments:
+        camera_x (float): The rotation of the camera around the z axis before applying the sensitivity.
+        camera_y (float): The rotation of the camera around the x axis before applying the sensitivity.
+        camera_translation (Sequence[float]): The x, y, z translation of the camera.
+        camera_sensitivity (float): The multiplier of the camera rotations.
+    """
+    return (
+        rotation_matrix(camera_y * camera_sensitivity, 1, 0, 0)
+        @ rotation_matrix(camera_x * camera_sensitivity, 0, 0, 1)
+        @ translation_matrix(*camera_translation)
+    )
+
+def model_matrix(shape: Shape) -> MATRIX:
+    """
+    Returns the transform Shape.draw_to_canvas applies before drawing the shape
+
+    Arguments:
+        shape (Shape): The shape to be transformed.
+    """
+    return (
+        translation_matrix(shape.x, shape.y, shape.z)
+        @ rotation_matrix(shape.x_rotation, 0, 1, 0)
+        @ rotation_matrix(-shape.y_rotation, 1, 0, 0)
+    )
+
+def transform_points(matrix: NDArray[floating], points: NDArray) -> NDArray[float64]:
+    """
+    Applies the matrix to (N, 3) points
+
+    Arguments:
+        matrix (NDArray[floating]): The transform, a MATRIX or its inverse.
+        points (NDArray): The x, y, z points.
+    """
+    homogeneous_points: NDArray[float64] = hstack((points, ones((len(points), 1))))
+    transformed_points: NDArray[float64] = homogeneous_points @ matrix.T
+
+    return transformed_points[:, :3] / transformed_points[:, 3:]
+
+def unproject(x: float, y: float, viewport_width: float, viewport_height: float, projection: MATRIX, view: MATRIX) -> Tuple[NDArray[float64], NDArray[float64]]:
+    """
+    Returns the ray going through a pixel in world space
+
+    Arguments:
+        x (float): The x-coordinate of the pixel.
+        y (float): The y-coordinate of the pixel, starting from the bottom.
+        viewport_width (float): The width of the viewport.
+        viewport_height (float): The height of the viewport.
+        projection (MATRIX): The projection matrix.
+        view (MATRIX): The camera transform.
+
+    Returns:
+        The origin of the ray on the near plane and its normalized direction
+    """
+    normalized_x: float = 2 * (x + 0.5) / viewport_width - 1
+    normalized_y: float = 2 * (y + 0.5) / viewport_height - 1
+
+    near_point, far_point = transform_points(inv(projection @ view), array([
+        (normalized_x, normalized_y, -1),
+        (normalized_x, normalized_y, 1)
+    ], dtype=float64))
+
+    direction: NDArray[float64] = far_point - near_point
+    return near_point, direction / norm(direction)
+
+def frustum_planes(clip_matrix: MATRIX) -> NDArray[float64]:
+    """
+    Returns the planes of the view frustum, points inside the frustum are in front of every plane
+
+    Arguments:
+        clip_matrix (MATRIX): The projection matrix multiplied by the camera transform.
+
+    Returns:
+        A (6, 4) array of the left, right, bottom, top, near and far planes as a, b, c, d of ax + by + cz + d = 0
+    """
+    return array([
+        clip_matrix[3] + clip_matrix[0],
+        clip_matrix[3] - clip_matrix[0],
+        clip_matrix[3] + clip_matrix[1],
+        clip_matrix[3] - clip_matrix[1],
+        clip_matrix[3] + clip_matrix[2],
+        clip_matrix[3] - clip_matrix[2]
+    ], dtype=float64)
+
+def boxes_in_frustum(planes: NDArray[float64], boxes: NDArray) -> NDArray:
+    """
+    Checks which axis aligned boxes are at least partly inside the frustum.
+    A box is outside once its corner furthest along a planes normal is behind that plane.
+
+    Arguments:
+        planes (NDArray[float64]): The planes returned by frustum_planes.
+        boxes (NDArray): A (N, 2, 3) array of the minimum and maximum corners of each box.
+
+    Returns:
+        A (N,) array of booleans, True for the boxes that may be visible
+    """
+    normals: NDArray[float64] = planes[:, :3]
+
+    # (N, 6, 3) the corner of every box that is furthest along the normal of every plane
+    furthest_corners: NDArray = where(normals >= 0, boxes[:, newaxis, 1], boxes[:, newaxis, 0])
+    distances: NDArray = (furthest_corners * normals).sum(axis=2) + planes[:, 3]
+
+    return asarray((distances >= 0).all(axis=1), dtype=bool)
+
+def projected_radii(projection: MATRIX, view: MATRIX, viewport_height: float, boxes: NDArray) -> NDArray[float64]:
+    """
+    Returns the radius in pixels of the bounding sphere of each box once drawn on screen
+
+    Arguments:
+        projection (MATRIX): The projection matrix.
+        view (MATRIX): The camera transform.
+        viewport_height (float): The height of the viewport in pixels.
+        boxes (NDArray): A (N, 2, 3) array of the minimum and maximum corners of each box.
+    """
+    centers: NDArray = boxes.mean(axis=1)
+    radii: NDArray = norm(boxes[:, 1] - boxes[:, 0], axis=1) / 2
+    depths: NDArray = -transform_points(view, centers)[:, 2]
+
+    # a sphere around the camera covers the whole screen
+    return where(depths > radii, radii * projection[1, 1] * viewport_height / 2 / maximum(depths, 1e-6), inf)
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from time import perf_counter_ns
+from numpy import stack
+
+from geometry.three_dimensional.projection import MATRIX, boxes_in_frustum, frustum_planes, projected_radii
+from geometry.three_dimensional.frame_profiler import CANVAS_CATEGORY, SHAPE_CATEGORY, frame_profiler
+from geometry.three_dimensional.frame_statistics import BATCH_SOURCE, CANVAS_SOURCE, frame_statistics
+from custom_types import *
+
+if TYPE_CHECKING:
+    from geometry.three_dimensional.static_batch import StaticBatch
+    from geometry.three_dimensional.shape import Shape
+
+def visible_shapes(shapes: List[Shape], planes: NDArray) -> List[Shape]:
+    """
+    Returns the shapes whose world bounding box is at least partly inside the view frustum
+
+    Arguments:
+        shapes (List[Shape]): The shapes of the scene.
+        planes (NDArray): The planes of the view frustum.
+    """
+    if len(shapes) <= 0:
+        return []
+
+    in_frustum = boxes_in_frustum(planes, stack([shape.world_bounding_box() for shape in shapes]))
+
+    # a shape following the mouse only gets its new rotation while it is being drawn
+    return [
+        shape for shape, visible in zip(shapes, in_frustum)
+        if visible or (shape.selected and shape.rotate_shape)
+    ]
+
+def update_detail_levels(shapes: List[Shape], projection: MATRIX, view: MATRIX, viewport_height: float) -> None:
+    """
+    Picks the level of detail of each shape from how large it is on screen
+
+    Arguments:
+        shapes (List[Shape]): The shapes about to be drawn.
+        projection (MATRIX): The projection matrix.
+        view (MATRIX): The camera transform.
+        viewport_height (float): The height of the viewport in pixels.
+    """
+    if len(shapes) <= 0:
+        return
+
+    screen_radii = projected_radii(projection, view, viewport_height, stack([shape.world_bounding_box() for shape in shapes]))
+
+    for shape, screen_radius in zip(shapes, screen_radii):
+        shape.select_detail_level(screen_radius)
+
+def draw_shapes(
+    shapes: List[Shape],
+    projection: MATRIX,
+    view: MATRIX,
+    viewport_height: float,
+    static_batch: Optional[StaticBatch],
+    offscreen: bool = False
+) -> None:
+    """
+    Draws the batched shapes with a few draw calls, then every other shape inside the view frustum on its own.
+    The Canvas draws its frames with it and render.draw_scene its images, so the frame benchmarks time the same steps.
+
+    Arguments:
+        shapes (List[Shape]): The shapes of the scene.
+        projection (MATRIX): The projection matrix loaded before drawing.
+        view (MATRIX): The camera transform loaded before drawing.
+        viewport_height (float): The height of the viewport in pixels.
+        static_batch (Optional[StaticBatch]): The batch of the shapes that are not changing, None to draw every shape on its own.
+        offscreen (bool): If the shapes are drawn for the picking pass. Defaults to False
+    """
+    planes: NDArray = frustum_planes(projection @ view)
+    shapes_to_draw: List[Shape] = visible_shapes(shapes, planes)
+
+    if not offscreen:
+        update_detail_levels(shapes_to_draw, projection, view, viewport_height)
+
+    # checked once, the statistics and the profiler cost nothing per shape while they are disabled
+    instrumented: bool = frame_statistics.enabled
+    profiling: bool = frame_profiler.enabled
+
+    if instrumented:
+        frame_statistics.source = BATCH_SOURCE
+
+    started: int = perf_counter_ns() if profiling else 0
+
+    if static_batch is not None:
+        static_batch.sync(shapes)
+        static_batch.draw(planes, offscreen)
+
+    if profiling:
+        frame_profiler.record('static batch', CANVAS_CATEGORY, started)
+
+    for shape in shapes_to_draw:
+        if static_batch is not None and static_batch.contains(shape):
+            continue
+
+        if instrumented:
+            frame_statistics.source = shape.id
+
+        if not profiling:
+            shape.draw_to_canvas(offscreen)
+            continue
+
+        started = perf_counter_ns()
+        shape.draw_to_canvas(offscreen)
+        frame_profiler.record(shape.__class__.__name__, SHAPE_CATEGORY, started, shape.id)
+
+    if instrumented:
+        frame_statistics.source = CANVAS_SOURCE
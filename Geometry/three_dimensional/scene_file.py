@@ -0,0 +1,399 @@
+from geometry.three_dimensional.shape_list import shape_class_references
+from geometry.three_dimensional.geometry_cache import Mesh, geometry_cache
+from geometry.three_dimensional.shape import Shape
+from utilities.class_methods import get_instance_properties
+from numpy import array, concatenate, dtype, empty, frombuffer, memmap, uint8, zeros
+from inspect import signature
+from typing import Any, Dict, Type
+from custom_types import *
+from constants import *
+from os import fsync, path, replace
+
+SCENE_FILE_SIGNATURE: bytes = b'SHPS'
+SCENE_FILE_VERSION: int = 1
+
+SCENE_FILE_HEADER = dtype([
+    ('signature', 'S4'),
+    ('version', '<u4'),
+    ('shape_count', '<u4'),
+    ('class_count', '<u4'),
+    ('parameter_count', '<u4'),
+    ('mesh_count', '<u4'),
+    ('key_count', '<u4'),
+    ('string_count', '<u4'),
+    ('vertex_count', '<u8'),
+    ('string_size', '<u8')
+])
+
+SECTION: TypeAlias = Tuple[str, Any, Tuple[int, ...]] # name, dtype and shape of a column of the scene file
+
+USES_TEXTURE: int = 1
+SHOWS_GRID: int = 2
+
+def scene_sections(header: Any) -> List[SECTION]:
+    """
+    The columns stored after the header, in the order they are written. Every column starts on an 8 byte boundary.
+
+    Arguments:
+        header (Any): The scene file header, its counts give the length of every column.
+    """
+    shape_count: int = int(header['shape_count'])
+    mesh_count: int = int(header['mesh_count'])
+    string_count: int = int(header['string_count'])
+
+    return [
+        ('shape_classes', '<u2', (shape_count,)),
+        ('parameters', '<f8', (shape_count, int(header['parameter_count']))),
+        ('transforms', '<f8', (shape_count, 5)),
+        ('colors', '<f8', (shape_count, 3)),
+        ('flags', 'u1', (shape_count,)),
+        ('textures', '<i4', (shape_count,)),
+        ('meshes', '<u4', (shape_count,)),
+        ('mesh_classes', '<u2', (mesh_count,)),
+        ('mesh_key_lengths', 'u1', (mesh_count,)),
+        ('mesh_keys', '<f8', (mesh_count, int(header['key_count']))),
+        ('vertex_offsets', '<u8', (mesh_count + 1,)),
+        ('vertices', '<f4', (int(header['vertex_count']), 3)),
+        ('string_offsets', '<u8', (string_count + 1,)),
+        ('strings', 'u1', (int(header['string_size']),))
+    ]
+
+def scene_parameters(shape_class: Type[Shape]) -> Tuple[str, ...]:
+    """
+    The fields of a shape class stored in the parameters column, the arguments
+    of its constructor first followed by the other fields only the class has
+
+    Arguments:
+        shape_class (Type[Shape]): The class of the shape.
+    """
+    arguments: List[str] = [name for name in signature(shape_class.__init__).parameters if name != 'self']
+    shared_fields = get_instance_properties(Shape).keys()
+
+    fields: List[str] = sorted(
+        name for name in get_instance_properties(shape_class)
+        if name not in shared_fields and name not in arguments
+    )
+
+    return (*arguments, *fields)
+
+def mesh_key_parameters(mesh: Mesh) -> Optional[Tuple[float, ...]]:
+    """
+    The parameters of the cache key of the mesh, None if the mesh is not cached or its key can not be stored as numbers
+
+    Arguments:
+        mesh (Mesh): The mesh of a shape.
+    """
+    if mesh.key is None:
+        return None
+
+    parameters: Tuple[Any, ...] = mesh.key[1:]
+
+    if not all(isinstance(parameter, (int, float)) for parameter in parameters):
+        return None
+
+    return tuple(float(parameter) for parameter in parameters)
+
+def mesh_class_index(mesh: Mesh, key: Optional[Tuple[float, ...]], class_indices: Dict[Type[Shape], int]) -> int:
+    """
+    The index of the class the mesh is cached under, 0 if its key is not stored
+
+    Arguments:
+        mesh (Mesh): The mesh of a shape.
+        key (Optional[Tuple[float, ...]]): The stored parameters of its key, from mesh_key_parameters.
+        class_indices (Dict[Type[Shape], int]): The index of every class of the scene.
+    """
+    if key is None or mesh.key is None:
+        return 0
+
+    mesh_class: Any = mesh.key[0]
+    return class_indices.get(mesh_class, 0)
+
+def save_scene(file_path: str, shapes: List[Shape]) -> None:
+    """
+    Writes the shapes to a scene file
+
+    Arguments:
+        file_path (str): Where the scene is saved.
+        shapes (List[Shape]): The shapes to be saved.
+
+    Raises:
+        OSError: If the file could not be written.
+    """
+    write_scene(file_path, encode_scene(shapes))
+
+def encode_scene(shapes: List[Shape]) -> List[bytes]:
+    """
+    Packs the shapes as a header followed by one column per field and the packed vertices and texture paths.
+    Shapes sharing a mesh store its vertices once. The bytes no longer depend on the shapes,
+    so they can be written by another thread while the shapes change.
+
+    Arguments:
+        shapes (List[Shape]): The shapes to be saved.
+
+    Returns:
+        The header and every column padded to 8 bytes, in the order they are written
+    """
+    classes: List[Type[Shape]] = []
+    class_indices: Dict[Type[Shape], int] = {}
+    class_parameters: Dict[Type[Shape], Tuple[str, ...]] = {}
+
+    for shape in shapes:
+        if shape.__class__ in class_indices:
+            continue
+
+        class_indices[shape.__class__] = len(classes)
+        class_parameters[shape.__class__] = scene_parameters(shape.__class__)
+        classes.append(shape.__class__)
+
+    meshes: List[Mesh] = []
+    mesh_indices: Dict[int, int] = {}
+    mesh_keys: List[Optional[Tuple[float, ...]]] = []
+
+    texture_paths: List[str] = []
+    texture_indices: Dict[str, int] = {}
+
+    shape_count: int = len(shapes)
+    parameter_count: int = max((len(names) for names in class_parameters.values()), default=0)
+
+    columns: Dict[str, Any] = {
+        'shape_classes': empty(shape_count, dtype='<u2'),
+        'parameters': zeros((shape_count, parameter_count), dtype='<f8'),
+        'transforms': empty((shape_count, 5), dtype='<f8'),
+        'colors': empty((shape_count, 3), dtype='<f8'),
+        'flags': zeros(shape_count, dtype='u1'),
+        'textures': empty(shape_count, dtype='<i4'),
+        'meshes': empty(shape_count, dtype='<u4')
+    }
+
+    for index, shape in enumerate(shapes):
+        names: Tuple[str, ...] = class_parameters[shape.__class__]
+
+        columns['shape_classes'][index] = class_indices[shape.__class__]
+        columns['parameters'][index, :len(names)] = [getattr(shape, name) for name in names]
+        columns['transforms'][index] = (shape.x, shape.y, shape.z, shape.x_rotation, shape.y_rotation)
+        columns['colors'][index] = shape.background_color
+        columns['flags'][index] = (USES_TEXTURE if shape.use_texture else 0) | (SHOWS_GRID if shape.show_grid else 0)
+
+        texture_index: int = -1
+
+        if shape.texture_path:
+            texture_index = texture_indices.setdefault(shape.texture_path, len(texture_paths))
+
+            if texture_index == len(texture_paths):
+                texture_paths.append(shape.texture_path)
+
+        columns['textures'][index] = texture_index
+
+        mesh_index: Optional[int] = mesh_indices.get(id(shape.mesh), None)
+
+        if mesh_index is None:
+            mesh_index = len(meshes)
+            mesh_indices[id(shape.mesh)] = mesh_index
+            meshes.append(shape.mesh)
+            mesh_keys.append(mesh_key_parameters(shape.mesh))
+
+        columns['meshes'][index] = mesh_index
+
+    mesh_count: int = len(meshes)
+    key_count: int = max((len(key) for key in mesh_keys if key is not None), default=0)
+
+    columns['mesh_classes'] = array([mesh_class_index(mesh, key, class_indices) for mesh, key in zip(meshes, mesh_keys)], dtype='<u2')
+    columns['mesh_key_lengths'] = array([len(key) if key is not None else 0 for key in mesh_keys], dtype='u1')
+    columns['mesh_keys'] = zeros((mesh_count, key_count), dtype='<f8')
+
+    for index, key in enumerate(mesh_keys):
+        if key is not None:
+            columns['mesh_keys'][index, :len(key)] = key
+
+    vertex_counts: List[int] = [len(mesh.vertices) for mesh in meshes]
+    columns['vertex_offsets'] = concatenate(([0], vertex_counts)).cumsum().astype('<u8')
+    columns['vertices'] = concatenate([mesh.vertices for mesh in meshes]).astype('<f4') if mesh_count > 0 else empty((0, 3), dtype='<f4')
+
+    # the class names come first so texture references are offset by the number of classes
+    encoded_strings: List[bytes] = [shape_class.__name__.encode() for shape_class in classes] + [texture_path.encode() for texture_path in texture_paths]
+    columns['string_offsets'] = concatenate(([0], [len(string) for string in encoded_strings])).cumsum().astype('<u8')
+    columns['strings'] = frombuffer(b''.join(encoded_strings), dtype=uint8)
+
+    header = zeros(1, dtype=SCENE_FILE_HEADER)
+    header['signature'] = SCENE_FILE_SIGNATURE
+    header['version'] = SCENE_FILE_VERSION
+    header['shape_count'] = shape_count
+    header['class_count'] = len(classes)
+    header['parameter_count'] = parameter_count
+    header['mesh_count'] = mesh_count
+    header['key_count'] = key_count
+    header['string_count'] = len(encoded_strings)
+    header['vertex_count'] = len(columns['vertices'])
+    header['string_size'] = len(columns['strings'])
+
+    chunks: List[bytes] = [header.tobytes()]
+
+    for name, column_type, section_shape in scene_sections(header[0]):
+        column_bytes: bytes = array(columns[name], dtype=column_type).reshape(section_shape).tobytes()
+        chunks.append(column_bytes + bytes(-len(column_bytes) % 8))
+
+    return chunks
+
+def write_scene(file_path: str, chunks: List[bytes]) -> None:
+    """
+    Writes a scene packed by encode_scene
+
+    Arguments:
+        file_path (str): Where the scene is saved.
+        chunks (List[bytes]): The packed scene.
+
+    Raises:
+        OSError: If the file could not be written.
+    """
+    temporary_file: str = f'{file_path}.tmp'
+
+    with open(temporary_file, 'wb') as file:
+        for chunk in chunks:
+            file.write(chunk)
+
+        file.flush()
+        fsync(file.fileno())
+
+    # a scene being overwritten is never left half written
+    replace(temporary_file, file_path)
+
+def load_scene(file_path: str) -> List[Shape]:
+    """
+    Memory maps a scene written by save_scene and creates its shapes.
+    Meshes generated from parameters are put in the geometry cache from the stored vertices,
+    so the shapes constructors find them there instead of running initialize_vertices.
+
+    Arguments:
+        file_path (str): The path of the scene.
+
+    Returns:
+        The shapes of the scene, not yet added to a canvas
+
+    Raises:
+        OSError: If the file could not be read.
+        ValueError: If the file is not a scene, is from a newer version or is incomplete.
+    """
+    data = memmap(file_path, dtype=uint8, mode='r')
+    offset: int = SCENE_FILE_HEADER.itemsize
+
+    if len(data) < offset:
+        raise ValueError(f'{path.basename(file_path)} is not a scene file')
+
+    header = frombuffer(data, dtype=SCENE_FILE_HEADER, count=1)[0]
+
+    if bytes(header['signature']) != SCENE_FILE_SIGNATURE:
+        raise ValueError(f'{path.basename(file_path)} is not a scene file')
+
+    if int(header['version']) > SCENE_FILE_VERSION:
+        raise ValueError(f'{path.basename(file_path)} was saved by a newer version')
+
+    columns: Dict[str, Any] = {}
+
+    for name, column_type, section_shape in scene_sections(header):
+        column_dtype = dtype(column_type)
+        count: int = int(array(section_shape).prod())
+
+        if offset + count * column_dtype.itemsize > len(data):
+            raise ValueError(f'{path.basename(file_path)} is incomplete')
+
+        columns[name] = frombuffer(data, dtype=column_dtype, count=count, offset=offset).reshape(section_shape)
+        offset += count * column_dtype.itemsize
+        offset += -offset % 8
+
+    string_offsets: List[int] = columns['string_offsets'].tolist()
+    strings: List[str] = [
+        bytes(columns['strings'][start:end]).decode() for start, end in zip(string_offsets, string_offsets[1:])
+    ]
+
+    class_count: int = int(header['class_count'])
+    references: Dict[str, Type[Shape]] = shape_class_references()
+    classes: List[Type[Shape]] = []
+
+    for class_name in strings[:class_count]:
+        if class_name not in references:
+            raise ValueError(f'{path.basename(file_path)} has an unknown shape {class_name}')
+
+        classes.append(references[class_name])
+
+    class_parameters: List[Tuple[str, ...]] = [scene_parameters(shape_class) for shape_class in classes]
+    class_arguments: List[int] = [len(signature(shape_class.__init__).parameters) - 1 for shape_class in classes]
+
+    # the columns are read once into lists instead of one numpy scalar at a time
+    shape_classes: List[int] = columns['shape_classes'].tolist()
+    parameters: List[List[float]] = columns['parameters'].tolist()
+    transforms: List[List[float]] = columns['transforms'].tolist()
+    colors: List[List[float]] = columns['colors'].tolist()
+    flags: List[int] = columns['flags'].tolist()
+    textures: List[int] = columns['textures'].tolist()
+    shape_meshes: List[int] = columns['meshes'].tolist()
+
+    mesh_classes: List[int] = columns['mesh_classes'].tolist()
+    mesh_key_lengths: List[int] = columns['mesh_key_lengths'].tolist()
+    mesh_keys: List[List[float]] = columns['mesh_keys'].tolist()
+    vertex_offsets: List[int] = columns['vertex_offsets'].tolist()
+    vertices = columns['vertices']
+
+    def mesh_vertices(mesh_index: int) -> VERTICES:
+        """
+        Copies the vertices of the mesh out of the mapped file, so the file can be overwritten while the shapes exist
+
+        Arguments:
+            mesh_index (int): The index of the mesh.
+        """
+        return vertices[vertex_offsets[mesh_index]:vertex_offsets[mesh_index + 1]].copy()
+
+    loaded_meshes: Dict[int, Mesh] = {}
+    shapes: List[Shape] = []
+
+    for index, class_index in enumerate(shape_classes):
+        shape_class: Type[Shape] = classes[class_index]
+        names: Tuple[str, ...] = class_parameters[class_index]
+        argument_count: int = class_arguments[class_index]
+        values: List[float] = parameters[index]
+
+        mesh_index: int = shape_meshes[index]
+        key_length: int = mesh_key_lengths[mesh_index]
+        seeded_mesh: Optional[Mesh] = None
+
+        # holds a reference so the mesh is not evicted before the constructor acquires it
+        if key_length > 0 and mesh_index not in loaded_meshes:
+            key = geometry_cache.key(classes[mesh_classes[mesh_index]], tuple(mesh_keys[mesh_index][:key_length]))
+            seeded_mesh = geometry_cache.acquire(key, lambda: mesh_vertices(mesh_index))
+
+        shape: Shape = shape_class(*values[:argument_count])
+
+        for name, value in zip(names[argument_count:], values[argument_count:]):
+            setattr(shape, name, value)
+
+        loaded_mesh: Optional[Mesh] = loaded_meshes.get(mesh_index, seeded_mesh)
+
+        # vertices that are not generated from parameters, like a resized cube
+        if loaded_mesh is None:
+            shape.set_vertices(mesh_vertices(mesh_index))
+            loaded_mesh = shape.mesh
+
+        # a shape whose parameters changed without generating its vertices again keeps the saved vertices
+        if shape.mesh is not loaded_mesh:
+            shape.share_mesh(loaded_mesh)
+
+        loaded_meshes[mesh_index] = loaded_mesh
+
+        if seeded_mesh is not None:
+            geometry_cache.release(seeded_mesh)
+
+        shape.place(*transforms[index])
+
+        red, green, blue = colors[index]
+        shape.background_color = (red, green, blue)
+        shape.show_grid = bool(flags[index] & SHOWS_GRID)
+
+        texture_index: int = textures[index]
+
+        # a missing image only leaves the shape untextured
+        if texture_index >= 0 and path.isfile(strings[class_count + texture_index]):
+            shape.texture_path = strings[class_count + texture_index]
+            shape.use_texture = bool(flags[index] & USES_TEXTURE)
+
+        shapes.append(shape)
+
+    return shapes
@@ -0,0 +1,624 @@
+from geometry.three_dimensional.scene_file import encode_scene, load_scene, scene_parameters, write_scene
+from geometry.three_dimensional.shape_list import shape_class_references
+from geometry.three_dimensional.shape import Shape
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Type
+from numpy import array, float32, frombuffer
+from event_bus import SHAPE_CHANGED, SHAPE_DELETED, SHAPE_RESIZED, SHAPE_TRANSFORMED, ShapeEvent, event_bus
+from struct import Struct
+from zlib import crc32
+from custom_types import *
+from constants import *
+from os import fsync, listdir, makedirs, path, remove
+
+import time
+import re
+
+JOURNAL_RECORD: TypeAlias = Tuple[int, int, Any] # operation, slot and payload of a journal record
+
+RECORD_HEADER: Struct = Struct('<II') # length and checksum of the body
+RECORD_BODY: Struct = Struct('<BI') # operation and slot of the shape
+
+ADD: int = 1
+SET: int = 2
+GEOMETRY: int = 3
+DELETE: int = 4
+SLOTS: int = 5
+
+SNAPSHOT_FILE: re.Pattern = re.compile(r'^snapshot-(\d+)\.shapes$')
+LOG_FILE: re.Pattern = re.compile(r'^journal-(\d+)\.log$')
+
+def encode_value(value: Any) -> Optional[bytes]:
+    """
+    Packs a field value behind a one letter tag of its type
+
+    Arguments:
+        value (Any): A float, bool, string or RGB color.
+
+    Returns:
+        The packed value or None if the type can not be stored
+    """
+    if isinstance(value, bool):
+        return b'b' + bytes((value,))
+
+    if isinstance(value, (int, float)):
+        return b'f' + Struct('<d').pack(value)
+
+    if isinstance(value, str):
+        encoded: bytes = value.encode()
+        return b's' + Struct('<H').pack(len(encoded)) + encoded
+
+    if isinstance(value, (tuple, list)) and len(value) == 3:
+        return b'c' + Struct('<3d').pack(*value)
+
+    return None
+
+def decode_value(data: bytes, offset: int) -> Tuple[Any, int]:
+    """
+    Unpacks a value packed by encode_value
+
+    Arguments:
+        data (bytes): The body of the record.
+        offset (int): Where the tag of the value is.
+
+    Returns:
+        The value and the offset after it
+    """
+    tag: bytes = data[offset:offset + 1]
+    offset += 1
+
+    if tag == b'b':
+        return data[offset] != 0, offset + 1
+
+    if tag == b'f':
+        return Struct('<d').unpack_from(data, offset)[0], offset + 8
+
+    if tag == b's':
+        length: int = Struct('<H').unpack_from(data, offset)[0]
+        return data[offset + 2:offset + 2 + length].decode(), offset + 2 + length
+
+    if tag == b'c':
+        return Struct('<3d').unpack_from(data, offset), offset + 24
+
+    raise ValueError(f'Unknown value type {tag!r}')
+
+def encode_record(operation: int, slot: int, payload: bytes = b'') -> bytes:
+    """
+    Packs a record as its length and checksum followed by the operation, slot and payload.
+    The checksum lets the reader stop at a record that was only partly written before a crash.
+
+    Arguments:
+        operation (int): ADD, SET, GEOMETRY, DELETE or SLOTS.
+        slot (int): The slot of the shape.
+        payload (bytes): The data of the operation. Defaults to b''
+    """
+    body: bytes = RECORD_BODY.pack(operation, slot) + payload
+    return RECORD_HEADER.pack(len(body), crc32(body)) + body
+
+def decode_records(data: bytes) -> List[JOURNAL_RECORD]:
+    """
+    Unpacks the complete records of a log, the records after a torn or corrupted one are ignored
+
+    Arguments:
+        data (bytes): The contents of the log.
+    """
+    records: List[JOURNAL_RECORD] = []
+    offset: int = 0
+
+    while offset + RECORD_HEADER.size <= len(data):
+        length, checksum = RECORD_HEADER.unpack_from(data, offset)
+        body: bytes = data[offset + RECORD_HEADER.size:offset + RECORD_HEADER.size + length]
+
+        if len(body) < RECORD_BODY.size or len(body) != length or crc32(body) != checksum:
+            break
+
+        operation, slot = RECORD_BODY.unpack_from(body)
+        payload: bytes = body[RECORD_BODY.size:]
+
+        try:
+            if operation == SET:
+                name_length: int = payload[0]
+                name: str = payload[1:1 + name_length].decode()
+                value, _ = decode_value(payload, 1 + name_length)
+                records.append((operation, slot, (name, value)))
+
+            elif operation == ADD:
+                records.append((operation, slot, payload.decode()))
+
+            elif operation == GEOMETRY:
+                records.append((operation, slot, frombuffer(payload, dtype='<f4').reshape(-1, 3) if payload else None))
+
+            elif operation == DELETE:
+                records.append((operation, slot, None))
+
+            elif operation == SLOTS:
+                records.append((operation, slot, frombuffer(payload, dtype='<u4').tolist()))
+        except (IndexError, ValueError):
+            break
+
+        offset += RECORD_HEADER.size + length
+
+    return records
+
+class SceneJournal:
+    """
+    Appends every change of the shapes to a log so the scene survives a crash without saving it after every edit.
+
+    The directory holds the last snapshot, a scene file, and the logs of the changes made since.
+    Shapes are referred to by their slot, their position in the snapshot followed by the shapes added since.
+    Every log starts with the slots the shapes had in the previous log, so a log can still be replayed
+    after the previous log if its own snapshot was never completed.
+    Records are buffered and written in groups, and the log is synced to the disk at most sync_interval seconds
+    after a change. Once the log grows past compaction_size the shapes are packed into a new snapshot
+    which is written in the background while the changes go to a new log.
+    Moves and rotations are coalesced by the event bus, a drag writes the last position of the frame instead of every step.
+
+    Static fields:
+        flush_interval (int): The milliseconds records are buffered before they are written.
+        sync_interval (float): The most seconds a written record waits before it is synced to the disk.
+        compaction_size (int): The bytes a log grows to before it is folded into a new snapshot.
+    """
+    flush_interval: int = 100
+    sync_interval: float = 1.0
+    compaction_size: int = 8 * 1024 * 1024
+
+    def __init__(self, directory: str, schedule: Callable[[int, Callable[[], None]], Any]) -> None:
+        """
+        Initializes the journal, nothing is written until recover() is called
+
+        Arguments:
+            directory (str): Where the snapshots and logs are stored.
+            schedule (Callable[[int, Callable[[], None]], Any]): Runs a function after some milliseconds on the Tk thread, like Tk.after.
+
+        Attributes:
+            generation (int): The number of the current log, the snapshot of the same number holds everything before it.
+            log (Optional[Any]): The file records are appended to, None until the journal is recovered.
+            log_size (int): The bytes written to the current log.
+            pending (List[bytes]): The records waiting to be written.
+            pending_fields (Dict[Tuple[int, str], int]): The index of the buffered record of each field, so repeated changes replace it.
+            slots (Dict[int, int]): The slot of every shape by the shapes id.
+            shapes (Dict[int, Shape]): The shapes by their slot.
+            next_slot (int): The slot given to the next added shape.
+            flush_scheduled (bool): If a flush will run.
+            last_sync (float): When the log was last synced to the disk.
+            unsynced (bool): If records were written since the last sync.
+            compactor (ThreadPoolExecutor): Writes the snapshots.
+            compaction (Optional[Future]): The snapshot being written.
+        """
+        self.directory: str = directory
+        self.schedule: Callable[[int, Callable[[], None]], Any] = schedule
+
+        self.generation: int = 0
+        self.log: Optional[Any] = None
+        self.log_size: int = 0
+
+        self.pending: List[bytes] = []
+        self.pending_fields: Dict[Tuple[int, str], int] = {}
+
+        self.slots: Dict[int, int] = {}
+        self.shapes: Dict[int, Shape] = {}
+        self.next_slot: int = 0
+
+        self.flush_scheduled: bool = False
+        self.last_sync: float = time.monotonic()
+        self.unsynced: bool = False
+
+        self.compactor: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='journal-compaction')
+        self.compaction: Optional[Future] = None
+
+    def recover(self) -> List[Shape]:
+        """
+        Loads the last snapshot and replays the logs written after it, then starts a new snapshot with the result
+
+        Returns:
+            The recovered shapes, already tracked by the journal
+        """
+        makedirs(self.directory, exist_ok=True)
+
+        snapshots: List[int] = self.__numbered_files(SNAPSHOT_FILE)
+        logs: List[int] = self.__numbered_files(LOG_FILE)
+
+        snapshot_generation: int = 0
+        shapes: List[Shape] = []
+
+        # a snapshot that can not be read falls back to the one before it
+        for generation in reversed(snapshots):
+            try:
+                shapes = load_scene(self.__snapshot_path(generation))
+            except (OSError, ValueError):
+                continue
+
+            snapshot_generation = generation
+            break
+
+        replayed_shapes: Dict[int, Shape] = dict(enumerate(shapes))
+
+        for generation in logs:
+            if generation < snapshot_generation:
+                continue
+
+            with open(self.__log_path(generation), 'rb') as log:
+                records: List[JOURNAL_RECORD] = decode_records(log.read())
+
+            for record in records:
+                # the snapshot of the log already has its shapes numbered by these slots
+                if record[0] == SLOTS and generation == snapshot_generation:
+                    continue
+
+                replayed_shapes = self.__replay(replayed_shapes, record)
+
+        for slot, shape in replayed_shapes.items():
+            self.slots[shape.id] = slot
+
+        self.shapes = replayed_shapes
+        self.generation = max([snapshot_generation, *logs])
+        self.compact()
+
+        # the changes of the shapes are only journaled once the log is open
+        event_bus.subscribe(SHAPE_TRANSFORMED, self.__field_set, coalesce=True)
+        event_bus.subscribe(SHAPE_CHANGED, self.__field_set)
+        event_bus.subscribe(SHAPE_RESIZED, self.__resized)
+        event_bus.subscribe(SHAPE_DELETED, self.__deleted)
+
+        return list(replayed_shapes.values())
+
+    def track(self, shape: Shape) -> None:
+        """
+        Starts journaling the changes of a shape added to the canvas
+
+        Arguments:
+            shape (Shape): The added shape.
+        """
+        if shape.id in self.slots:
+            return
+
+        slot: int = self.__assign_slot(shape)
+        self.__append(ADD, slot, shape.__class__.__name__.encode())
+
+        for name in (*scene_parameters(shape.__class__), 'x', 'y', 'z', 'x_rotation', 'y_rotation', 'background_color', 'show_grid'):
+            self.__append_field(slot, name, getattr(shape, name))
+
+        if shape.texture_path:
+            self.__append_field(slot, 'texture_path', shape.texture_path)
+            self.__append_field(slot, 'use_texture', shape.use_texture)
+
+        self.__append_geometry(slot, shape)
+
+    def __field_set(self, event: ShapeEvent) -> None:
+        """
+        Turns a property set on a tracked shape into a record
+
+        Arguments:
+            event (ShapeEvent): The SHAPE_TRANSFORMED or SHAPE_CHANGED event.
+        """
+        slot: Optional[int] = self.slots.get(event.shape.id, None)
+
+        if slot is not None and event.field is not None:
+            self.__append_field(slot, event.field, event.value)
+
+    def __resized(self, event: ShapeEvent) -> None:
+        """
+        Records the dimensions and the vertices of a resized shape
+
+        Arguments:
+            event (ShapeEvent): The SHAPE_RESIZED event.
+        """
+        slot: Optional[int] = self.slots.get(event.shape.id, None)
+
+        if slot is None:
+            return
+
+        for name in scene_parameters(event.shape.__class__):
+            self.__append_field(slot, name, getattr(event.shape, name))
+
+        self.__append_geometry(slot, event.shape)
+
+    def __deleted(self, event: ShapeEvent) -> None:
+        """
+        Records the removal of a shape and stops journaling it
+
+        Arguments:
+            event (ShapeEvent): The SHAPE_DELETED event.
+        """
+        slot: Optional[int] = self.slots.pop(event.shape.id, None)
+
+        if slot is None:
+            return
+
+        self.__append(DELETE, slot)
+        self.shapes.pop(slot, None)
+
+    def flush(self) -> None:
+        """
+        Writes the buffered records as one group, syncs the log if the last sync is sync_interval old
+        and folds the log into a new snapshot once it is larger than compaction_size
+        """
+        self.flush_scheduled = False
+
+        if self.log is None:
+            return
+
+        self.__write_pending()
+
+        if self.unsynced:
+            waited: float = time.monotonic() - self.last_sync
+
+            if waited >= SceneJournal.sync_interval:
+                self.sync()
+            else:
+                self.__schedule_flush(int((SceneJournal.sync_interval - waited) * 1000) + 1)
+
+        if self.log_size > SceneJournal.compaction_size and not self.is_compacting():
+            self.compact()
+
+    def sync(self) -> None:
+        """
+        Forces the written records to the disk
+        """
+        if self.log is None:
+            return
+
+        fsync(self.log.fileno())
+        self.last_sync = time.monotonic()
+        self.unsynced = False
+
+    def is_compacting(self) -> bool:
+        """
+        Checks if a snapshot is still being written
+        """
+        return self.compaction is not None and not self.compaction.done()
+
+    def compact(self) -> None:
+        """
+        Packs the tracked shapes into a new snapshot and starts a new log. The snapshot is written in the background,
+        the older snapshots and logs are only removed once it is complete so a crash while writing loses nothing.
+        """
+        self.__close_log()
+
+        # records that never reached a log are part of the snapshot
+        self.pending.clear()
+        self.pending_fields.clear()
+
+        # the shapes of the snapshot are numbered from 0 like when it is loaded
+        previous_slots: List[int] = list(self.shapes.keys())
+        shapes: List[Shape] = list(self.shapes.values())
+
+        self.slots.clear()
+        self.shapes.clear()
+        self.next_slot = 0
+
+        for shape in shapes:
+            self.__assign_slot(shape)
+
+        chunks: List[bytes] = encode_scene(shapes)
+
+        self.generation += 1
+        self.log = open(self.__log_path(self.generation), 'ab')
+        self.log_size = 0
+
+        self.__append(SLOTS, len(previous_slots), array(previous_slots, dtype='<u4').tobytes())
+
+        self.compaction = self.compactor.submit(self.__write_snapshot, self.generation, chunks)
+
+    def close(self) -> None:
+        """
+        Writes and syncs the buffered records and waits for the snapshot being written
+        """
+        # moves still waiting on the event bus are recorded first
+        event_bus.flush(self.__field_set)
+        self.__close_log()
+        self.compactor.shutdown(wait=True)
+
+    def __write_snapshot(self, generation: int, chunks: List[bytes]) -> None:
+        """
+        Writes the snapshot and removes the snapshots and logs it replaces, runs on the compaction thread
+
+        Arguments:
+            generation (int): The number of the snapshot.
+            chunks (List[bytes]): The packed shapes.
+        """
+        write_scene(self.__snapshot_path(generation), chunks)
+
+        for older_generation in self.__numbered_files(SNAPSHOT_FILE):
+            if older_generation < generation:
+                remove(self.__snapshot_path(older_generation))
+
+        for older_generation in self.__numbered_files(LOG_FILE):
+            if older_generation < generation:
+                remove(self.__log_path(older_generation))
+
+    def __write_pending(self) -> None:
+        """
+        Writes the buffered records to the log as one group
+        """
+        if len(self.pending) <= 0 or self.log is None:
+            return
+
+        group: bytes = b''.join(self.pending)
+        self.pending.clear()
+        self.pending_fields.clear()
+
+        self.log.write(group)
+        self.log.flush()
+        self.log_size += len(group)
+        self.unsynced = True
+
+    def __close_log(self) -> None:
+        """
+        Writes the buffered records and closes the log after syncing it
+        """
+        self.flush_scheduled = False
+
+        if self.log is None:
+            return
+
+        self.__write_pending()
+        self.sync()
+        self.log.close()
+        self.log = None
+
+    def __replay(self, shapes: Dict[int, Shape], record: JOURNAL_RECORD) -> Dict[int, Shape]:
+        """
+        Applies a record to the recovered shapes, records of shapes that no longer exist are skipped
+
+        Arguments:
+            shapes (Dict[int, Shape]): The recovered shapes by their slot.
+            record (JOURNAL_RECORD): The record to be applied.
+
+        Returns:
+            The recovered shapes, numbered again if the record starts a new log
+        """
+        operation, slot, payload = record
+
+        if operation == SLOTS:
+            return {
+                new_slot: shapes[previous_slot] for new_slot, previous_slot in enumerate(payload) if previous_slot in shapes
+            }
+
+        if operation == ADD:
+            shape_class: Optional[Type[Shape]] = shape_class_references().get(payload, None)
+
+            if shape_class is not None:
+                shapes[slot] = shape_class()
+
+            return shapes
+
+        shape: Optional[Shape] = shapes.get(slot, None)
+
+        if shape is None:
+            return shapes
+
+        if operation == SET:
+            name, value = payload
+
+            # a missing image only leaves the shape untextured
+            if name == 'texture_path' and not path.isfile(value):
+                return shapes
+
+            if name == 'use_texture' and not shape.texture_path:
+                return shapes
+
+            setattr(shape, name, value)
+
+        elif operation == GEOMETRY:
+            if payload is None:
+                shape.update_geometry()
+            else:
+                shape.set_vertices(payload.astype(float32))
+
+        elif operation == DELETE:
+            shapes.pop(slot).delete()
+
+        return shapes
+
+    def __assign_slot(self, shape: Shape) -> int:
+        """
+        Gives the shape the next slot
+
+        Arguments:
+            shape (Shape): The shape to be tracked.
+        """
+        slot: int = self.next_slot
+        self.next_slot += 1
+
+        self.slots[shape.id] = slot
+        self.shapes[slot] = shape
+
+        return slot
+
+    def __append_field(self, slot: int, name: str, value: Any) -> None:
+        """
+        Buffers a record of the new value of a field, replacing the buffered record of the same field
+
+        Arguments:
+            slot (int): The slot of the shape.
+            name (str): The name of the field.
+            value (Any): The new value.
+        """
+        encoded_value: Optional[bytes] = encode_value(value)
+
+        if encoded_value is None:
+            return
+
+        encoded_name: bytes = name.encode()
+        record: bytes = encode_record(SET, slot, bytes((len(encoded_name),)) + encoded_name + encoded_value)
+
+        index: Optional[int] = self.pending_fields.get((slot, name), None)
+
+        if index is not None:
+            self.pending[index] = record
+            return
+
+        self.pending_fields[(slot, name)] = len(self.pending)
+        self.__buffer(record)
+
+    def __append_geometry(self, slot: int, shape: Shape) -> None:
+        """
+        Buffers a record that generates the vertices again, or holds them if they are not generated from parameters
+
+        Arguments:
+            slot (int): The slot of the shape.
+            shape (Shape): The shape whose mesh changed.
+        """
+        vertices: bytes = b'' if shape.mesh.key is not None else shape.vertices.astype('<f4').tobytes()
+        self.__append(GEOMETRY, slot, vertices)
+
+    def __append(self, operation: int, slot: int, payload: bytes = b'') -> None:
+        """
+        Buffers a record that changes the shape as a whole, later field records are not merged into earlier ones
+
+        Arguments:
+            operation (int): ADD, GEOMETRY, DELETE or SLOTS.
+            slot (int): The slot of the shape.
+            payload (bytes): The data of the operation. Defaults to b''
+        """
+        for key in [key for key in self.pending_fields if key[0] == slot]:
+            del self.pending_fields[key]
+
+        self.__buffer(encode_record(operation, slot, payload))
+
+    def __buffer(self, record: bytes) -> None:
+        """
+        Adds the record to the group written by the next flush
+
+        Arguments:
+            record (bytes): The packed record.
+        """
+        self.pending.append(record)
+        self.__schedule_flush(SceneJournal.flush_interval)
+
+    def __schedule_flush(self, delay: int) -> None:
+        """
+        Runs flush after the delay unless it is already scheduled
+
+        Arguments:
+            delay (int): The milliseconds to wait.
+        """
+        if self.flush_scheduled or self.log is None:
+            return
+
+        self.flush_scheduled = True
+        self.schedule(delay, self.flush)
+
+    def __numbered_files(self, pattern: re.Pattern) -> List[int]:
+        """
+        The numbers of the snapshots or logs in the directory, from oldest to newest
+
+        Arguments:
+            pattern (re.Pattern): SNAPSHOT_FILE or LOG_FILE.
+        """
+        return sorted(int(match.group(1)) for match in map(pattern.match, listdir(self.directory)) if match is not None)
+
+    def __snapshot_path(self, generation: int) -> str:
+        """
+        Arguments:
+            generation (int): The number of the snapshot.
+        """
+        return path.join(self.directory, f'snapshot-{generation}.shapes')
+
+    def __log_path(self, generation: int) -> str:
+        """
+        Arguments:
+            generation (int): The number of the log.
+        """
+        return path.join(self.directory, f'journal-{generation}.log')
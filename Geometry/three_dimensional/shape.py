@@ -1,52 +1,73 @@
-from geometry.three_dimensional.buffers import buffer_colors
-from geometry.rgb import random_rgb
+from geometry.three_dimensional.geometry_cache import Mesh, geometry_cache
+from geometry.three_dimensional.texture_cache import Texture, texture_cache
+from geometry.three_dimensional.bvh import BOUNDING_BOX, ray_triangles_distance
+from geometry.three_dimensional.vertex_buffer import VertexBuffer
+from geometry.three_dimensional.triangles import triangle_indices
+from geometry.three_dimensional.projection import model_matrix, transform_points
+from geometry.three_dimensional.buffers import buffer_colors, shape_ids
+from geometry.rgb import id_to_rgb
 from CTkToast import CTkToast
 from custom_types import *
 from constants import *
 from save import *
 
-from typing import Any, KeysView, ValuesView, Callable
+from typing import Any, Callable, Dict
+from event_bus import TOPIC, SHAPE_CHANGED, SHAPE_DELETED, SHAPE_TRANSFORMED, TRANSFORM_FIELDS, event_bus
 from abc import ABC, abstractmethod
-from observers import Observable
-from PIL import Image
+from numpy import arange, array, float64
+from numpy.linalg import inv
 
 import OpenGL.GLU as GLU
 import OpenGL.GL as GL
 
-class Shape(ABC, Observable):
+class Shape(ABC):
     """
     Abstract base class representing a 3D geometric shape.
 
     Static fields:
         selected_shape (Type['Shape'] | None): The currently selected shape, if any.
-        buffer_colors (Dict[int, RGB]): A dictionary mapping shape IDs to RGB colors.
 
         default_increment (int): The default increment value.
         grid_color (RGB): The color of the grid.
 
-        shape_ids (List[int]): A list of shape IDs.
-        current_buffer_colors (RGBS): The current buffer colors.
-
         mouse_x (int): The current X-coordinate of the mouse.
         mouse_y (int): The current Y-coordinate of the mouse.
+
+        marker_size (float): The size in pixels of the dots drawn on the vertices of a selected shape.
+        dot_quadric (Any): The GLU quadric reused by draw_dot_at.
+
+        primitive_mode (int): The OpenGL primitive type the shape draws its vertices with.
+
+        detail_levels (Tuple[float, ...]): The fraction of the slices and stacks kept by each level of detail, the first is always 1.
+        detail_thresholds (Tuple[float, ...]): The screen radius in pixels below which the next level of detail is used.
+        detail_hysteresis (float): How far past a threshold the screen radius has to go before the level changes.
     """
     translate_increment: float = 0.1
     resize_increment: float = 0.1
     grid_color: RGB = BLACK
 
-    shape_ids: KeysView[int] = buffer_colors.keys()
-    current_buffer_colors: ValuesView[RGB] = buffer_colors.values()
-
     mouse_x: int = 0
     mouse_y: int = 0
 
+    marker_size: float = 4.0
+    dot_quadric: Any = None
+
+    primitive_mode: int = GL.GL_TRIANGLES
+
+    detail_levels: Tuple[float, ...] = (1.0,)
+    detail_thresholds: Tuple[float, ...] = (96.0, 40.0, 16.0)
+    detail_hysteresis: float = 0.2
+
     def __init__(self) -> None:
         """
         Initializes a Shape object.
 
         Attributes:
             id (int): The unique identifier of the shape.
-            vertices (VERTICES): List of vertices for creating the shape.
+            mesh (Mesh): The vertices of the shape, shared with other shapes that have the same parameters.
+            cached_bounding_box (Optional[BOUNDING_BOX]): The world bounding box, None until it is needed after a change.
+            detail_level (int): The index of the detail level drawn, 0 is the full mesh.
+            detail_meshes (Dict[int, Mesh]): The coarser meshes of the detail levels that were drawn.
 
             __background_color (RGB): The background color of the shape.
             __texture_path (str): The path to the texture.
@@ -57,7 +78,7 @@ class Shape(ABC, Observable):
 
             __use_texture (bool): Use the texture on the shape.
             texture_loaded (bool): If the texture had already been loaded.
-            texture_id (int): The id for the loaded texture
+            texture (Optional[Texture]): The loaded texture, shared with other shapes using the same image.
 
             __x_rotation (NUMBER): The shapes x rotation on its axis.
             __y_rotation (NUMBER): The shapes y rotation on its axis.
@@ -68,13 +89,13 @@ class Shape(ABC, Observable):
         """
         super().__init__()
 
-        self.id: int = 0 if len(Shape.shape_ids) <= 0 else len(Shape.shape_ids) + 1
-        buffer_colors[self.id] = random_rgb(exemption_list=Shape.current_buffer_colors)
-
-        self.vertices: VERTICES = []
+        self.id: int = next(shape_ids)
+        buffer_colors[self.id] = id_to_rgb(self.id)
 
-        if len(self.vertices) <= 0:
-            self.vertices = self.initialize_vertices()
+        self.cached_bounding_box: Optional[BOUNDING_BOX] = None
+        self.detail_level: int = 0
+        self.detail_meshes: Dict[int, Mesh] = {}
+        self.mesh: Mesh = self.__cached_mesh()
 
         self.__background_color: RGB = WHITE
         self.__texture_path: str = ""
@@ -85,7 +106,7 @@ class Shape(ABC, Observable):
 
         self.__use_texture: bool = False
         self.texture_loaded = False
-        self.texture_id = None
+        self.texture: Optional[Texture] = None
 
         self.__x_rotation: float = 0.0
         self.__y_rotation: float = 0.0
@@ -94,6 +115,27 @@ class Shape(ABC, Observable):
         self.__y: float = 0.0
         self.__z: float = 0.0
 
+    @property
+    def vertices(self) -> VERTICES:
+        """
+        vertices (VERTICES): The vertices for creating the shape. These are shared, replace them instead of changing them.
+        """
+        return self.mesh.vertices
+
+    @property
+    def vertex_buffer(self) -> VertexBuffer:
+        """
+        vertex_buffer (VertexBuffer): The GPU copy of the vertices used for drawing.
+        """
+        return self.mesh.vertex_buffer
+
+    @property
+    def texture_id(self) -> Optional[int]:
+        """
+        texture_id (Optional[int]): The id for the loaded texture
+        """
+        return self.texture.texture_id if self.texture is not None else None
+
     @property
     def background_color(self) -> RGB:
         """
@@ -107,7 +149,9 @@ class Shape(ABC, Observable):
         Arguments:
             new_background_color (RGB): The shapes new background color
         """
+        previous_value: RGB = self.__background_color
         self.__background_color = new_background_color
+        self.publish_change('background_color', previous_value)
 
     @property
     def use_texture(self) -> bool:
@@ -126,7 +170,9 @@ class Shape(ABC, Observable):
             CTkToast.toast('Choose a texture first')
             return False
 
+        previous_value: bool = self.__use_texture
         self.__use_texture = new_value
+        self.publish_change('use_texture', previous_value)
         return True
 
     @property
@@ -142,7 +188,10 @@ class Shape(ABC, Observable):
         Arguments:
             new_rotation (float): The new rotation value.
         """
+        previous_value: float = self.__x_rotation
         self.__x_rotation = self.verify_float(Shape.x_rotation, new_rotation)
+        self.cached_bounding_box = None
+        self.publish_change('x_rotation', previous_value)
 
     @property
     def y_rotation(self) -> float:
@@ -157,7 +206,10 @@ class Shape(ABC, Observable):
         Arguments:
             new_rotation (float): The new rotation value.
         """
+        previous_value: float = self.__y_rotation
         self.__y_rotation = self.verify_float(Shape.y_rotation, new_rotation)
+        self.cached_bounding_box = None
+        self.publish_change('y_rotation', previous_value)
 
     @property
     def texture_path(self) -> str:
@@ -174,10 +226,11 @@ class Shape(ABC, Observable):
         Returns:
             The path to the new texture (Used by Properties to update its value)
         """
+        previous_value: str = self.__texture_path
         self.__texture_path = new_path
 
         self.__initialize_texture()
-        self.notify_observers('shape_setter_texture_path', new_path)
+        self.publish_change('texture_path', previous_value)
 
     @property
     def x(self) -> float:
@@ -192,7 +245,10 @@ class Shape(ABC, Observable):
         Arguments:
             new_x (float): The new X-coordinate value.
         """
+        previous_value: float = self.__x
         self.__x = self.verify_float(Shape.x, new_x)
+        self.cached_bounding_box = None
+        self.publish_change('x', previous_value)
 
     @property
     def y(self) -> float:
@@ -207,7 +263,10 @@ class Shape(ABC, Observable):
         Arguments:
             new_y (float): The new Y-coordinate value.
         """
+        previous_value: float = self.__y
         self.__y = self.verify_float(Shape.y, new_y)
+        self.cached_bounding_box = None
+        self.publish_change('y', previous_value)
 
     @property
     def z(self) -> float:
@@ -222,7 +281,26 @@ class Shape(ABC, Observable):
         Arguments:
             new_z (float): The new Z-coordinate value.
         """
+        previous_value: float = self.__z
         self.__z = self.verify_float(Shape.z, new_z)
+        self.cached_bounding_box = None
+        self.publish_change('z', previous_value)
+
+    def place(self, x: float, y: float, z: float, x_rotation: float, y_rotation: float) -> None:
+        """
+        Moves and rotates the shape at once without validating or publishing each value,
+        used for shapes created from a file before anything tracks them
+
+        Arguments:
+            x (float): The X-coordinate.
+            y (float): The Y-coordinate.
+            z (float): The Z-coordinate.
+            x_rotation (float): The x rotation of the shape.
+            y_rotation (float): The y rotation of the shape.
+        """
+        self.__x, self.__y, self.__z = x, y, z
+        self.__x_rotation, self.__y_rotation = x_rotation, y_rotation
+        self.cached_bounding_box = None
 
     def __verify_value(self, shape_property: property, value: Any, data_type: Any) -> Any:
         """
@@ -241,7 +319,7 @@ class Shape(ABC, Observable):
             AttributeError: If shape_property does not have a getter method.
         """
         if shape_property is None:
-            raise ValueError("Property is required for getting the current value and setting the name for notifying observers")
+            raise ValueError("Property is required for getting the current value and the name of the property")
 
         getter = shape_property.fget
 
@@ -259,8 +337,6 @@ class Shape(ABC, Observable):
 
         try:
             converted_value: Any = data_type(value)
-
-            self.notify_observers(f'shape_setter_{property_name}', converted_value)
             return converted_value
         except:
             CTkToast.toast(f'{property_name} only accepts {data_type.__name__}')
@@ -280,17 +356,36 @@ class Shape(ABC, Observable):
         """
         return self.__verify_value(shape_property, value, data_type)
 
+    def publish_change(self, property_name: str, previous_value: Any) -> None:
+        """
+        Publishes the value a setter just stored, moves and rotations as SHAPE_TRANSFORMED and the others as SHAPE_CHANGED.
+        Nothing is published if the value did not change.
+
+        Arguments:
+            property_name (str): The name of the property that was set.
+            previous_value (Any): The value of the property before it was set.
+        """
+        new_value: Any = getattr(self, property_name)
+
+        if new_value == previous_value:
+            return
+
+        topic: TOPIC = SHAPE_TRANSFORMED if property_name in TRANSFORM_FIELDS else SHAPE_CHANGED
+        event_bus.publish(topic, self, property_name, new_value, previous_value)
+
     def reinitialize_id_and_assigned_buffer_color(self) -> None:
         """
         Generates a new id and assigned_buffer_color for the shape. Useful if the shape is duplicated,
         calling this method creates a separate id and assigned_color for the copied shape.
         """
-        self.id: int = 0 if len(Shape.shape_ids) <= 0 else len(Shape.shape_ids) + 1
-        buffer_colors[self.id] = random_rgb(exemption_list=Shape.current_buffer_colors)
+        del buffer_colors[self.id]
+
+        self.id: int = next(shape_ids)
+        buffer_colors[self.id] = id_to_rgb(self.id)
 
     def assigned_buffer_color(self) -> RGB:
         """
-        The unique background color used by the shape for color picking
+        The unique background color used by the shape for color picking, it is the shapes id encoded by id_to_rgb
         """
         return buffer_colors[self.id]
 
@@ -317,6 +412,7 @@ class Shape(ABC, Observable):
                 setattr(new_instance, clean_attribute_name, getter_value)
 
         new_instance.reinitialize_id_and_assigned_buffer_color()
+        new_instance.share_mesh(self.mesh)
 
         if new_instance.texture_path:
             new_instance.__initialize_texture()
@@ -324,12 +420,152 @@ class Shape(ABC, Observable):
         return new_instance
 
     @abstractmethod
-    def initialize_vertices(self):
+    def initialize_vertices(self, detail: float = 1.0):
         """
         Initializes the shapes vertices
+
+        Arguments:
+            detail (float): The fraction of the slices and stacks to generate, used by shapes with several detail_levels. Defaults to 1.0
         """
         raise NotImplementedError("Must implement this shapes' initial vertices")
 
+    def geometry_parameters(self, detail: float = 1.0) -> Optional[Tuple[Any, ...]]:
+        """
+        The parameters initialize_vertices uses to generate the vertices.
+        Shapes with the same class and parameters share the same cached mesh.
+
+        Arguments:
+            detail (float): The fraction of the slices and stacks to generate. Defaults to 1.0
+
+        Returns:
+            A tuple of the parameters or None if the vertices should not be cached
+        """
+        return None
+
+    @staticmethod
+    def reduce_detail(count: float, detail: float, minimum: int = 3) -> float:
+        """
+        Returns the number of slices or stacks generated at a detail level
+
+        Arguments:
+            count (float): The number of slices or stacks of the full mesh.
+            detail (float): The fraction of them to keep.
+            minimum (int): The fewest slices or stacks that still look like the shape. Defaults to 3
+        """
+        if detail >= 1:
+            return count
+
+        return min(count, max(minimum, round(count * detail)))
+
+    def update_geometry(self) -> None:
+        """
+        Replaces the shapes mesh with the cached mesh for its current parameters
+        """
+        self.__replace_mesh(self.__cached_mesh())
+
+    def __cached_mesh(self) -> Mesh:
+        """
+        Returns the cached mesh for the current parameters, a new mesh if the vertices should not be cached
+        """
+        parameters: Optional[Tuple[Any, ...]] = self.geometry_parameters()
+
+        if parameters is None:
+            return geometry_cache.create(self.initialize_vertices())
+
+        key = geometry_cache.key(self.__class__, parameters)
+        return geometry_cache.acquire(key, self.initialize_vertices)
+
+    def set_vertices(self, vertices: VERTICES) -> None:
+        """
+        Replaces the shapes mesh with vertices that are not generated from its parameters
+
+        Arguments:
+            vertices (VERTICES): The new vertices.
+        """
+        self.__replace_mesh(geometry_cache.create(vertices))
+
+    def share_mesh(self, mesh: Mesh) -> None:
+        """
+        Uses the mesh of another shape
+
+        Arguments:
+            mesh (Mesh): The mesh to be shared.
+        """
+        self.__replace_mesh(geometry_cache.retain(mesh))
+
+    def __replace_mesh(self, mesh: Mesh) -> None:
+        """
+        Sets the new mesh and releases the previous one
+
+        Arguments:
+            mesh (Mesh): The new mesh.
+        """
+        previous_mesh: Mesh = self.mesh
+        self.mesh = mesh
+        self.cached_bounding_box = None
+
+        geometry_cache.release(previous_mesh)
+
+        self.__release_detail_meshes()
+
+    def __release_detail_meshes(self) -> None:
+        """
+        Releases the coarser meshes, they are acquired again for the new parameters when drawn
+        """
+        for detail_mesh in self.detail_meshes.values():
+            geometry_cache.release(detail_mesh)
+
+        self.detail_meshes.clear()
+
+    def select_detail_level(self, screen_radius: float) -> None:
+        """
+        Picks the level of detail for the size of the shape on screen. The level only changes
+        once the radius is detail_hysteresis past a threshold so a shape on the edge does not flicker.
+        Selected and textured shapes are always drawn with the full mesh.
+
+        Arguments:
+            screen_radius (float): The radius of the shapes bounding sphere in pixels.
+        """
+        last_level: int = len(self.detail_levels) - 1
+
+        if last_level <= 0 or self.selected or self.use_texture:
+            self.detail_level = 0
+            return
+
+        level: int = min(self.detail_level, last_level)
+
+        while level > 0 and screen_radius > Shape.detail_thresholds[level - 1] * (1 + Shape.detail_hysteresis):
+            level -= 1
+
+        while level < last_level and screen_radius < Shape.detail_thresholds[level] * (1 - Shape.detail_hysteresis):
+            level += 1
+
+        self.detail_level = level
+
+    def detail_mesh(self) -> Mesh:
+        """
+        Returns the mesh of the current detail level, coarser meshes come from the geometry cache
+        """
+        if self.detail_level == 0:
+            return self.mesh
+
+        detail_mesh: Optional[Mesh] = self.detail_meshes.get(self.detail_level, None)
+
+        if detail_mesh is not None:
+            return detail_mesh
+
+        detail: float = self.detail_levels[self.detail_level]
+        parameters: Optional[Tuple[Any, ...]] = self.geometry_parameters(detail)
+
+        if parameters is None:
+            return self.mesh
+
+        key = geometry_cache.key(self.__class__, parameters)
+        detail_mesh = geometry_cache.acquire(key, lambda: self.initialize_vertices(detail))
+        self.detail_meshes[self.detail_level] = detail_mesh
+
+        return detail_mesh
+
     @abstractmethod
     def draw(self, offscreen: bool = False) -> None:
         """
@@ -347,6 +583,120 @@ class Shape(ABC, Observable):
         """
         raise NotImplementedError("You might've not implemented this shapes resize method")
 
+    def vertex_indices(self, vertex_count: int) -> Optional[List[int]]:
+        """
+        The order in which the vertices are drawn by draw_vertex_buffer.
+        Override this if the shape does not draw its vertices in order.
+
+        Arguments:
+            vertex_count (int): The number of vertices of the mesh being drawn, coarser levels of detail have less.
+
+        Returns:
+            A list of indices to the vertices or None if the vertices are drawn in order
+        """
+        return None
+
+    def triangles(self, mesh: Optional[Mesh] = None) -> NDArray[float32]:
+        """
+        The triangles drawn by draw_vertex_buffer in the shapes local space, computed once per mesh
+
+        Arguments:
+            mesh (Optional[Mesh]): The mesh to be split, like the mesh of a detail level. Defaults to the full mesh.
+
+        Returns:
+            A (M, 3, 3) array of the corners of every triangle
+        """
+        mesh = self.mesh if mesh is None else mesh
+
+        if mesh.triangles is None:
+            indices: Optional[List[int]] = self.vertex_indices(len(mesh.vertices))
+            draw_order = arange(len(mesh.vertices)) if indices is None else indices
+
+            mesh.triangles = mesh.vertices[triangle_indices(self.primitive_mode, draw_order)]
+
+        return mesh.triangles
+
+    def world_bounding_box(self) -> BOUNDING_BOX:
+        """
+        The axis aligned box enclosing the shape after it is moved and rotated,
+        kept until the shape moves, rotates or its mesh is replaced
+
+        Returns:
+            A (2, 3) array of the minimum and maximum corners
+        """
+        if self.cached_bounding_box is not None:
+            return self.cached_bounding_box
+
+        (min_x, min_y, min_z), (max_x, max_y, max_z) = self.vertices.min(axis=0), self.vertices.max(axis=0)
+
+        corners: NDArray[float64] = array([
+            (x, y, z) for x in (min_x, max_x) for y in (min_y, max_y) for z in (min_z, max_z)
+        ], dtype=float64)
+
+        world_corners: NDArray[float64] = transform_points(model_matrix(self), corners)
+        self.cached_bounding_box = array((world_corners.min(axis=0), world_corners.max(axis=0)))
+
+        return self.cached_bounding_box
+
+    def ray_distance(self, origin: NDArray, direction: NDArray) -> Optional[float]:
+        """
+        The distance along a world space ray to where it hits the shape
+
+        Arguments:
+            origin (NDArray): The start of the ray.
+            direction (NDArray): The normalized direction of the ray.
+
+        Returns:
+            The distance or None if the ray misses the shape
+        """
+        world_to_local = inv(model_matrix(self))
+
+        # the shapes are only moved and rotated so distances are the same in local space
+        local_origin: NDArray = transform_points(world_to_local, origin.reshape(1, 3))[0]
+        local_direction: NDArray = world_to_local[:3, :3] @ direction
+
+        return ray_triangles_distance(local_origin, local_direction, self.triangles())
+
+    def draw_vertex_buffer(self, mode: int, use_normals: bool = False) -> None:
+        """
+        Draws the shapes vertices with a single draw call.
+        The vertices are only uploaded again after initialize_vertices() or resize() replaced the mesh.
+        The mesh of the current detail level is drawn.
+
+        Arguments:
+            mode (int): The OpenGL primitive type, ex: GL_TRIANGLES.
+            use_normals (bool): Use the vertices as normals as well. Defaults to False.
+        """
+        mesh: Mesh = self.detail_mesh()
+
+        self.__update_vertex_buffer(mesh)
+        mesh.vertex_buffer.draw(mode, use_normals)
+
+    def draw_vertex_markers(self) -> None:
+        """
+        Draws a round dot on every vertex of the shape with a single draw call.
+        The dots are point sprites drawn from the vertex buffer, so nothing is allocated per frame.
+        """
+        self.__update_vertex_buffer(self.mesh)
+
+        GL.glPushAttrib(GL.GL_POINT_BIT)
+        GL.glEnable(GL.GL_POINT_SMOOTH)
+        GL.glPointSize(Shape.marker_size)
+
+        self.vertex_buffer.draw_points()
+
+        GL.glPopAttrib()
+
+    def __update_vertex_buffer(self, mesh: Mesh) -> None:
+        """
+        Uploads the vertices if the vertex buffer no longer matches them
+
+        Arguments:
+            mesh (Mesh): The mesh being drawn.
+        """
+        if mesh.vertex_buffer.is_outdated(mesh.vertices):
+            mesh.vertex_buffer.upload(mesh.vertices, self.vertex_indices(len(mesh.vertices)))
+
     def draw_to_canvas(self, offscreen: bool = False) -> None:
         """
         Renders the shape to the canvas
@@ -395,6 +745,7 @@ class Shape(ABC, Observable):
     def draw_dot_at(self, x: NUMBER, y: NUMBER, z: NUMBER) -> None:
         """
         Draw a circle at the specified (x, y, z) coordinate.
+        Prefer draw_vertex_markers when drawing a dot on every vertex.
 
         Arguments:
             x (int): The x-coordinate of the center of the circle.
@@ -403,27 +754,48 @@ class Shape(ABC, Observable):
         """
         radius: float = 0.02
 
+        # a single quadric is reused instead of creating one per dot
+        if Shape.dot_quadric is None:
+            Shape.dot_quadric = GLU.gluNewQuadric()
+            GLU.gluQuadricDrawStyle(Shape.dot_quadric, GLU.GLU_FILL)
+
         GL.glPushMatrix()
         GL.glTranslatef(x, y, z)
-        quadric = GLU.gluNewQuadric()
-        GLU.gluQuadricDrawStyle(quadric, GLU.GLU_FILL)
-        GLU.gluSphere(quadric, radius, 10, 10)
+        GLU.gluSphere(Shape.dot_quadric, radius, 10, 10)
         GL.glPopMatrix()
 
     def __initialize_texture(self) -> None:
         """
-        Loads the texture
+        Loads the texture from the texture cache, the image is only decoded and uploaded once for every shape using it
         """
-        image = Image.open(self.texture_path)
-        image_data = image.tobytes("raw", "RGB", 0)
-        width, height = image.size
+        previous_texture: Optional[Texture] = self.texture
 
-        self.texture_id = GL.glGenTextures(1)
-        GL.glBindTexture(GL.GL_TEXTURE_2D, self.texture_id)
+        self.texture = texture_cache.acquire(self.texture_path)
+        self.texture_loaded = True
 
-        GL.glTexImage2D(GL.GL_TEXTURE_2D, 0, GL.GL_RGB, width, height, 0, GL.GL_RGB, GL.GL_UNSIGNED_BYTE, image_data)
-        GL.glTexParameteri(GL.GL_TEXTURE_2D, GL.GL_TEXTURE_MIN_FILTER, GL.GL_LINEAR)
-        GL.glTexParameteri(GL.GL_TEXTURE_2D, GL.GL_TEXTURE_MAG_FILTER, GL.GL_LINEAR)
+        if previous_texture is not None:
+            texture_cache.release(previous_texture)
+
+    def texture_ready(self) -> bool:
+        """
+        Starts loading the texture if it was not yet loaded and checks if it can be attached.
+        The image is decoded in the background, the shape is drawn with its background color until then.
+        """
+        if not self.texture_loaded:
+            self.__initialize_texture()
+
+        return self.texture is not None and self.texture.ready
+
+    def __release_texture(self) -> None:
+        """
+        Gives the texture back to the texture cache
+        """
+        if self.texture is None:
+            return
+
+        texture_cache.release(self.texture)
+        self.texture = None
+        self.texture_loaded = False
 
     def attach_texture(self) -> None:
         """
@@ -445,19 +817,29 @@ class Shape(ABC, Observable):
 
     def delete(self) -> None:
         """
-        Deletes a shape by removing its assigned buffer color
-        then emits an event called 'shapes_deleted' which gets caught by Canvas.notify which then
-        removes it from the Canvas's shapes.
+        Deletes a shape by removing its assigned buffer color and releasing its mesh
+        then publishes SHAPE_DELETED which the Canvas handles by removing it from its shapes.
         """
         del buffer_colors[self.id]
-        self.notify_observers('shape_deleted')
+        geometry_cache.release(self.mesh)
+        self.__release_detail_meshes()
+        self.__release_texture()
+        event_bus.publish(SHAPE_DELETED, self)
+
+    def restore(self) -> None:
+        """
+        Takes back a deleted shape by assigning its buffer color and mesh again, used to undo the deletion.
+        The texture is loaded again the next time it is drawn.
+        """
+        buffer_colors[self.id] = id_to_rgb(self.id)
+        geometry_cache.retain(self.mesh)
+        self.selected = False
 
     def move_up(self) -> None:
         """
         Moves shape up
         """
         self.z += Shape.translate_increment
-        self.notify_observers('shape_move_up', self.z)
         return
 
     def move_down(self) -> None:
@@ -465,7 +847,6 @@ class Shape(ABC, Observable):
         Moves shape down
         """
         self.z -= Shape.translate_increment
-        self.notify_observers('shape_move_down', self.z)
         return
 
     def move_forward(self) -> None:
@@ -473,7 +854,6 @@ class Shape(ABC, Observable):
         Moves shape forward (away from the viewer along the positive Z-axis)
         """
         self.y += Shape.translate_increment
-        self.notify_observers('shape_move_forward', self.y)
         return
 
     def move_backward(self) -> None:
@@ -481,7 +861,6 @@ class Shape(ABC, Observable):
         Moves shape backward (closer to the viewer along the negative Z-axis)
         """
         self.y -= Shape.translate_increment
-        self.notify_observers('shape_move_backward', self.y)
         return
 
     def move_left(self) -> None:
@@ -489,7 +868,6 @@ class Shape(ABC, Observable):
         Moves shape left (along the negative X-axis)
         """
         self.x -= Shape.translate_increment
-        self.notify_observers('shape_move_left', self.x)
         return
 
     def move_right(self) -> None:
@@ -497,5 +875,4 @@ class Shape(ABC, Observable):
         Moves shape right (along the positive X-axis)
         """
         self.x += Shape.translate_increment
-        self.notify_observers('shape_move_right', self.x)
         return
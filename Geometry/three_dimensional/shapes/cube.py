@@ -1,5 +1,7 @@
 from geometry.three_dimensional.shape import Shape
-from typing import override
+from event_bus import SHAPE_RESIZED, event_bus
+from typing import Any, override
+from numpy import array
 
 from custom_types import *
 from constants import *
@@ -8,6 +10,8 @@ import OpenGL.GL as GL
 
 class Cube(Shape):
 
+    primitive_mode: int = GL.GL_QUADS
+
     def __init__(self, width: float = 2.0, height: float = 2.0, depth: float = 2.0) -> None:
         """
         Initializes the cube
@@ -53,7 +57,9 @@ class Cube(Shape):
         Arguments:
             new_width (float): the new width of the shape
         """
+        previous_value: float = self.__width
         self.__width = self.verify_float(Cube.width, new_width)
+        self.publish_change('width', previous_value)
 
     @property
     def height(self) -> float:
@@ -68,7 +74,9 @@ class Cube(Shape):
         Arguments:
             new_height (float): the new height of the shape
         """
+        previous_value: float = self.__height
         self.__height = self.verify_float(Cube.height, new_height)
+        self.publish_change('height', previous_value)
 
     @property
     def scale(self) -> float:
@@ -83,7 +91,9 @@ class Cube(Shape):
         Arguments:
             new_scale (float): the new scale of the shape
         """
+        previous_value: float = self.__scale
         self.__scale = self.verify_float(Cube.scale, new_scale)
+        self.publish_change('scale', previous_value)
 
     @property
     def depth(self) -> float:
@@ -98,7 +108,9 @@ class Cube(Shape):
         Arguments:
             new_depth (float): the new depth of the shape
         """
+        previous_value: float = self.__depth
         self.__depth = self.verify_float(Cube.depth, new_depth)
+        self.publish_change('depth', previous_value)
 
     def half_width(self) -> float:
         """
@@ -126,7 +138,7 @@ class Cube(Shape):
             increment (bool): If True, increase the size, else decrease. Defaults to True.
         """
         factor: float = Shape.resize_increment if increment else -Shape.resize_increment
-        center: Tuple[float, float, float] = self.calculate_center()
+        center: NDArray[float32] = self.calculate_center()
 
         self.scale = self.width
 
@@ -135,40 +147,44 @@ class Cube(Shape):
         self.height += factor * Shape.resize_increment
         self.depth += factor * Shape.resize_increment
 
-        for index in range(len(self.vertices)):
-            x, y, z = self.vertices[index]
+        dimensions: NDArray[float32] = array((self.width, self.height, self.depth), dtype=float32)
 
-            # Move vertices relative to the center
-            self.vertices[index] = (
-                center[0] + (x - center[0]) * (1 + factor / self.width),
-                center[1] + (y - center[1]) * (1 + factor / self.height),
-                center[2] + (z - center[2]) * (1 + factor / self.depth)
-            )
+        # Move vertices relative to the center
+        self.set_vertices(center + (self.vertices - center) * (1 + factor / dimensions))
+        event_bus.publish(SHAPE_RESIZED, self, value=increment)
 
-    def calculate_center(self) -> Tuple[float, float, float]:
+    def calculate_center(self) -> NDArray[float32]:
         """
         Calculates the center of the shape.
 
         Returns:
-            Tuple[float, float, float]: The coordinates of the center.
+            NDArray[float32]: The x, y, z coordinates of the center.
+        """
+        return self.vertices.mean(axis=0)
+
+    @override
+    def geometry_parameters(self, detail: float = 1.0) -> Optional[Tuple[Any, ...]]:
+        """
+        Returns the width, height and depth that generate the cubes vertices
+
+        Arguments:
+            detail (float): Ignored, a cube has a single level of detail. Defaults to 1.0
         """
-        sum_x = sum_y = sum_z = 0.0
-        for x, y, z in self.vertices:
-            sum_x += x
-            sum_y += y
-            sum_z += z
-        return sum_x / len(self.vertices), sum_y / len(self.vertices), sum_z / len(self.vertices)
+        return (self.width, self.height, self.depth)
 
     @override
-    def initialize_vertices(self) -> VERTICES:
+    def initialize_vertices(self, detail: float = 1.0) -> VERTICES:
         """
         Returns the cubes initial vertices
+
+        Arguments:
+            detail (float): Ignored, a cube has a single level of detail. Defaults to 1.0
         """
         half_width: float = self.half_width()
         half_height: float = self.half_height()
         half_depth: float = self.half_depth()
 
-        return [
+        return array([
             (-half_width, -half_height, -half_depth),  # Vertex 0
             (half_width, -half_height, -half_depth),   # Vertex 1
             (half_width, half_height, -half_depth),    # Vertex 2
@@ -177,7 +193,14 @@ class Cube(Shape):
             (half_width, -half_height, half_depth),    # Vertex 5
             (half_width, half_height, half_depth),     # Vertex 6
             (-half_width, half_height, half_depth)     # Vertex 7
-        ]
+        ], dtype=float32)
+
+    @override
+    def vertex_indices(self, vertex_count: int) -> Optional[List[int]]:
+        """
+        Returns the indices of each face's corners
+        """
+        return [index for face in self.__faces for index in face]
 
     @override
     def attach_texture(self) -> None:
@@ -217,16 +240,10 @@ class Cube(Shape):
         """
         GL.glColor3f(*self.background_color if not offscreen else self.assigned_buffer_color())
 
-        if self.use_texture and not offscreen:
+        if self.use_texture and not offscreen and self.texture_ready():
             self.attach_texture()
 
-        GL.glBegin(GL.GL_QUADS)
-
-        for face in self.__faces:
-            for index in face:
-                GL.glVertex3fv(self.vertices[index])
-
-        GL.glEnd()
+        self.draw_vertex_buffer(self.primitive_mode)
 
         if not offscreen and self.selected:
             self.draw_grid()
@@ -247,5 +264,4 @@ class Cube(Shape):
 
         GL.glEnd()
 
-        for vertex in self.vertices:
-            self.draw_dot_at(*vertex)
\ No newline at end of file
+        self.draw_vertex_markers()
\ No newline at end of file
@@ -1,6 +1,8 @@
 from geometry.three_dimensional.shape import Shape
-from math import pi, sin, cos
-from typing import override
+from event_bus import SHAPE_RESIZED, event_bus
+from numpy import arange, cos, repeat, sin, zeros
+from math import pi
+from typing import Any, override
 
 from custom_types import *
 from constants import *
@@ -9,6 +11,9 @@ import OpenGL.GL as GL
 
 class Cylinder(Shape):
 
+    primitive_mode: int = GL.GL_QUAD_STRIP
+    detail_levels: Tuple[float, ...] = (1.0, 0.5, 0.25, 0.125)
+
     def __init__(self, radius: float = 1.5, height: float = 2.5, slices: float = 30) -> None:
         """
         Initializes the cylinder
@@ -37,7 +42,9 @@ class Cylinder(Shape):
         Arguments:
             new_radius (float): the new shapes radius
         """
+        previous_value: float = self.__radius
         self.__radius = self.verify_float(Cylinder.radius, new_radius)
+        self.publish_change('radius', previous_value)
 
     @property
     def height(self) -> float:
@@ -52,7 +59,9 @@ class Cylinder(Shape):
         Arguments:
             new_height (NUMBER): the new shapes height
         """
+        previous_value: float = self.__height
         self.__height = self.verify_float(Cylinder.height, new_height)
+        self.publish_change('height', previous_value)
 
     @property
     def slices(self) -> float:
@@ -67,7 +76,9 @@ class Cylinder(Shape):
         Arguments:
             new_slices (float): the new shapes slices
         """
+        previous_value: float = self.__slices
         self.__slices = self.verify_float(Cylinder.slices, new_slices)
+        self.publish_change('slices', previous_value)
 
     @override
     def resize(self, increment: bool = True) -> None:
@@ -85,27 +96,35 @@ class Cylinder(Shape):
                 self.radius -= Shape.resize_increment
                 self.height -= Shape.resize_increment
 
-        self.vertices = self.initialize_vertices()
+        self.update_geometry()
+        event_bus.publish(SHAPE_RESIZED, self, value=increment)
 
     @override
-    def initialize_vertices(self) -> VERTICES:
+    def geometry_parameters(self, detail: float = 1.0) -> Optional[Tuple[Any, ...]]:
         """
-        Returns the cylinder's initial vertices
+        Returns the radius, height and slices that generate the cylinders vertices
+
+        Arguments:
+            detail (float): The fraction of the slices to generate. Defaults to 1.0
         """
-        vertices: VERTICES = []
+        return (self.radius, self.height, Shape.reduce_detail(self.slices, detail))
 
-        for slice_index in range(int(self.__slices + 1)):
-            angle: float = 2 * pi * (slice_index / self.__slices)
-            x: float = cos(angle)
-            y: float = sin(angle)
+    @override
+    def initialize_vertices(self, detail: float = 1.0) -> VERTICES:
+        """
+        Returns the cylinder's initial vertices
 
-            vertices.append(
-                (x * self.__radius, y * self.__radius, 0)
-            )
+        Arguments:
+            detail (float): The fraction of the slices to generate. Defaults to 1.0
+        """
+        slices: float = Shape.reduce_detail(self.__slices, detail)
+        angles: NDArray = 2 * pi * (arange(int(slices + 1)) / slices)
+        vertices: VERTICES = zeros((len(angles) * 2, 3), dtype=float32)
 
-            vertices.append(
-                (x * self.__radius, y * self.__radius, self.__height)
-            )
+        # every bottom vertex is followed by the top vertex above it
+        vertices[:, 0] = repeat(cos(angles) * self.__radius, 2)
+        vertices[:, 1] = repeat(sin(angles) * self.__radius, 2)
+        vertices[1::2, 2] = self.__height
 
         return vertices
 
@@ -137,15 +156,10 @@ class Cylinder(Shape):
         """
         GL.glColor3f(*self.background_color if not offscreen else self.assigned_buffer_color())
 
-        if self.use_texture and not offscreen:
+        if self.use_texture and not offscreen and self.texture_ready():
             self.attach_texture()
 
-        GL.glBegin(GL.GL_QUAD_STRIP)
-
-        for vertex in self.vertices:
-            GL.glVertex3f(*vertex)
-
-        GL.glEnd()
+        self.draw_vertex_buffer(self.primitive_mode)
 
         if not offscreen and self.selected:
             self.draw_grid()
@@ -167,5 +181,4 @@ class Cylinder(Shape):
 
         GL.glEnd()
 
-        for vertex in self.vertices:
-            self.draw_dot_at(*vertex)
+        self.draw_vertex_markers()
@@ -1,5 +1,7 @@
 from geometry.three_dimensional.shape import Shape
-from typing import override
+from event_bus import SHAPE_RESIZED, event_bus
+from typing import Any, override
+from numpy import array
 from custom_types import *
 from constants import *
 
@@ -7,6 +9,8 @@ import OpenGL.GL as GL
 
 class Pyramid(Shape):
 
+    primitive_mode: int = GL.GL_TRIANGLES
+
     def __init__(self, base_length: float = 3.0, height: float = 3.0) -> None:
         """
         Initializes the pyramid
@@ -17,7 +21,6 @@ class Pyramid(Shape):
         """
         self.__base_length: float = base_length
         self.__height: float = height
-        self.__corners: VERTICES = []
 
         super().__init__()
 
@@ -34,7 +37,9 @@ class Pyramid(Shape):
         Arguments:
             new_base_length (float): the new base_length of the shape
         """
+        previous_value: float = self.__base_length
         self.__base_length = self.verify_float(Pyramid.base_length, new_base_length)
+        self.publish_change('base_length', previous_value)
 
     @property
     def height(self) -> float:
@@ -49,7 +54,9 @@ class Pyramid(Shape):
         Arguments:
             new_height (float): the new height of the shape
         """
+        previous_value: float = self.__height
         self.__height = self.verify_float(Pyramid.height, new_height)
+        self.publish_change('height', previous_value)
 
     def resize(self, increment: bool = True) -> None:
         """
@@ -66,11 +73,31 @@ class Pyramid(Shape):
                 self.base_length -= Shape.resize_increment
                 self.height -= Shape.resize_increment
 
-        self.vertices = self.initialize_vertices()
+        self.update_geometry()
+        event_bus.publish(SHAPE_RESIZED, self, value=increment)
+
+    @override
+    def geometry_parameters(self, detail: float = 1.0) -> Optional[Tuple[Any, ...]]:
+        """
+        Returns the base length and height that generate the pyramids vertices
+
+        Arguments:
+            detail (float): Ignored, a pyramid has a single level of detail. Defaults to 1.0
+        """
+        return (self.base_length, self.height)
+
+    def corners(self) -> VERTICES:
+        """
+        Returns the base corners of the pyramid (front left, front right, back right, back left)
+        """
+        return self.vertices[[1, 2, 5, 8]]
 
-    def initialize_vertices(self) -> VERTICES:
+    def initialize_vertices(self, detail: float = 1.0) -> VERTICES:
         """
         Returns the pyramid's initial vertices
+
+        Arguments:
+            detail (float): Ignored, a pyramid has a single level of detail. Defaults to 1.0
         """
         top_point: VERTEX = (0.0, 0.0, self.height)  # Swap y and z coordinates
         front_left: VERTEX = (-self.base_length / 2, -self.base_length / 2, 0.0)
@@ -78,14 +105,12 @@ class Pyramid(Shape):
         back_right: VERTEX = (self.base_length / 2, self.base_length / 2, 0.0)
         back_left: VERTEX = (-self.base_length / 2, self.base_length / 2, 0.0)
 
-        self.__corners: VERTICES = [front_left, front_right, back_right, back_left]
-
-        return [
+        return array([
             top_point, front_left, front_right,
             top_point, front_right, back_right,
             top_point, back_right, back_left,
             top_point, back_left, front_left
-        ]
+        ], dtype=float32)
 
     @override
     def attach_texture(self) -> None:
@@ -119,15 +144,10 @@ class Pyramid(Shape):
         """
         GL.glColor3f(*self.background_color if not offscreen else self.assigned_buffer_color())
 
-        if self.use_texture and not offscreen:
+        if self.use_texture and not offscreen and self.texture_ready():
             self.attach_texture()
 
-        GL.glBegin(GL.GL_TRIANGLES)
-
-        for vertex in self.vertices:
-            GL.glVertex3f(*vertex)
-
-        GL.glEnd()
+        self.draw_vertex_buffer(self.primitive_mode)
 
         if not offscreen and self.selected:
             self.draw_grid()
@@ -141,9 +161,11 @@ class Pyramid(Shape):
 
         GL.glColor3f(*Shape.grid_color)
 
+        corners: VERTICES = self.corners()
+
         GL.glBegin(GL.GL_LINE_LOOP)
 
-        for corner in self.__corners:
+        for corner in corners:
             GL.glVertex3f(*corner)
             GL.glVertex3f(*self.vertices[0])
 
@@ -151,8 +173,8 @@ class Pyramid(Shape):
 
         GL.glBegin(GL.GL_LINES)
 
-        for index in range(len(self.__corners)):
-            GL.glVertex3f(*self.__corners[index])
-            GL.glVertex3f(*self.__corners[(index + 1) % len(self.__corners)])
+        for index in range(len(corners)):
+            GL.glVertex3f(*corners[index])
+            GL.glVertex3f(*corners[(index + 1) % len(corners)])
 
         GL.glEnd()
\ No newline at end of file
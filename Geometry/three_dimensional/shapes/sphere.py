@@ -1,6 +1,8 @@
 from geometry.three_dimensional.shape import Shape
-from math import acos, pi, sin, cos, atan2, sqrt
-from typing import override
+from event_bus import SHAPE_RESIZED, event_bus
+from numpy import arange, cos, newaxis, sin, stack, zeros_like
+from math import pi
+from typing import Any, override
 
 from custom_types import *
 from constants import *
@@ -9,6 +11,9 @@ import OpenGL.GL as GL
 
 class Sphere(Shape):
 
+    primitive_mode: int = GL.GL_TRIANGLE_STRIP
+    detail_levels: Tuple[float, ...] = (1.0, 0.5, 0.25, 0.125)
+
     def __init__(self, radius: float = 1.5, slices: float = 25, stacks: float = 25) -> None:
         """
         Initializes the sphere
@@ -37,7 +42,9 @@ class Sphere(Shape):
         Arguments:
             new_radius (float): the new radius of the shape
         """
+        previous_value: float = self.__radius
         self.__radius = self.verify_float(Sphere.radius, new_radius)
+        self.publish_change('radius', previous_value)
 
     @property
     def slices(self) -> float:
@@ -52,7 +59,9 @@ class Sphere(Shape):
         Arguments:
             new_slices (float): the new slices of the shape
         """
+        previous_value: float = self.__slices
         self.__slices = self.verify_float(Sphere.slices, new_slices)
+        self.publish_change('slices', previous_value)
 
     @property
     def stacks(self) -> float:
@@ -67,7 +76,9 @@ class Sphere(Shape):
         Arguments:
             new_stacks (float): the new stacks of the shape
         """
+        previous_value: float = self.__stacks
         self.__stacks = self.verify_float(Sphere.stacks, new_stacks)
+        self.publish_change('stacks', previous_value)
 
     @override
     def resize(self, increment: bool = True) -> None:
@@ -77,66 +88,51 @@ class Sphere(Shape):
         Arguments:
             increment (bool): If True, increase the size, else decrease. Defaults to True.
         """
-        factor: float = Shape.resize_increment if increment else -Shape.resize_increment
-
         if increment:
             self.radius += Shape.resize_increment
         else:
             if self.radius > Shape.resize_increment:
                 self.radius -= Shape.resize_increment
 
-        # Computing new vertex coordinates based on the radius change
-        vertices_count = len(self.vertices)
-        for index in range(vertices_count):
-            x, y, z = self.vertices[index]
-
-            # Convert Cartesian coordinates to spherical coordinates
-            radius: float = sqrt(x**2 + y**2 + z**2)
-            theta: float = acos(z / radius)
-            phi: float = atan2(y, x)
-
-            # Apply resizing factor
-            radius += factor
-
-            # Convert back to Cartesian coordinates
-            x: float = radius * sin(theta) * cos(phi)
-            y: float = radius * sin(theta) * sin(phi)
-            z: float = radius * cos(theta)
+        self.update_geometry()
+        event_bus.publish(SHAPE_RESIZED, self, value=increment)
 
-            self.vertices[index] = (x, y, z)
+    @override
+    def geometry_parameters(self, detail: float = 1.0) -> Optional[Tuple[Any, ...]]:
+        """
+        Returns the radius, slices and stacks that generate the spheres vertices
 
-        self.notify_observers('shape_resized', increment)
+        Arguments:
+            detail (float): The fraction of the slices and stacks to generate. Defaults to 1.0
+        """
+        return (self.radius, Shape.reduce_detail(self.slices, detail), Shape.reduce_detail(self.stacks, detail, minimum=2))
 
     @override
-    def initialize_vertices(self) -> VERTICES:
+    def initialize_vertices(self, detail: float = 1.0) -> VERTICES:
         """
         Computes the spheres vertices
-        """
-        vertices: VERTICES = []
 
-        for stack_index in range(int(self.stacks)):
-            latitude_zero: float = pi * (-0.5 + stack_index / self.stacks)
-            stack_height_zero: float = self.radius * sin(latitude_zero)
-            stack_radius_zero: float = self.radius * cos(latitude_zero)
+        Arguments:
+            detail (float): The fraction of the slices and stacks to generate. Defaults to 1.0
+        """
+        slices: float = Shape.reduce_detail(self.slices, detail)
+        stacks: float = Shape.reduce_detail(self.stacks, detail, minimum=2)
 
-            latitude_one: float = pi * (-0.5 + (stack_index + 1) / self.stacks)
-            stack_height_one: float = self.radius * sin(latitude_one)
-            stack_radius_one: float = self.radius * cos(latitude_one)
+        stack_indices: NDArray = arange(int(stacks))
 
-            for slice_index in range(int(self.slices + 1)):
-                longitude: float = 2 * pi * (slice_index / self.slices)
-                x: float = cos(longitude)
-                y: float = sin(longitude)
+        # (stacks, 1, 2) latitudes of the bottom and top of every stack
+        latitudes: NDArray = pi * (-0.5 + stack((stack_indices, stack_indices + 1), axis=-1) / stacks)
+        latitudes = latitudes[:, newaxis, :]
 
-                vertices.append(
-                    (x * stack_radius_zero, y * stack_radius_zero, stack_height_zero)
-                )
+        # (1, slices + 1, 1) longitudes of every slice
+        longitudes: NDArray = 2 * pi * (arange(int(slices + 1)) / slices)
+        longitudes = longitudes[newaxis, :, newaxis]
 
-                vertices.append(
-                    (x * stack_radius_one, y * stack_radius_one, stack_height_one)
-                )
+        stack_radius: NDArray = self.radius * cos(latitudes)
+        stack_height: NDArray = self.radius * sin(latitudes) + zeros_like(longitudes)
 
-        return vertices
+        vertices: NDArray = stack((cos(longitudes) * stack_radius, sin(longitudes) * stack_radius, stack_height), axis=-1)
+        return vertices.reshape(-1, 3).astype(float32)
 
     @override
     def draw(self, offscreen: bool = False) -> None:
@@ -148,16 +144,10 @@ class Sphere(Shape):
         """
         GL.glColor3f(*self.background_color if not offscreen else self.assigned_buffer_color())
 
-        if self.use_texture and not offscreen:
+        if self.use_texture and not offscreen and self.texture_ready():
             self.attach_texture()
 
-        GL.glBegin(GL.GL_TRIANGLE_STRIP)
-
-        for vertex in self.vertices:
-            GL.glNormal3f(*vertex)
-            GL.glVertex3f(*vertex)
-
-        GL.glEnd()
+        self.draw_vertex_buffer(self.primitive_mode, use_normals=True)
 
         if not offscreen and self.selected:
             self.draw_grid()
@@ -198,5 +188,4 @@ class Sphere(Shape):
         GL.glEnd()
 
         # Drawing the dots
-        for vertex in self.vertices:
-            self.draw_dot_at(*vertex)
\ No newline at end of file
+        self.draw_vertex_markers()
\ No newline at end of file
@@ -0,0 +1,308 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Dict
+from numpy import concatenate, empty, float32, floor, stack
+
+import time
+
+from geometry.three_dimensional.projection import boxes_in_frustum, model_matrix, transform_points
+from geometry.three_dimensional.bvh import BOUNDING_BOX, merge_boxes
+from geometry.three_dimensional.vertex_buffer import VertexBuffer
+from custom_types import *
+
+import OpenGL.GL as GL
+
+if TYPE_CHECKING:
+    from geometry.three_dimensional.shape import Shape
+
+CELL: TypeAlias = Tuple[int, int, int]
+
+class BatchChunk:
+    """
+    The shapes of one cell of the StaticBatch, baked into world space triangles drawn with one call per pass
+    """
+
+    def __init__(self) -> None:
+        """
+        Initializes an empty chunk
+
+        Attributes:
+            shapes (Dict[int, Shape]): The shapes of the chunk by their id.
+            detail_levels (Dict[int, int]): The detail level each shape was baked with.
+            box (Optional[BOUNDING_BOX]): The box enclosing every shape of the chunk, used for frustum culling.
+            vertices (Optional[VERTICES]): The baked triangles, 3 vertices per triangle.
+            vertex_counts (List[int]): The number of baked vertices of each shape in the order they were baked.
+            display_buffer (VertexBuffer): The triangles colored with the background colors of the shapes.
+            picking_buffer (VertexBuffer): The triangles colored with the picking colors of the shapes, uploaded when first picked.
+            outdated (bool): If a shape was added, removed or changed since the chunk was baked.
+            picking_outdated (bool): If the picking buffer no longer matches the baked triangles.
+        """
+        self.shapes: Dict[int, Shape] = {}
+        self.detail_levels: Dict[int, int] = {}
+        self.box: Optional[BOUNDING_BOX] = None
+
+        self.vertices: Optional[VERTICES] = None
+        self.vertex_counts: List[int] = []
+
+        self.display_buffer: VertexBuffer = VertexBuffer()
+        self.picking_buffer: VertexBuffer = VertexBuffer()
+
+        self.outdated: bool = True
+        self.picking_outdated: bool = True
+
+    def bake(self) -> None:
+        """
+        Moves and rotates the triangles of every shape into world space and uploads them with their colors
+        """
+        shapes: List[Shape] = list(self.shapes.values())
+        triangles: List[NDArray] = []
+
+        for shape in shapes:
+            local_vertices: NDArray = shape.triangles(shape.detail_mesh()).reshape(-1, 3)
+            triangles.append(transform_points(model_matrix(shape), local_vertices))
+
+            self.detail_levels[shape.id] = shape.detail_level
+
+        vertices: VERTICES = concatenate(triangles).astype(float32) if len(triangles) > 0 else empty((0, 3), dtype=float32)
+
+        self.vertex_counts = [len(shape_triangles) for shape_triangles in triangles]
+        self.vertices = vertices
+
+        self.box = None
+
+        for shape in shapes:
+            box: BOUNDING_BOX = shape.world_bounding_box()
+            self.box = box if self.box is None else merge_boxes(self.box, box)
+
+        self.display_buffer.upload(vertices, colors=self.__colors(len(vertices), [shape.background_color for shape in shapes]))
+
+        self.outdated = False
+        self.picking_outdated = True
+
+    def draw(self, offscreen: bool = False) -> None:
+        """
+        Draws every shape of the chunk with a single draw call
+
+        Arguments:
+            offscreen (bool): If the picking colors should be drawn instead of the background colors.
+        """
+        if not offscreen:
+            self.display_buffer.draw(GL.GL_TRIANGLES)
+            return
+
+        if self.vertices is None:
+            return
+
+        if self.picking_outdated:
+            shape_colors: List[RGB] = [shape.assigned_buffer_color() for shape in self.shapes.values()]
+            self.picking_buffer.upload(self.vertices, colors=self.__colors(len(self.vertices), shape_colors))
+            self.picking_outdated = False
+
+        self.picking_buffer.draw(GL.GL_TRIANGLES)
+
+    def __colors(self, vertex_count: int, shape_colors: List[RGB]) -> NDArray[float32]:
+        """
+        Repeats the color of each shape for all of its baked vertices
+
+        Arguments:
+            vertex_count (int): The number of baked vertices.
+            shape_colors (List[RGB]): The color of each shape in the order they were baked.
+        """
+        colors: NDArray[float32] = empty((vertex_count, 4), dtype=float32)
+        start: int = 0
+
+        for color, shape_vertex_count in zip(shape_colors, self.vertex_counts):
+            colors[start:start + shape_vertex_count] = (*color, 1.0)
+            start += shape_vertex_count
+
+        return colors
+
+    def delete(self) -> None:
+        """
+        Frees the buffers of the chunk from the GPU
+        """
+        self.display_buffer.delete()
+        self.picking_buffer.delete()
+
+class StaticBatch:
+    """
+    Draws the shapes that are not selected, textured or following the mouse as a few merged vertex buffers
+    instead of one glPushMatrix/glTranslatef/glRotatef/draw sequence per shape.
+
+    Shapes are grouped into chunks by the cell of the world their bounding box is centered in.
+    A shape that changes only re-bakes its own chunk, and chunks outside the view frustum are skipped.
+    A moving shape is held out of the batch until it stops, so a drag does not re-bake its chunk every frame.
+
+    Static fields:
+        cell_size (float): The width, depth and height of the cell of each chunk in world units.
+        settle_interval (float): The seconds a held shape must stay still before it is baked again.
+    """
+    cell_size: float = 16.0
+    settle_interval: float = 0.25
+
+    def __init__(self) -> None:
+        """
+        Initializes an empty batch
+
+        Attributes:
+            chunks (Dict[CELL, BatchChunk]): The chunks by their cell.
+            shape_cells (Dict[int, CELL]): The cell of every batched shape by the shapes id.
+            moving_shapes (Dict[int, float]): When every held shape last moved by the shapes id.
+        """
+        self.chunks: Dict[CELL, BatchChunk] = {}
+        self.shape_cells: Dict[int, CELL] = {}
+        self.moving_shapes: Dict[int, float] = {}
+
+    @staticmethod
+    def can_batch(shape: Shape) -> bool:
+        """
+        Checks if the shape is drawn as a plain colored mesh that can be baked
+
+        Arguments:
+            shape (Shape): The shape to be checked.
+        """
+        return not shape.selected and not shape.use_texture and not shape.rotate_shape
+
+    def contains(self, shape: Shape) -> bool:
+        """
+        Checks if the shape is drawn by the batch
+
+        Arguments:
+            shape (Shape): The shape to be checked.
+        """
+        return shape.id in self.shape_cells
+
+    def add(self, shape: Shape) -> None:
+        """
+        Adds the shape to the chunk of its cell
+
+        Arguments:
+            shape (Shape): The shape to be baked.
+        """
+        box: BOUNDING_BOX = shape.world_bounding_box()
+        center: NDArray = floor((box[0] + box[1]) / 2 / StaticBatch.cell_size)
+        cell: CELL = (int(center[0]), int(center[1]), int(center[2]))
+
+        chunk: Optional[BatchChunk] = self.chunks.get(cell, None)
+
+        if chunk is None:
+            chunk = BatchChunk()
+            self.chunks[cell] = chunk
+
+        chunk.shapes[shape.id] = shape
+        chunk.outdated = True
+
+        self.shape_cells[shape.id] = cell
+
+    def remove(self, shape: Shape) -> None:
+        """
+        Removes the shape from its chunk, it is baked again by the next sync if it can still be batched
+
+        Arguments:
+            shape (Shape): The shape that changed or was deleted.
+        """
+        self.moving_shapes.pop(shape.id, None)
+        cell: Optional[CELL] = self.shape_cells.pop(shape.id, None)
+
+        if cell is None:
+            return
+
+        chunk: BatchChunk = self.chunks[cell]
+        chunk.shapes.pop(shape.id, None)
+        chunk.detail_levels.pop(shape.id, None)
+        chunk.outdated = True
+
+        if len(chunk.shapes) <= 0:
+            chunk.delete()
+            del self.chunks[cell]
+
+    def hold(self, shape: Shape) -> None:
+        """
+        Takes a moving shape out of its chunk, it is baked again once it stayed still for settle_interval
+
+        Arguments:
+            shape (Shape): The shape that moved or rotated.
+        """
+        self.remove(shape)
+        self.moving_shapes[shape.id] = time.monotonic()
+
+    def is_settling(self) -> bool:
+        """
+        Checks if a held shape still waits to be baked again
+        """
+        return len(self.moving_shapes) > 0
+
+    def sync(self, shapes: List[Shape]) -> None:
+        """
+        Adds the shapes that became batchable, removes the ones that were selected or textured
+        and marks the chunks whose shapes switched their level of detail
+
+        Arguments:
+            shapes (List[Shape]): Every shape on the canvas.
+        """
+        now: float = time.monotonic()
+
+        for shape in shapes:
+            moved: Optional[float] = self.moving_shapes.get(shape.id, None)
+
+            if moved is not None:
+                if now - moved < StaticBatch.settle_interval:
+                    continue
+
+                del self.moving_shapes[shape.id]
+
+            batched: bool = shape.id in self.shape_cells
+
+            if not StaticBatch.can_batch(shape):
+                if batched:
+                    self.remove(shape)
+
+                continue
+
+            if not batched:
+                self.add(shape)
+                continue
+
+            chunk: BatchChunk = self.chunks[self.shape_cells[shape.id]]
+
+            if chunk.detail_levels.get(shape.id, None) != shape.detail_level:
+                chunk.outdated = True
+
+    def draw(self, planes: NDArray, offscreen: bool = False) -> None:
+        """
+        Bakes the outdated chunks and draws the ones inside the view frustum
+
+        Arguments:
+            planes (NDArray): The planes of the view frustum.
+            offscreen (bool): If the picking colors should be drawn instead of the background colors.
+        """
+        chunks: List[BatchChunk] = []
+        boxes: List[BOUNDING_BOX] = []
+
+        for chunk in self.chunks.values():
+            if chunk.outdated:
+                chunk.bake()
+
+            if chunk.box is not None:
+                chunks.append(chunk)
+                boxes.append(chunk.box)
+
+        if len(chunks) <= 0:
+            return
+
+        in_frustum: NDArray = boxes_in_frustum(planes, stack(boxes))
+
+        for chunk, visible in zip(chunks, in_frustum):
+            if visible:
+                chunk.draw(offscreen)
+
+    def clear(self) -> None:
+        """
+        Removes every shape and frees the buffers of every chunk
+        """
+        for chunk in self.chunks.values():
+            chunk.delete()
+
+        self.chunks.clear()
+        self.shape_cells.clear()
+        self.moving_shapes.clear()
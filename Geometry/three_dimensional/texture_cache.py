@@ -0,0 +1,271 @@
+from geometry.three_dimensional.texture_pipeline import MIP_LEVEL, prepare_texture
+from concurrent.futures import Future, ThreadPoolExecutor
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable
+from CTkToast import CTkToast
+from custom_types import *
+from constants import *
+from os import path
+
+import OpenGL.GL as GL
+
+TEXTURE_KEY: TypeAlias = Tuple[Hashable, ...]
+
+class Texture:
+    """
+    An image uploaded to the GPU once and shared by every shape using the same file.
+    The image is decoded in the background, the texture has no id until it is uploaded.
+    """
+
+    def __init__(self, key: TEXTURE_KEY) -> None:
+        """
+        Initializes a texture that is still being decoded
+
+        Arguments:
+            key (TEXTURE_KEY): The key of the texture in the cache.
+
+        Attributes:
+            texture_id (Optional[int]): The id of the OpenGL texture, None until the image is uploaded.
+            width (int): The width of the first level of the uploaded image.
+            height (int): The height of the first level of the uploaded image.
+            byte_size (int): The GPU memory used by every level of the texture.
+            failed (bool): If the image could not be decoded.
+            references (int): The number of shapes using the texture.
+        """
+        self.key: TEXTURE_KEY = key
+        self.texture_id: Optional[int] = None
+        self.width: int = 0
+        self.height: int = 0
+
+        self.byte_size: int = 0
+        self.failed: bool = False
+        self.references: int = 0
+
+    @property
+    def ready(self) -> bool:
+        """
+        ready (bool): If the texture can be bound
+        """
+        return self.texture_id is not None
+
+    def upload(self, mip_levels: List[MIP_LEVEL]) -> None:
+        """
+        Uploads the mip chain to a new OpenGL texture, must run on the thread that renders
+
+        Arguments:
+            mip_levels (List[MIP_LEVEL]): The width, height and RGB pixels of every level, largest first.
+        """
+        self.width, self.height, _ = mip_levels[0]
+
+        self.texture_id = GL.glGenTextures(1)
+        GL.glBindTexture(GL.GL_TEXTURE_2D, self.texture_id)
+        GL.glPixelStorei(GL.GL_UNPACK_ALIGNMENT, 1)
+
+        for level, (width, height, pixels) in enumerate(mip_levels):
+            GL.glTexImage2D(GL.GL_TEXTURE_2D, level, GL.GL_RGB8, width, height, 0, GL.GL_RGB, GL.GL_UNSIGNED_BYTE, pixels)
+
+        # distant shapes sample the smaller levels instead of aliasing
+        GL.glTexParameteri(GL.GL_TEXTURE_2D, GL.GL_TEXTURE_MAX_LEVEL, len(mip_levels) - 1)
+        GL.glTexParameteri(GL.GL_TEXTURE_2D, GL.GL_TEXTURE_MIN_FILTER, GL.GL_LINEAR_MIPMAP_LINEAR)
+        GL.glTexParameteri(GL.GL_TEXTURE_2D, GL.GL_TEXTURE_MAG_FILTER, GL.GL_LINEAR)
+
+        self.byte_size = sum(width * height * 3 for width, height, _ in mip_levels)
+
+    def delete(self) -> None:
+        """
+        Frees the texture from the GPU
+        """
+        if self.texture_id is not None:
+            GL.glDeleteTextures(1, [self.texture_id])
+
+        self.texture_id = None
+
+class TextureCache:
+    """
+    Process wide cache of textures keyed by the path and modification time of the image.
+
+    Textures are reference counted, once no shape uses a texture it stays in the cache until it
+    becomes the least recently used one and the textures take more GPU memory than the budget.
+
+    Images are decoded on a thread pool so several can load at once without blocking Tk,
+    the decoded images are uploaded by upload_decoded on the thread that renders.
+    Decoded images are downscaled to max_size with a mip chain and kept in the cache_directory,
+    so the next time the same image is loaded it is memory mapped instead of decoded.
+    """
+
+    def __init__(self, budget: int = 256 * 1024 * 1024, decode_workers: int = 4, max_size: int = 1024, cache_directory: Optional[str] = TEXTURE_CACHE_DIRECTORY) -> None:
+        """
+        Initializes the cache
+
+        Arguments:
+            budget (int): The GPU memory in bytes kept before unused textures are deleted. Defaults to 256 MiB
+            decode_workers (int): The number of images decoded at the same time. Defaults to 4
+            max_size (int): The largest width or height of an uploaded texture. Defaults to 1024
+            cache_directory (Optional[str]): Where prepared images are stored, None to always decode. Defaults to TEXTURE_CACHE_DIRECTORY
+
+        Attributes:
+            report_error (Callable[[str], None]): Shows why an image could not be loaded, a toast unless there is no window.
+        """
+        self.budget: int = budget
+        self.max_size: int = max_size
+        self.cache_directory: Optional[str] = cache_directory
+        self.textures: OrderedDict[TEXTURE_KEY, Texture] = OrderedDict()
+        self.byte_size: int = 0
+        self.report_error: Callable[[str], None] = CTkToast.toast
+
+        self.decoder: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=decode_workers, thread_name_prefix='texture-decode')
+        self.decoding: Dict[TEXTURE_KEY, Future] = {}
+
+    @staticmethod
+    def key(texture_path: str) -> TEXTURE_KEY:
+        """
+        Creates the cache key for an image, an image that was edited on disk gets a new key
+
+        Arguments:
+            texture_path (str): The path to the image.
+        """
+        return (path.realpath(texture_path), path.getmtime(texture_path))
+
+    def acquire(self, texture_path: str) -> Texture:
+        """
+        Returns the texture of the image, it starts decoding in the background if it is not yet cached
+
+        Arguments:
+            texture_path (str): The path to the image.
+        """
+        key: TEXTURE_KEY = TextureCache.key(texture_path)
+        texture: Optional[Texture] = self.textures.get(key, None)
+
+        if texture is None:
+            texture = Texture(key)
+            self.textures[key] = texture
+            self.decoding[key] = self.decoder.submit(prepare_texture, texture_path, self.max_size, self.cache_directory)
+        else:
+            self.textures.move_to_end(key)
+
+        texture.references += 1
+        self.__evict()
+
+        return texture
+
+    def retain(self, texture: Texture) -> Texture:
+        """
+        Adds a reference to a texture that is already in use
+
+        Arguments:
+            texture (Texture): The texture to be shared.
+        """
+        texture.references += 1
+
+        if texture.key in self.textures:
+            self.textures.move_to_end(texture.key)
+
+        return texture
+
+    def release(self, texture: Texture) -> None:
+        """
+        Removes a reference to the texture
+
+        Arguments:
+            texture (Texture): The texture that is no longer used.
+        """
+        texture.references -= 1
+
+        if texture.references <= 0:
+            self.__evict()
+
+    def is_decoding(self) -> bool:
+        """
+        Checks if any image is still waiting to be uploaded
+        """
+        return len(self.decoding) > 0
+
+    def has_decoded(self) -> bool:
+        """
+        Checks if an image finished decoding and can be uploaded
+        """
+        return any(decoding.done() for decoding in self.decoding.values())
+
+    def upload_decoded(self) -> bool:
+        """
+        Uploads the images that finished decoding, must run on the thread that renders
+
+        Returns:
+            True if a texture became ready
+        """
+        uploaded: bool = False
+
+        for key, decoding in list(self.decoding.items()):
+            if not decoding.done():
+                continue
+
+            del self.decoding[key]
+            texture: Texture = self.textures[key]
+
+            try:
+                texture.upload(decoding.result())
+            except Exception as error:
+                texture.failed = True
+                self.report_error(f'Could not load {path.basename(str(key[0]))}: {error}')
+                continue
+
+            self.byte_size += texture.byte_size
+            uploaded = True
+
+        if uploaded:
+            self.__evict()
+
+        return uploaded
+
+    def wait_for_decoding(self) -> None:
+        """
+        Blocks until every image finished decoding and uploads them, for renders that cannot show a texture later
+        """
+        for decoding in list(self.decoding.values()):
+            try:
+                decoding.result()
+            except Exception:
+                continue
+
+        self.upload_decoded()
+
+    def clear(self) -> None:
+        """
+        Deletes all unused textures
+        """
+        for key, texture in list(self.textures.items()):
+            if texture.references > 0:
+                continue
+
+            self.__delete(key)
+
+    def __delete(self, key: TEXTURE_KEY) -> None:
+        """
+        Removes the texture from the cache and frees it from the GPU
+
+        Arguments:
+            key (TEXTURE_KEY): The key of the texture.
+        """
+        texture: Texture = self.textures.pop(key)
+        decoding: Optional[Future] = self.decoding.pop(key, None)
+
+        if decoding is not None:
+            decoding.cancel()
+
+        self.byte_size -= texture.byte_size
+        texture.delete()
+
+    def __evict(self) -> None:
+        """
+        Deletes the least recently used unused textures while the textures are over the budget
+        """
+        for key, texture in list(self.textures.items()):
+            if self.byte_size <= self.budget:
+                return
+
+            if texture.references > 0:
+                continue
+
+            self.__delete(key)
+
+texture_cache: TextureCache = TextureCache()
@@ -0,0 +1,149 @@
+from numpy import array, dtype, frombuffer, memmap, uint8
+from hashlib import sha1
+from typing import Any
+from custom_types import *
+from PIL import Image
+from os import makedirs, path, replace, stat
+
+MIP_LEVEL: TypeAlias = Tuple[int, int, Any] # width, height and RGB pixels of one level of the mip chain
+
+CACHE_FILE_SIGNATURE: bytes = b'MIP1'
+CACHE_FILE_INTEGER = dtype('<u4')
+
+def prepare_texture(texture_path: str, max_size: int, cache_directory: Optional[str]) -> List[MIP_LEVEL]:
+    """
+    Returns the mip chain of the image, memory mapped from the cache directory if the image was prepared before,
+    else decoded, downscaled to max_size and saved to the cache directory. Runs on the decode threads.
+
+    Arguments:
+        texture_path (str): The path to the image.
+        max_size (int): The largest width or height of the first level.
+        cache_directory (Optional[str]): Where prepared images are stored, None to always decode.
+    """
+    cache_file: Optional[str] = None
+
+    if cache_directory is not None:
+        cache_file = cache_file_path(texture_path, max_size, cache_directory)
+        cached_levels: Optional[List[MIP_LEVEL]] = load_mip_levels(cache_file)
+
+        if cached_levels is not None:
+            return cached_levels
+
+    with Image.open(texture_path) as image:
+        mip_levels: List[MIP_LEVEL] = generate_mip_levels(image.convert("RGB"), max_size)
+
+    if cache_file is not None:
+        save_mip_levels(cache_file, mip_levels)
+
+    return mip_levels
+
+def generate_mip_levels(image: Image.Image, max_size: int) -> List[MIP_LEVEL]:
+    """
+    Downscales the image to fit max_size then halves it until it is a single pixel
+
+    Arguments:
+        image (Image.Image): The RGB image.
+        max_size (int): The largest width or height of the first level.
+    """
+    if max(image.size) > max_size:
+        image = image.copy()
+        image.thumbnail((max_size, max_size), Image.Resampling.LANCZOS)
+
+    mip_levels: List[MIP_LEVEL] = []
+
+    while True:
+        width, height = image.size
+        mip_levels.append((width, height, image.tobytes("raw", "RGB", 0)))
+
+        if width == 1 and height == 1:
+            return mip_levels
+
+        image = image.resize((max(width // 2, 1), max(height // 2, 1)), Image.Resampling.BOX)
+
+def cache_file_path(texture_path: str, max_size: int, cache_directory: str) -> str:
+    """
+    Returns where the mip chain of the image is stored, an edited image or a new max_size gets a new file
+
+    Arguments:
+        texture_path (str): The path to the image.
+        max_size (int): The largest width or height of the first level.
+        cache_directory (str): Where prepared images are stored.
+    """
+    image_stat = stat(texture_path)
+    identity: str = f'{path.realpath(texture_path)}|{image_stat.st_mtime_ns}|{image_stat.st_size}|{max_size}'
+
+    return path.join(cache_directory, sha1(identity.encode()).hexdigest() + '.mip')
+
+def save_mip_levels(cache_file: str, mip_levels: List[MIP_LEVEL]) -> None:
+    """
+    Writes the mip chain as a small header of level sizes followed by the raw pixels of every level.
+    Failing to write only means the image is decoded again next time.
+
+    Arguments:
+        cache_file (str): The path of the file.
+        mip_levels (List[MIP_LEVEL]): The levels to be stored.
+    """
+    header: List[int] = [len(mip_levels)]
+
+    for width, height, _ in mip_levels:
+        header.extend((width, height))
+
+    temporary_file: str = f'{cache_file}.tmp'
+
+    try:
+        makedirs(path.dirname(cache_file), exist_ok=True)
+
+        with open(temporary_file, 'wb') as file:
+            file.write(CACHE_FILE_SIGNATURE)
+            file.write(array(header, dtype=CACHE_FILE_INTEGER).tobytes())
+
+            for _, _, pixels in mip_levels:
+                file.write(pixels)
+
+        # readers never see a half written file
+        replace(temporary_file, cache_file)
+    except OSError:
+        return
+
+def load_mip_levels(cache_file: str) -> Optional[List[MIP_LEVEL]]:
+    """
+    Memory maps the mip chain written by save_mip_levels, the pixels are only read from disk when uploaded
+
+    Arguments:
+        cache_file (str): The path of the file.
+
+    Returns:
+        The levels or None if the file does not exist or is not a complete mip chain
+    """
+    if not path.isfile(cache_file):
+        return None
+
+    try:
+        data = memmap(cache_file, dtype=uint8, mode='r')
+    except (OSError, ValueError):
+        return None
+
+    signature_size: int = len(CACHE_FILE_SIGNATURE)
+
+    if len(data) < signature_size + 4 or bytes(data[:signature_size]) != CACHE_FILE_SIGNATURE:
+        return None
+
+    level_count: int = int(frombuffer(data, dtype=CACHE_FILE_INTEGER, count=1, offset=signature_size)[0])
+    offset: int = signature_size + 4 + level_count * 8
+
+    if offset > len(data):
+        return None
+
+    sizes = frombuffer(data, dtype=CACHE_FILE_INTEGER, count=level_count * 2, offset=signature_size + 4).reshape(-1, 2)
+    mip_levels: List[MIP_LEVEL] = []
+
+    for width, height in sizes:
+        byte_count: int = int(width) * int(height) * 3
+
+        if offset + byte_count > len(data):
+            return None
+
+        mip_levels.append((int(width), int(height), data[offset:offset + byte_count]))
+        offset += byte_count
+
+    return mip_levels
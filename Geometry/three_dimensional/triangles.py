@@ -0,0 +1,49 @@
+from numpy import arange, array, stack, uint32
+from typing import Sequence, Union
+from custom_types import *
+
+import OpenGL.GL as GL
+
+def triangle_indices(mode: int, indices: Union[Sequence[int], NDArray]) -> NDArray[uint32]:
+    """
+    Splits the primitives the shapes draw into separate triangles
+
+    Arguments:
+        mode (int): The OpenGL primitive type the indices are drawn with, ex: GL_TRIANGLE_STRIP.
+        indices (Union[Sequence[int], NDArray]): The order in which the vertices are drawn, a list or an array of indices.
+
+    Returns:
+        A (M, 3) array of indices, one row per triangle
+
+    Raises:
+        ValueError: If the primitive type is not made of triangles or quads.
+    """
+    order: NDArray[uint32] = array(indices, dtype=uint32)
+
+    if mode == GL.GL_TRIANGLES:
+        return order[:len(order) // 3 * 3].reshape(-1, 3)
+
+    if mode == GL.GL_TRIANGLE_STRIP:
+        first_vertices: NDArray = arange(len(order) - 2)
+        return stack((order[first_vertices], order[first_vertices + 1], order[first_vertices + 2]), axis=1)
+
+    if mode == GL.GL_TRIANGLE_FAN:
+        second_vertices: NDArray = arange(1, len(order) - 1)
+        return stack((order[second_vertices * 0], order[second_vertices], order[second_vertices + 1]), axis=1)
+
+    if mode == GL.GL_QUADS:
+        quads: NDArray[uint32] = order[:len(order) // 4 * 4].reshape(-1, 4)
+        return stack((quads[:, (0, 1, 2)], quads[:, (0, 2, 3)]), axis=1).reshape(-1, 3)
+
+    if mode == GL.GL_QUAD_STRIP:
+        # every pair of vertices closes a quad with the previous pair
+        first_vertices = arange(0, len(order) - 3, 2)
+        bottom_left, top_left = order[first_vertices], order[first_vertices + 1]
+        bottom_right, top_right = order[first_vertices + 2], order[first_vertices + 3]
+
+        return stack((
+            stack((bottom_left, top_left, top_right), axis=1),
+            stack((bottom_left, top_right, bottom_right), axis=1)
+        ), axis=1).reshape(-1, 3)
+
+    raise ValueError(f"Primitive type {mode} has no triangles")
@@ -0,0 +1,435 @@
+from geometry.three_dimensional.geometry_cache import Mesh, geometry_cache
+from geometry.three_dimensional.shape import Shape
+from typing import Any, Callable, Deque, Dict
+from collections import deque
+from event_bus import SHAPE_CHANGED, SHAPE_DELETED, SHAPE_RESIZED, SHAPE_TRANSFORMED, ShapeEvent, event_bus
+from custom_types import *
+
+import time
+
+SET_FIELD: str = 'set'
+REPLACE_MESH: str = 'mesh'
+ADD_SHAPE: str = 'add'
+DELETE_SHAPE: str = 'delete'
+
+ROTATION_FIELDS: Tuple[str, ...] = ('x_rotation', 'y_rotation')
+
+class HistoryOperation:
+    """
+    A single change of a shape that can be reverted and applied again
+    """
+
+    def __init__(self, kind: str, shape: Shape, field: Optional[str] = None, old_value: Any = None, new_value: Any = None) -> None:
+        """
+        Initializes the operation
+
+        Arguments:
+            kind (str): SET_FIELD, REPLACE_MESH, ADD_SHAPE or DELETE_SHAPE.
+            shape (Shape): The changed shape.
+            field (Optional[str]): The name of the changed field of a SET_FIELD. Defaults to None
+            old_value (Any): The value or Mesh before the change. Defaults to None
+            new_value (Any): The value or Mesh after the change. Defaults to None
+        """
+        self.kind: str = kind
+        self.shape: Shape = shape
+        self.field: Optional[str] = field
+        self.old_value: Any = old_value
+        self.new_value: Any = new_value
+
+    def byte_size(self) -> int:
+        """
+        The memory the operation keeps alive, the vertices of meshes that are not in the geometry cache
+        are counted since nothing but the history may be holding them
+        """
+        size: int = 128
+
+        for value in (self.old_value, self.new_value):
+            if isinstance(value, Mesh) and value.key is None:
+                size += value.vertices.nbytes
+
+        if self.kind in (ADD_SHAPE, DELETE_SHAPE) and self.shape.mesh.key is None:
+            size += self.shape.vertices.nbytes
+
+        return size
+
+    def release(self) -> None:
+        """
+        Gives back the meshes held by the operation
+        """
+        for value in (self.old_value, self.new_value):
+            if isinstance(value, Mesh):
+                geometry_cache.release(value)
+
+class HistoryEntry:
+    """
+    The operations undone and redone together by one Ctrl+Z or Ctrl+Y
+    """
+
+    def __init__(self, label: str, shape: Optional[Shape]) -> None:
+        """
+        Initializes an empty entry
+
+        Arguments:
+            label (str): What made the changes, entries with the same label and shape can be merged.
+            shape (Optional[Shape]): The shape the changes were made to, None for changes to several shapes.
+
+        Attributes:
+            operations (List[HistoryOperation]): The changes in the order they were made.
+            fields (Dict[Tuple[int, str], HistoryOperation]): The operation of every changed field or mesh, so a field changed again keeps its first old value.
+            byte_size (int): The memory kept alive by the operations.
+            changed_at (float): When the last change was added.
+        """
+        self.label: str = label
+        self.shape: Optional[Shape] = shape
+        self.operations: List[HistoryOperation] = []
+        self.fields: Dict[Tuple[int, str], HistoryOperation] = {}
+        self.byte_size: int = 0
+        self.changed_at: float = time.monotonic()
+
+    def add(self, operation: HistoryOperation) -> None:
+        """
+        Adds an operation, a field that already changed in this entry only gets its new value updated
+
+        Arguments:
+            operation (HistoryOperation): The change.
+        """
+        self.changed_at = time.monotonic()
+
+        if operation.kind in (SET_FIELD, REPLACE_MESH):
+            field: Optional[str] = operation.field if operation.kind == SET_FIELD else REPLACE_MESH
+            assert field is not None, 'a field operation always names its field'
+
+            key: Tuple[int, str] = (operation.shape.id, field)
+            previous_operation: Optional[HistoryOperation] = self.fields.get(key, None)
+
+            if previous_operation is not None:
+                self.byte_size -= previous_operation.byte_size()
+
+                # the mesh in between is no longer needed
+                if operation.kind == REPLACE_MESH:
+                    geometry_cache.release(previous_operation.new_value)
+                    geometry_cache.release(operation.old_value)
+
+                previous_operation.new_value = operation.new_value
+                self.byte_size += previous_operation.byte_size()
+                return
+
+            self.fields[key] = operation
+
+        self.operations.append(operation)
+        self.byte_size += operation.byte_size()
+
+    def release(self) -> None:
+        """
+        Gives back the meshes held by every operation
+        """
+        for operation in self.operations:
+            operation.release()
+
+class UndoHistory:
+    """
+    Undo and redo stacks of the changes to the shapes. Edits are stored as the inverse operations read from the
+    shapes events instead of copies of the scene. Meshes are never changed in place, so a resize only keeps
+    a reference to the previous mesh and undoing it shares that mesh again.
+
+    Changes made by the same command to the same shape within coalesce_interval of each other become one entry,
+    so holding an arrow key is undone at once. Once the entries keep more than memory_ceiling bytes alive
+    the oldest ones are forgotten.
+    Setters publish the value they replaced, so the old values are read from the events.
+
+    Static fields:
+        coalesced_labels (Tuple[str, ...]): The labels of the entries repeated changes are merged into.
+        coalesce_interval (float): The most seconds between two changes that are merged.
+    """
+    coalesced_labels: Tuple[str, ...] = ('move', 'resize', 'rotate')
+    coalesce_interval: float = 1.0
+
+    def __init__(self, add_shape: Callable[[Shape], None], memory_ceiling: int = 64 * 1024 * 1024) -> None:
+        """
+        Initializes empty stacks
+
+        Arguments:
+            add_shape (Callable[[Shape], None]): Puts a shape back on the canvas, like Canvas.add_shape.
+            memory_ceiling (int): The bytes the entries may keep alive before the oldest are forgotten. Defaults to 64 MiB
+
+        Attributes:
+            undo_entries (Deque[HistoryEntry]): The entries that can be undone, newest last.
+            redo_entries (List[HistoryEntry]): The entries that were undone, newest last.
+            byte_size (int): The memory kept alive by every entry.
+            group (Optional[Tuple[str, Optional[Shape]]]): The label and shape of the command being run, None outside commands.
+            group_entry (Optional[HistoryEntry]): The entry of the command being run, created by its first change.
+            applying (bool): If an undo or redo is changing the shapes, their events are not recorded.
+            meshes (Dict[int, Mesh]): The mesh of every tracked shape by its id, the old mesh of a resize.
+        """
+        self.add_shape: Callable[[Shape], None] = add_shape
+        self.memory_ceiling: int = memory_ceiling
+
+        self.undo_entries: Deque[HistoryEntry] = deque()
+        self.redo_entries: List[HistoryEntry] = []
+        self.byte_size: int = 0
+
+        self.group: Optional[Tuple[str, Optional[Shape]]] = None
+        self.group_entry: Optional[HistoryEntry] = None
+        self.applying: bool = False
+
+        self.meshes: Dict[int, Mesh] = {}
+
+        event_bus.subscribe(SHAPE_TRANSFORMED, self.__field_set)
+        event_bus.subscribe(SHAPE_CHANGED, self.__field_set)
+        event_bus.subscribe(SHAPE_RESIZED, self.__resized)
+        event_bus.subscribe(SHAPE_DELETED, self.__deleted)
+
+    def track(self, shape: Shape) -> None:
+        """
+        Starts recording the changes of a shape added to the canvas, adding it can be undone
+
+        Arguments:
+            shape (Shape): The added shape.
+        """
+        self.__remember(shape)
+
+        if not self.applying:
+            self.__record(HistoryOperation(ADD_SHAPE, shape), 'add', shape)
+
+    def begin(self, label: str, shape: Optional[Shape] = None) -> None:
+        """
+        Starts a command, every change until end() is undone as one entry
+
+        Arguments:
+            label (str): The name of the command, like 'move' or 'resize'.
+            shape (Optional[Shape]): The shape the command changes, None for several shapes. Defaults to None
+        """
+        self.group = (label, shape)
+        self.group_entry = None
+
+    def end(self) -> None:
+        """
+        Ends the command started by begin()
+        """
+        self.group = None
+        self.group_entry = None
+
+    def can_undo(self) -> bool:
+        """
+        Checks if there is an entry to undo
+        """
+        return len(self.undo_entries) > 0
+
+    def can_redo(self) -> bool:
+        """
+        Checks if there is an entry to redo
+        """
+        return len(self.redo_entries) > 0
+
+    def undo(self) -> Optional[str]:
+        """
+        Reverts the newest entry
+
+        Returns:
+            The label of the reverted entry or None if there was nothing to undo
+        """
+        if not self.can_undo():
+            return None
+
+        entry: HistoryEntry = self.undo_entries.pop()
+
+        # the meshes are put back after the fields they were generated from
+        operations: List[HistoryOperation] = sorted(reversed(entry.operations), key=lambda operation: operation.kind == REPLACE_MESH)
+        self.__apply(operations, undo=True)
+
+        self.redo_entries.append(entry)
+        return entry.label
+
+    def redo(self) -> Optional[str]:
+        """
+        Applies the newest undone entry again
+
+        Returns:
+            The label of the applied entry or None if there was nothing to redo
+        """
+        if not self.can_redo():
+            return None
+
+        entry: HistoryEntry = self.redo_entries.pop()
+        self.__apply(entry.operations, undo=False)
+
+        self.undo_entries.append(entry)
+        return entry.label
+
+    def clear(self) -> None:
+        """
+        Forgets every entry
+        """
+        for entry in (*self.undo_entries, *self.redo_entries):
+            entry.release()
+
+        self.undo_entries.clear()
+        self.redo_entries.clear()
+        self.byte_size = 0
+
+    def __field_set(self, event: ShapeEvent) -> None:
+        """
+        Turns a property set on a tracked shape into an operation
+
+        Arguments:
+            event (ShapeEvent): The SHAPE_TRANSFORMED or SHAPE_CHANGED event.
+        """
+        shape: Shape = event.shape
+        field: Optional[str] = event.field
+        new_value: Any = event.value
+        old_value: Any = event.old_value
+
+        if shape.id not in self.meshes or field is None:
+            return
+
+        # the first texture can not be taken off again
+        if self.applying or old_value == new_value or (field == 'texture_path' and not old_value):
+            return
+
+        label: str = 'rotate' if field in ROTATION_FIELDS else f'set_{field}'
+        self.__record(HistoryOperation(SET_FIELD, shape, field, old_value, new_value), label, shape)
+
+    def __resized(self, event: ShapeEvent) -> None:
+        """
+        Turns the new mesh of a tracked shape into an operation
+
+        Arguments:
+            event (ShapeEvent): The SHAPE_RESIZED event.
+        """
+        shape: Shape = event.shape
+
+        if shape.id not in self.meshes:
+            return
+
+        old_mesh: Mesh = self.meshes[shape.id]
+        self.meshes[shape.id] = geometry_cache.retain(shape.mesh)
+
+        if self.applying or old_mesh is shape.mesh:
+            geometry_cache.release(old_mesh)
+            return
+
+        self.__record(HistoryOperation(REPLACE_MESH, shape, None, old_mesh, geometry_cache.retain(shape.mesh)), 'resize', shape)
+
+    def __deleted(self, event: ShapeEvent) -> None:
+        """
+        Turns the removal of a tracked shape into an operation
+
+        Arguments:
+            event (ShapeEvent): The SHAPE_DELETED event.
+        """
+        shape: Shape = event.shape
+
+        if shape.id not in self.meshes:
+            return
+
+        geometry_cache.release(self.meshes.pop(shape.id))
+
+        if not self.applying:
+            self.__record(HistoryOperation(DELETE_SHAPE, shape), 'delete', shape)
+
+    def __remember(self, shape: Shape) -> None:
+        """
+        Keeps the mesh of the shape, it can not be read from the shape once a resize replaced it
+
+        Arguments:
+            shape (Shape): The tracked shape.
+        """
+        if shape.id not in self.meshes:
+            self.meshes[shape.id] = geometry_cache.retain(shape.mesh)
+
+    def __record(self, operation: HistoryOperation, label: str, shape: Shape) -> None:
+        """
+        Adds the operation to the entry of the running command, to the newest entry if it can be merged into it
+        or to a new entry. Recording a change forgets the undone entries.
+
+        Arguments:
+            operation (HistoryOperation): The change.
+            label (str): What made the change when it is not made by a command.
+            shape (Shape): The changed shape.
+        """
+        entry: Optional[HistoryEntry] = self.group_entry
+
+        if entry is None:
+            group_label, group_shape = self.group if self.group is not None else (label, shape)
+            entry = self.__mergeable_entry(group_label, group_shape)
+
+            if entry is None:
+                entry = HistoryEntry(group_label, group_shape)
+                self.undo_entries.append(entry)
+
+            if self.group is not None:
+                self.group_entry = entry
+
+        for undone_entry in self.redo_entries:
+            self.byte_size -= undone_entry.byte_size
+            undone_entry.release()
+
+        self.redo_entries.clear()
+
+        self.byte_size -= entry.byte_size
+        entry.add(operation)
+        self.byte_size += entry.byte_size
+
+        self.__evict()
+
+    def __mergeable_entry(self, label: str, shape: Optional[Shape]) -> Optional[HistoryEntry]:
+        """
+        Returns the newest entry if a change with the label and shape continues it
+
+        Arguments:
+            label (str): What made the change.
+            shape (Optional[Shape]): The changed shape.
+        """
+        if len(self.undo_entries) <= 0 or len(self.redo_entries) > 0:
+            return None
+
+        entry: HistoryEntry = self.undo_entries[-1]
+
+        if label not in UndoHistory.coalesced_labels or entry.label != label or entry.shape is not shape:
+            return None
+
+        if time.monotonic() - entry.changed_at > UndoHistory.coalesce_interval:
+            return None
+
+        return entry
+
+    def __evict(self) -> None:
+        """
+        Forgets the oldest entries while the entries keep more than memory_ceiling bytes alive, the newest entry is always kept
+        """
+        while self.byte_size > self.memory_ceiling and len(self.undo_entries) > 1:
+            entry: HistoryEntry = self.undo_entries.popleft()
+            self.byte_size -= entry.byte_size
+            entry.release()
+
+    def __apply(self, operations: List[HistoryOperation], undo: bool) -> None:
+        """
+        Changes the shapes to the values before or after the operations without recording them
+
+        Arguments:
+            operations (List[HistoryOperation]): The operations in the order they are applied.
+            undo (bool): If the old values are applied instead of the new ones.
+        """
+        self.applying = True
+
+        try:
+            for operation in operations:
+                shape: Shape = operation.shape
+                value: Any = operation.old_value if undo else operation.new_value
+
+                if operation.kind == SET_FIELD:
+                    assert operation.field is not None, 'a field operation always names its field'
+                    setattr(shape, operation.field, value)
+
+                elif operation.kind == REPLACE_MESH:
+                    shape.share_mesh(value)
+                    event_bus.publish(SHAPE_RESIZED, shape)
+
+                elif (operation.kind == ADD_SHAPE) == undo:
+                    shape.delete()
+
+                else:
+                    shape.restore()
+                    self.add_shape(shape)
+        finally:
+            self.applying = False
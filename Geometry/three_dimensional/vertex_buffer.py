@@ -0,0 +1,172 @@
+from custom_types import *
+from numpy import array, ascontiguousarray, uint32
+
+import OpenGL.GL as GL
+
+class VertexBuffer:
+    """
+    Retained copy of a shapes vertices stored on the GPU.
+
+    The vertices are uploaded once into a vertex buffer object (and an optional element buffer)
+    and drawn with a single glDrawArrays/glDrawElements call instead of one glVertex call per vertex.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initializes an empty vertex buffer.
+
+        Attributes:
+            buffer_id (Optional[int]): The id of the vertex buffer object.
+            index_buffer_id (Optional[int]): The id of the element buffer object.
+            color_buffer_id (Optional[int]): The id of the buffer holding a RGBA color per vertex.
+            vertex_count (int): The number of uploaded vertices.
+            index_count (int): The number of uploaded indices, 0 if the vertices are drawn in order.
+            source (Optional[VERTICES]): The vertices that were last uploaded.
+        """
+        self.buffer_id: Optional[int] = None
+        self.index_buffer_id: Optional[int] = None
+        self.color_buffer_id: Optional[int] = None
+        self.has_colors: bool = False
+
+        self.vertex_count: int = 0
+        self.index_count: int = 0
+
+        self.source: Optional[VERTICES] = None
+
+    def is_outdated(self, vertices: VERTICES) -> bool:
+        """
+        Checks if the vertices differ from the last uploaded vertices.
+        Shapes replace their vertices whenever the geometry changes, so an identity check is enough.
+
+        Arguments:
+            vertices (VERTICES): The shapes current vertices.
+        """
+        return self.source is not vertices
+
+    def upload(self, vertices: VERTICES, indices: Optional[List[int]] = None, colors: Optional[NDArray[float32]] = None) -> None:
+        """
+        Uploads the vertices (and indices and colors) to the GPU
+
+        Arguments:
+            vertices (VERTICES): The vertices to be uploaded.
+            indices (Optional[List[int]]): The order in which the vertices are drawn. Defaults to None.
+            colors (Optional[NDArray[float32]]): A (N, 4) array of RGBA colors, one per vertex. Defaults to None.
+        """
+        # float32 arrays are already contiguous so they are handed to OpenGL without a copy
+        vertex_data: VERTICES = ascontiguousarray(vertices, dtype=float32)
+
+        if self.buffer_id is None:
+            self.buffer_id = GL.glGenBuffers(1)
+
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, self.buffer_id)
+        GL.glBufferData(GL.GL_ARRAY_BUFFER, vertex_data.nbytes, vertex_data, GL.GL_STATIC_DRAW)
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, 0)
+
+        self.vertex_count = len(vertex_data)
+        self.index_count = 0
+
+        if indices is not None:
+            index_data = array(indices, dtype=uint32)
+
+            if self.index_buffer_id is None:
+                self.index_buffer_id = GL.glGenBuffers(1)
+
+            GL.glBindBuffer(GL.GL_ELEMENT_ARRAY_BUFFER, self.index_buffer_id)
+            GL.glBufferData(GL.GL_ELEMENT_ARRAY_BUFFER, index_data.nbytes, index_data, GL.GL_STATIC_DRAW)
+            GL.glBindBuffer(GL.GL_ELEMENT_ARRAY_BUFFER, 0)
+
+            self.index_count = len(index_data)
+
+        self.has_colors = colors is not None
+
+        if colors is not None:
+            color_data: NDArray[float32] = ascontiguousarray(colors, dtype=float32)
+
+            if self.color_buffer_id is None:
+                self.color_buffer_id = GL.glGenBuffers(1)
+
+            GL.glBindBuffer(GL.GL_ARRAY_BUFFER, self.color_buffer_id)
+            GL.glBufferData(GL.GL_ARRAY_BUFFER, color_data.nbytes, color_data, GL.GL_STATIC_DRAW)
+            GL.glBindBuffer(GL.GL_ARRAY_BUFFER, 0)
+
+        self.source = vertices
+
+    def draw(self, mode: int, use_normals: bool = False) -> None:
+        """
+        Draws the uploaded vertices with a single draw call
+
+        Arguments:
+            mode (int): The OpenGL primitive type, ex: GL_TRIANGLES.
+            use_normals (bool): Use the vertices as normals as well. Defaults to False.
+        """
+        if self.buffer_id is None or self.vertex_count <= 0:
+            return
+
+        self.__bind_vertices()
+
+        if use_normals:
+            GL.glEnableClientState(GL.GL_NORMAL_ARRAY)
+            GL.glNormalPointer(GL.GL_FLOAT, 0, None)
+
+        if self.index_count > 0:
+            GL.glBindBuffer(GL.GL_ELEMENT_ARRAY_BUFFER, self.index_buffer_id)
+            GL.glDrawElements(mode, self.index_count, GL.GL_UNSIGNED_INT, None)
+            GL.glBindBuffer(GL.GL_ELEMENT_ARRAY_BUFFER, 0)
+        else:
+            GL.glDrawArrays(mode, 0, self.vertex_count)
+
+        if use_normals:
+            GL.glDisableClientState(GL.GL_NORMAL_ARRAY)
+
+        self.__unbind_vertices()
+
+    def draw_points(self) -> None:
+        """
+        Draws every uploaded vertex as a point with a single draw call, ignoring the indices
+        """
+        if self.buffer_id is None or self.vertex_count <= 0:
+            return
+
+        self.__bind_vertices()
+        GL.glDrawArrays(GL.GL_POINTS, 0, self.vertex_count)
+        self.__unbind_vertices()
+
+    def __bind_vertices(self) -> None:
+        """
+        Binds the vertex buffer as the source of the vertex positions (and colors)
+        """
+        if self.has_colors:
+            GL.glBindBuffer(GL.GL_ARRAY_BUFFER, self.color_buffer_id)
+            GL.glEnableClientState(GL.GL_COLOR_ARRAY)
+            GL.glColorPointer(4, GL.GL_FLOAT, 0, None)
+
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, self.buffer_id)
+        GL.glEnableClientState(GL.GL_VERTEX_ARRAY)
+        GL.glVertexPointer(3, GL.GL_FLOAT, 0, None)
+
+    def __unbind_vertices(self) -> None:
+        """
+        Unbinds the vertex buffer
+        """
+        if self.has_colors:
+            GL.glDisableClientState(GL.GL_COLOR_ARRAY)
+
+        GL.glDisableClientState(GL.GL_VERTEX_ARRAY)
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, 0)
+
+    def delete(self) -> None:
+        """
+        Frees the buffers from the GPU
+        """
+        buffer_ids: List[int] = [buffer_id for buffer_id in (self.buffer_id, self.index_buffer_id, self.color_buffer_id) if buffer_id is not None]
+
+        if len(buffer_ids) > 0:
+            GL.glDeleteBuffers(len(buffer_ids), buffer_ids)
+
+        self.buffer_id = None
+        self.index_buffer_id = None
+        self.color_buffer_id = None
+        self.has_colors = False
+        self.vertex_count = 0
+        self.index_count = 0
+        self.source = None
@@ -11,6 +11,7 @@ from geometry.three_dimensional.shape_list import shape_class_references, shape_
 from customtkinter import CTkFrame, CTkOptionMenu, CTkButton
 from geometry.three_dimensional.shape import Shape
 from observers import Observable
+from save import open_scene_dialog, save_scene_dialog
 from CTkToast import CTkToast
 from constants import *
 
@@ -45,9 +46,29 @@ class Navigation(CTkFrame, Observable):
                 return
 
             shape_instance: Shape = shape_reference()
-            shape_instance.subscribe(parent.canvas)
+            self.parent.canvas.add_shape(shape_instance)
 
-            self.parent.canvas.shapes.append(shape_instance)
+        def import_scene() -> None:
+            """
+            Adds the shapes of a scene file the user picked to the canvas
+            """
+            file_path: Optional[str] = open_scene_dialog()
+
+            if file_path is None:
+                return
+
+            self.parent.canvas.import_scene(file_path)
+
+        def export_scene() -> None:
+            """
+            Saves the shapes of the canvas where the user picked
+            """
+            file_path: Optional[str] = save_scene_dialog()
+
+            if file_path is None:
+                return
+
+            self.parent.canvas.export_scene(file_path)
 
         def open_properties() -> None:
             """
@@ -61,8 +82,8 @@ class Navigation(CTkFrame, Observable):
 
         buttons: List[Any] = [
             CTkOptionMenu(self, width=80, height=20, values=shape_names(), command=add_shape),
-            # CTkButton(self, width=75, height=15, text="Import", command=Shape.import_from_file),
-            # CTkButton(self, width=75, height=15, text="Export", command=Shape.export_to_file),
+            CTkButton(self, width=75, height=15, text="Import", command=import_scene),
+            CTkButton(self, width=75, height=15, text="Export", command=export_scene),
             CTkButton(self, width=120, height=15, text="Toggle Properties", command=open_properties)
         ]
 
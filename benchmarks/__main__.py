@@ -0,0 +1,118 @@
+"""
+Runs the benchmarks and writes their results as JSON.
+
+    python -m benchmarks --output results.json
+    python -m benchmarks scene frame --counts 1 100 10000 --baseline results.json --count-calls
+
+Exits with 1 when a result is slower than the baseline by more than the threshold.
+"""
+
+from argparse import ArgumentParser, Namespace
+from typing import Any, Dict, Sequence
+from benchmarks.timing import RESULT
+from datetime import datetime, timezone
+from custom_types import *
+
+import platform
+import sys
+import os
+
+SUITES: Tuple[str, ...] = ('shapes', 'scene', 'frame')
+
+def parse_arguments(arguments: Optional[Sequence[str]] = None) -> Namespace:
+    """
+    Parses the command line
+
+    Arguments:
+        arguments (Optional[Sequence[str]]): The arguments, None to read sys.argv.
+    """
+    parser = ArgumentParser(prog='python -m benchmarks', description='Measures shape generation, scene scaling and frame times.')
+
+    parser.add_argument('suites', nargs='*', metavar='suite', help=f'the benchmarks to run: {", ".join(SUITES)}, all of them by default')
+    parser.add_argument('--counts', type=int, nargs='+', default=[1, 10, 100, 1000, 10000, 100000], help='the numbers of shapes of the scene and frame benchmarks')
+    parser.add_argument('--repeat', type=int, default=5, help='the timed runs of each benchmark, the median is kept')
+    parser.add_argument('--count-calls', action='store_true', help='count the OpenGL calls of one frame of every scene')
+    parser.add_argument('--platform', choices=('egl', 'osmesa'), default='egl', help='the headless OpenGL platform of the frame benchmarks')
+    parser.add_argument('--output', help='where the results are saved as JSON')
+    parser.add_argument('--baseline', help='the JSON results of an earlier run to compare against')
+    parser.add_argument('--threshold', type=float, default=0.1, help='how much slower, as a fraction, a result may be than the baseline')
+
+    parsed_arguments: Namespace = parser.parse_args(arguments)
+
+    for suite in parsed_arguments.suites:
+        if suite not in SUITES:
+            parser.error(f'unknown suite {suite}, choose from {", ".join(SUITES)}')
+
+    parsed_arguments.suites = parsed_arguments.suites or list(SUITES)
+
+    return parsed_arguments
+
+def main(arguments: Optional[Sequence[str]] = None) -> int:
+    """
+    Runs the chosen benchmarks, saves them and compares them to the baseline
+
+    Arguments:
+        arguments (Optional[Sequence[str]]): The arguments, None to read sys.argv.
+
+    Returns:
+        The exit code, 1 if a benchmark regressed
+    """
+    parsed_arguments: Namespace = parse_arguments(arguments)
+
+    # PyOpenGL picks the platform when it is first imported, the shapes import it
+    os.environ['PYOPENGL_PLATFORM'] = parsed_arguments.platform
+
+    if parsed_arguments.platform == 'egl' and not os.environ.get('DISPLAY'):
+        os.environ.setdefault('EGL_PLATFORM', 'surfaceless')
+
+    from benchmarks.compare import compare_results, format_value, load_results, save_results
+    from benchmarks.frames import benchmark_frames
+    from benchmarks.scene import benchmark_scenes
+    from benchmarks.shapes import benchmark_shapes
+
+    import numpy
+
+    environment: Dict[str, Any] = {
+        'date': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'machine': platform.machine(),
+        'system': platform.platform(),
+        'python': platform.python_version(),
+        'numpy': numpy.__version__
+    }
+
+    results: Dict[str, RESULT] = {}
+    counts: List[int] = sorted(set(parsed_arguments.counts))
+
+    if 'shapes' in parsed_arguments.suites:
+        results.update(benchmark_shapes(parsed_arguments.repeat))
+
+    if 'scene' in parsed_arguments.suites:
+        results.update(benchmark_scenes(counts, parsed_arguments.repeat))
+
+    if 'frame' in parsed_arguments.suites:
+        frame_results, renderer = benchmark_frames(counts, parsed_arguments.repeat, parsed_arguments.platform, parsed_arguments.count_calls)
+
+        results.update(frame_results)
+        environment['renderer'] = renderer
+
+    if parsed_arguments.output:
+        save_results(parsed_arguments.output, environment, results)
+
+    if not parsed_arguments.baseline:
+        for name, result in results.items():
+            measurement: str = 'seconds' if 'seconds' in result else 'calls'
+            print(f'{name:<48} {format_value(result[measurement], measurement):>12}')
+
+        return 0
+
+    lines, regressions = compare_results(results, load_results(parsed_arguments.baseline), parsed_arguments.threshold)
+
+    for line in lines:
+        print(line)
+
+    print(f'{len(regressions)} of {len(lines)} benchmarks regressed by more than {parsed_arguments.threshold:.0%}')
+
+    return 1 if regressions else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
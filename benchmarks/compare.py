@@ -0,0 +1,76 @@
+from typing import Any, Dict
+from benchmarks.timing import RESULT
+from custom_types import *
+
+import json
+
+def save_results(file_path: str, environment: Dict[str, Any], results: Dict[str, RESULT]) -> None:
+    """
+    Writes the results as JSON so a later run can be compared against them
+
+    Arguments:
+        file_path (str): Where the results are saved.
+        environment (Dict[str, Any]): The machine and versions the results were measured on.
+        results (Dict[str, RESULT]): The results by name.
+    """
+    with open(file_path, 'w') as file:
+        json.dump({ 'environment': environment, 'results': results }, file, indent=2, sort_keys=True)
+
+def load_results(file_path: str) -> Dict[str, RESULT]:
+    """
+    Returns the results of a file written by save_results
+
+    Arguments:
+        file_path (str): The path of the results.
+    """
+    with open(file_path) as file:
+        return json.load(file)['results']
+
+def compare_results(results: Dict[str, RESULT], baseline: Dict[str, RESULT], threshold: float) -> Tuple[List[str], List[str]]:
+    """
+    Compares the results to the baseline, timings are compared by their median and call counts by their total
+
+    Arguments:
+        results (Dict[str, RESULT]): The new results by name.
+        baseline (Dict[str, RESULT]): The stored results by name.
+        threshold (float): How much slower or how many more calls, as a fraction, a result may be before it regressed.
+
+    Returns:
+        A line for every benchmark in both, and the names of the benchmarks that regressed
+    """
+    lines: List[str] = []
+    regressions: List[str] = []
+
+    for name in sorted(results.keys() & baseline.keys()):
+        measurement: str = 'seconds' if 'seconds' in results[name] else 'calls'
+
+        new_value: float = results[name][measurement]
+        old_value: float = baseline[name].get(measurement, 0)
+
+        change: float = (new_value - old_value) / old_value if old_value > 0 else 0.0
+        regressed: bool = change > threshold
+
+        if regressed:
+            regressions.append(name)
+
+        marker: str = ' REGRESSED' if regressed else ''
+        lines.append(f'{name:<48} {format_value(old_value, measurement):>12} -> {format_value(new_value, measurement):>12} {change:+8.1%}{marker}')
+
+    return lines, regressions
+
+def format_value(value: float, measurement: str) -> str:
+    """
+    Formats seconds in the unit that fits them, call counts as they are
+
+    Arguments:
+        value (float): The measured value.
+        measurement (str): 'seconds' or 'calls'.
+    """
+    if measurement == 'calls':
+        return str(int(value))
+
+    for unit, scale in (('s', 1), ('ms', 1e3), ('us', 1e6)):
+        if value * scale >= 1:
+            return f'{value * scale:.3f}{unit}'
+
+    return f'{value * 1e9:.1f}ns'
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Dict, Sequence
+from benchmarks.scenes import delete_shapes, random_shapes
+from benchmarks.timing import RESULT, measure
+from custom_types import *
+
+if TYPE_CHECKING:
+    from geometry.three_dimensional.shape import Shape
+
+FRAME_COUNTS: Tuple[int, ...] = (1, 10, 100, 1000, 10000, 100000)
+
+def benchmark_frames(counts: Sequence[int] = FRAME_COUNTS, repeat: int = 5, platform: str = 'egl', count_calls: bool = False, width: int = 1270, height: int = 685) -> Tuple[Dict[str, RESULT], str]:
+    """
+    Times the frames of scenes drawn the way Canvas.redraw draws them, in a headless context.
+    The canvas needs a Tk window, so the frames are drawn by render.draw_scene which calls the same draw_shapes.
+
+    Arguments:
+        counts (Sequence[int]): The numbers of shapes of the scenes. Defaults to FRAME_COUNTS
+        repeat (int): The number of timed frames of each benchmark, scenes over 10,000 shapes are timed once. Defaults to 5
+        platform (str): 'egl' or 'osmesa', PYOPENGL_PLATFORM must already be set to it. Defaults to 'egl'
+        count_calls (bool): If the OpenGL calls, vertices and state changes of one frame of every scene are counted too. Defaults to False
+        width (int): The width of the frames in pixels. Defaults to 1270
+        height (int): The height of the frames in pixels. Defaults to 685
+
+    Returns:
+        The results by name, like 'frame/1000/redraw', and the OpenGL renderer the frames were drawn by
+    """
+    from render import RenderSettings, create_framebuffer, delete_framebuffer, draw_scene, initialize_worker
+    from geometry.three_dimensional.frame_statistics import DrawCounts, frame_statistics
+    from geometry.three_dimensional.static_batch import StaticBatch
+
+    import OpenGL.GL as GL
+
+    initialize_worker(platform)
+
+    renderer: str = GL.glGetString(GL.GL_RENDERER).decode()
+    settings: RenderSettings = RenderSettings(width, height)
+    framebuffer: Tuple[int, int, int] = create_framebuffer(width, height)
+    results: Dict[str, RESULT] = {}
+
+    try:
+        for count in counts:
+            runs: int = repeat if count <= 10000 else 1
+            shapes: List[Shape] = random_shapes(count)
+            static_batch: StaticBatch = StaticBatch()
+
+            def draw_frame() -> None:
+                draw_scene(shapes, settings, static_batch)
+
+                # the driver queues the calls, the frame is only done once they ran
+                GL.glFinish()
+
+            # the first frame bakes the batch, the next ones only draw it
+            results[f'frame/{count}/first'] = measure(draw_frame, runs, 1, setup=static_batch.clear)
+            results[f'frame/{count}/redraw'] = measure(draw_frame, runs)
+
+            if count_calls:
+                frame_statistics.enable()
+
+                try:
+                    draw_frame()
+                    frame_statistics.end_frame()
+                    totals: DrawCounts = frame_statistics.totals()
+                finally:
+                    frame_statistics.disable()
+
+                results[f'calls/{count}'] = {
+                    'calls': totals.calls,
+                    'vertices': totals.vertices,
+                    'state_changes': totals.state_changes,
+                    'functions': dict(totals.functions.most_common())
+                }
+
+            static_batch.clear()
+            delete_shapes(shapes)
+    finally:
+        delete_framebuffer(framebuffer)
+
+    return results, renderer
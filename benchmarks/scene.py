@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Dict, Sequence
+from benchmarks.scenes import delete_shapes, random_shapes
+from benchmarks.timing import RESULT, measure
+from tempfile import TemporaryDirectory
+from custom_types import *
+from constants import *
+from os import path
+
+if TYPE_CHECKING:
+    from geometry.three_dimensional.shape import Shape
+
+SCENE_COUNTS: Tuple[int, ...] = (1, 10, 100, 1000, 10000, 100000)
+
+# Canvas.width and Canvas.height, the canvas cannot be imported without Tk
+VIEWPORT_WIDTH: int = 1270
+VIEWPORT_HEIGHT: int = 685
+
+def benchmark_scenes(counts: Sequence[int] = SCENE_COUNTS, repeat: int = 5) -> Dict[str, RESULT]:
+    """
+    Times the work that grows with the number of shapes: creating them, building the bounding volumes,
+    frustum culling, picking with a ray and saving and loading the scene file
+
+    Arguments:
+        counts (Sequence[int]): The numbers of shapes of the scenes. Defaults to SCENE_COUNTS
+        repeat (int): The number of timed runs of each benchmark, scenes over 10,000 shapes are timed once. Defaults to 5
+
+    Returns:
+        The results by name, like 'scene/1000/frustum'
+    """
+    from geometry.three_dimensional.projection import boxes_in_frustum, frustum_planes, perspective_matrix, unproject, view_matrix
+    from geometry.three_dimensional.scene_file import load_scene, save_scene
+    from geometry.three_dimensional.bvh import BoundingVolumeHierarchy
+    from numpy import stack
+
+    projection = perspective_matrix(FIELD_OF_VIEW, VIEWPORT_WIDTH / VIEWPORT_HEIGHT, 1, 1000)
+    view = view_matrix(*CAMERA_ROTATION, CAMERA_TRANSLATION, CAMERA_SENSITIVITY)
+    planes = frustum_planes(projection @ view)
+    origin, direction = unproject(VIEWPORT_WIDTH / 2, VIEWPORT_HEIGHT / 2, VIEWPORT_WIDTH, VIEWPORT_HEIGHT, projection, view)
+
+    results: Dict[str, RESULT] = {}
+
+    for count in counts:
+        runs: int = repeat if count <= 10000 else 1
+        shapes: List[Shape] = []
+        loaded_shapes: List[Shape] = []
+
+        def build_bounding_volumes() -> BoundingVolumeHierarchy:
+            bounding_volumes: BoundingVolumeHierarchy = BoundingVolumeHierarchy()
+
+            for shape in shapes:
+                bounding_volumes.insert(shape)
+
+            bounding_volumes.refit()
+            return bounding_volumes
+
+        results[f'scene/{count}/create'] = measure(lambda: shapes.extend(random_shapes(count)), runs, 1, setup=lambda: delete_shapes(shapes))
+        results[f'scene/{count}/bounding_volumes'] = measure(build_bounding_volumes, runs, 1)
+        results[f'scene/{count}/frustum'] = measure(lambda: boxes_in_frustum(planes, stack([shape.world_bounding_box() for shape in shapes])), runs)
+
+        bounding_volumes: BoundingVolumeHierarchy = build_bounding_volumes()
+        results[f'scene/{count}/raycast'] = measure(lambda: bounding_volumes.raycast(origin, direction), runs)
+
+        with TemporaryDirectory() as directory:
+            scene_path: str = path.join(directory, f'benchmark{SCENE_FILE_EXTENSION}')
+
+            results[f'scene/{count}/save'] = measure(lambda: save_scene(scene_path, shapes), runs, 1)
+            results[f'scene/{count}/load'] = measure(lambda: loaded_shapes.extend(load_scene(scene_path)), runs, 1, setup=lambda: delete_shapes(loaded_shapes))
+
+        delete_shapes(loaded_shapes)
+        delete_shapes(shapes)
+
+    return results
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Type
+from random import Random
+from math import sqrt
+from custom_types import *
+
+if TYPE_CHECKING:
+    from geometry.three_dimensional.shape import Shape
+
+def random_shapes(count: int, seed: int = 0) -> List[Shape]:
+    """
+    Creates the same scene for the same count and seed, every shape class of shape_list spread over
+    a square that grows with the count so the shapes stay as dense as the scene grows
+
+    Arguments:
+        count (int): The number of shapes.
+        seed (int): The seed of the positions, rotations and colors. Defaults to 0
+    """
+    from geometry.three_dimensional.shape_list import shape_class_references
+
+    shape_classes: List[Type[Shape]] = list(shape_class_references().values())
+    random: Random = Random(seed)
+    half_size: float = max(10.0, sqrt(count) * 2.0)
+    shapes: List[Shape] = []
+
+    for _ in range(count):
+        shape: Shape = random.choice(shape_classes)()
+        shape.place(random.uniform(-half_size, half_size), random.uniform(-half_size, half_size), random.uniform(-2, 2), random.uniform(0, 360), random.uniform(0, 90))
+        shape.background_color = (random.random(), random.random(), random.random())
+        shapes.append(shape)
+
+    return shapes
+
+def delete_shapes(shapes: List[Shape]) -> None:
+    """
+    Deletes the shapes so their ids and meshes do not pile up between benchmarks
+
+    Arguments:
+        shapes (List[Shape]): The shapes to be deleted.
+    """
+    for shape in shapes:
+        shape.delete()
+
+    shapes.clear()
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Callable, Dict
+from benchmarks.timing import RESULT, measure
+from itertools import cycle
+from custom_types import *
+
+if TYPE_CHECKING:
+    from geometry.three_dimensional.shape import Shape
+
+def benchmark_shapes(repeat: int = 5) -> Dict[str, RESULT]:
+    """
+    Times generating, resizing, duplicating and finding the center of one shape of every class of shape_list
+
+    Arguments:
+        repeat (int): The number of timed runs of each benchmark. Defaults to 5
+
+    Returns:
+        The results by name, like 'shapes/Cube/resize'
+    """
+    from geometry.three_dimensional.shape_list import shape_class_references
+
+    results: Dict[str, RESULT] = {}
+
+    for name, shape_class in shape_class_references().items():
+        shape: Shape = shape_class()
+        increments = cycle((True, False))
+
+        operations: Dict[str, Callable[[], object]] = {
+            'initialize_vertices': shape.initialize_vertices,
+            # growing and shrinking in turns keeps the shape the same size over the runs
+            'resize': lambda: shape.resize(next(increments)),
+            'duplicate': lambda: shape.duplicate().delete()
+        }
+
+        if hasattr(shape, 'calculate_center'):
+            operations['calculate_center'] = getattr(shape, 'calculate_center')
+
+        for operation, function in operations.items():
+            results[f'shapes/{name}/{operation}'] = measure(function, repeat)
+
+        shape.delete()
+
+    return results
@@ -0,0 +1,79 @@
+from typing import Any, Callable, Dict
+from time import perf_counter
+from statistics import median
+from custom_types import *
+
+import gc
+
+RESULT: TypeAlias = Dict[str, Any] # the measurements of one benchmark, stored in the JSON results
+
+def measure(function: Callable[[], Any], repeat: int = 5, number: int = 0, setup: Optional[Callable[[], Any]] = None, minimum_seconds: float = 0.05) -> RESULT:
+    """
+    Times a function, the garbage collector is paused while timing so a collection does not land on one run
+
+    Arguments:
+        function (Callable[[], Any]): The code to be timed.
+        repeat (int): The number of timed runs, the median run is the result. Defaults to 5
+        number (int): The calls of each run, 0 to call it until a run takes minimum_seconds. Defaults to 0
+        setup (Optional[Callable[[], Any]]): Called before every run and not timed. Defaults to None
+        minimum_seconds (float): How long a run should take when number is 0. Defaults to 0.05
+
+    Returns:
+        The median and fastest seconds per call, the runs and the calls of each run
+    """
+    if number <= 0:
+        number = calibrate(function, setup, minimum_seconds)
+
+    timings: List[float] = []
+    collecting: bool = gc.isenabled()
+
+    try:
+        for _ in range(repeat):
+            if setup is not None:
+                setup()
+
+            gc.disable()
+            start: float = perf_counter()
+
+            for _ in range(number):
+                function()
+
+            timings.append((perf_counter() - start) / number)
+
+            if collecting:
+                gc.enable()
+    finally:
+        if collecting:
+            gc.enable()
+
+    return {
+        'seconds': median(timings),
+        'minimum': min(timings),
+        'repeat': repeat,
+        'number': number
+    }
+
+def calibrate(function: Callable[[], Any], setup: Optional[Callable[[], Any]], minimum_seconds: float) -> int:
+    """
+    Returns how many calls take at least minimum_seconds, doubling the calls until they do
+
+    Arguments:
+        function (Callable[[], Any]): The code to be timed.
+        setup (Optional[Callable[[], Any]]): Called before every attempt and not timed.
+        minimum_seconds (float): How long the calls should take.
+    """
+    number: int = 1
+
+    while True:
+        if setup is not None:
+            setup()
+
+        start: float = perf_counter()
+
+        for _ in range(number):
+            function()
+
+        if perf_counter() - start >= minimum_seconds or number >= 1 << 20:
+            return number
+
+        number *= 2
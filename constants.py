@@ -9,9 +9,19 @@ BLACK: Tuple[float, float, float] = (0.0, 0.0, 0.0)
 ORANGE: Tuple[float, float, float] = (0.949, 0.475, 0.161)
 
 ICON_PATH: str = path.join('icon_asset', "switch.ico")
+TEXTURE_CACHE_DIRECTORY: str = '.texture_cache'
+SCENE_FILE_EXTENSION: str = '.shapes'
+JOURNAL_DIRECTORY: str = '.journal'
+PROFILE_DIRECTORY: str = 'profiles'
 
 DEFAULT_PADDING: Literal[5] = 5
 
+# The camera a new canvas and a headless render start from
+FIELD_OF_VIEW: float = 45
+CAMERA_SENSITIVITY: float = 0.8
+CAMERA_ROTATION: Tuple[float, float] = (-25.0, -90.2)
+CAMERA_TRANSLATION: Tuple[float, float, float] = (-4.113748927600682, 11.039110913872719, -3.8264689669013023)
+
 BOTTOM_PADDING_ONLY: Tuple[Literal[0], int] = (0, DEFAULT_PADDING)
 RIGHT_PADDING_ONLY: Tuple[Literal[0], int] = (0, DEFAULT_PADDING)
 
@@ -1,9 +1,11 @@
 from typing import List, Tuple, TypeAlias, Optional, Literal
+from numpy.typing import NDArray
+from numpy import float32
 
 NUMBER: TypeAlias = int|float
 
 VERTEX: TypeAlias = Tuple[NUMBER, NUMBER, NUMBER]
-VERTICES: TypeAlias = List[VERTEX]
+VERTICES: TypeAlias = NDArray[float32] # (N, 3) array of x, y, z
 
 EDGE: TypeAlias = Tuple[int, int]
 EDGES: TypeAlias = Optional[List[EDGE]]
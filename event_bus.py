@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Callable, Dict, Literal
+from custom_types import *
+
+if TYPE_CHECKING:
+    from geometry.three_dimensional.shape import Shape
+
+TOPIC: TypeAlias = Literal['shape.selected', 'shape.deleted', 'shape.resized', 'shape.transformed', 'shape.changed']
+
+SHAPE_SELECTED: TOPIC = 'shape.selected'
+SHAPE_DELETED: TOPIC = 'shape.deleted'
+SHAPE_RESIZED: TOPIC = 'shape.resized' # value is True when it grew, False when it shrank and None when its mesh was replaced
+SHAPE_TRANSFORMED: TOPIC = 'shape.transformed' # field is one of TRANSFORM_FIELDS
+SHAPE_CHANGED: TOPIC = 'shape.changed' # field is any other property set through a setter
+
+# Set every frame while a shape is dragged or rotated with the mouse
+TRANSFORM_FIELDS: Tuple[str, ...] = ('x', 'y', 'z', 'x_rotation', 'y_rotation')
+
+class ShapeEvent:
+    """
+    A change of a shape delivered to the handlers of its topic
+    """
+
+    def __init__(self, topic: TOPIC, shape: Shape, field: Optional[str] = None, value: Any = None, old_value: Any = None) -> None:
+        """
+        Initializes the event
+
+        Arguments:
+            topic (TOPIC): What happened to the shape.
+            shape (Shape): The shape that changed.
+            field (Optional[str]): The property that was set, None for topics that are not about a property. Defaults to None
+            value (Any): The new value of the property or the value of the topic. Defaults to None
+            old_value (Any): The value of the property before it was set. Defaults to None
+        """
+        self.topic: TOPIC = topic
+        self.shape: Shape = shape
+        self.field: Optional[str] = field
+        self.value: Any = value
+        self.old_value: Any = old_value
+
+HANDLER: TypeAlias = Callable[[ShapeEvent], None]
+
+class EventBus:
+    """
+    Delivers the events of the shapes to the handlers subscribed to their topic, a topic nobody subscribed to costs a lookup.
+
+    A handler subscribed with coalesce gets at most one event per shape and field until the next flush,
+    with the latest value and the old value from before the first of the coalesced changes.
+    Setters publish after they stored the new value, the event carries the value it replaced.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initializes a bus without subscriptions
+
+        Attributes:
+            handlers (Dict[TOPIC, List[HANDLER]]): The handlers called as soon as an event is published, by topic.
+            coalesced_handlers (Dict[TOPIC, List[HANDLER]]): The handlers called by the next flush, by topic.
+            pending (Dict[Tuple[HANDLER, int, TOPIC, Optional[str]], ShapeEvent]): The latest event of every handler, shape and field waiting for the flush.
+            schedule (Optional[Callable[[Callable[[], None]], Any]]): Runs the flush once the current frame is done, like Tk after_idle. Coalesced handlers are called right away without it.
+            flush_scheduled (bool): If a flush is already scheduled.
+        """
+        self.handlers: Dict[TOPIC, List[HANDLER]] = {}
+        self.coalesced_handlers: Dict[TOPIC, List[HANDLER]] = {}
+        self.pending: Dict[Tuple[HANDLER, int, TOPIC, Optional[str]], ShapeEvent] = {}
+
+        self.schedule: Optional[Callable[[Callable[[], None]], Any]] = None
+        self.flush_scheduled: bool = False
+
+    def subscribe(self, topic: TOPIC, handler: HANDLER, coalesce: bool = False) -> None:
+        """
+        Calls the handler with every event of the topic
+
+        Arguments:
+            topic (TOPIC): The topic of the events.
+            handler (HANDLER): Called with the event.
+            coalesce (bool): Only call it with the latest event of every shape and field once per flush. Defaults to False
+        """
+        handlers: List[HANDLER] = (self.coalesced_handlers if coalesce else self.handlers).setdefault(topic, [])
+
+        if handler not in handlers:
+            handlers.append(handler)
+
+    def unsubscribe(self, topic: TOPIC, handler: HANDLER) -> None:
+        """
+        Stops calling the handler with the events of the topic, its pending events are dropped
+
+        Arguments:
+            topic (TOPIC): The topic of the events.
+            handler (HANDLER): The subscribed handler.
+        """
+        for handlers in (self.handlers.get(topic, []), self.coalesced_handlers.get(topic, [])):
+            if handler in handlers:
+                handlers.remove(handler)
+
+        for key in [key for key in self.pending if key[0] == handler and key[2] == topic]:
+            del self.pending[key]
+
+    def publish(self, topic: TOPIC, shape: Shape, field: Optional[str] = None, value: Any = None, old_value: Any = None) -> None:
+        """
+        Delivers an event to the handlers of its topic
+
+        Arguments:
+            topic (TOPIC): What happened to the shape.
+            shape (Shape): The shape that changed.
+            field (Optional[str]): The property that was set. Defaults to None
+            value (Any): The new value of the property or the value of the topic. Defaults to None
+            old_value (Any): The value of the property before it was set. Defaults to None
+        """
+        handlers: Optional[List[HANDLER]] = self.handlers.get(topic, None)
+        coalesced_handlers: Optional[List[HANDLER]] = self.coalesced_handlers.get(topic, None)
+
+        if handlers is None and coalesced_handlers is None:
+            return
+
+        event: ShapeEvent = ShapeEvent(topic, shape, field, value, old_value)
+
+        if handlers is not None:
+            for handler in list(handlers):
+                handler(event)
+
+        if coalesced_handlers is None:
+            return
+
+        if self.schedule is None:
+            for handler in list(coalesced_handlers):
+                handler(event)
+
+            return
+
+        for handler in coalesced_handlers:
+            key: Tuple[HANDLER, int, TOPIC, Optional[str]] = (handler, shape.id, topic, field)
+            pending_event: Optional[ShapeEvent] = self.pending.get(key, None)
+
+            # the coalesced event keeps the value from before the first change it replaces
+            self.pending[key] = event if pending_event is None else ShapeEvent(topic, shape, field, value, pending_event.old_value)
+
+        if not self.flush_scheduled:
+            self.flush_scheduled = True
+            self.schedule(self.flush)
+
+    def flush(self, handler: Optional[HANDLER] = None) -> None:
+        """
+        Delivers the pending events to the coalesced handlers in the order they were first published
+
+        Arguments:
+            handler (Optional[HANDLER]): Only deliver the events of this handler, the others keep waiting. Defaults to None
+        """
+        if handler is not None:
+            keys: List[Tuple[HANDLER, int, TOPIC, Optional[str]]] = [key for key in self.pending if key[0] == handler]
+
+            for key in keys:
+                handler(self.pending.pop(key))
+
+            return
+
+        self.flush_scheduled = False
+
+        pending: Dict[Tuple[HANDLER, int, TOPIC, Optional[str]], ShapeEvent] = self.pending
+        self.pending = {}
+
+        for (pending_handler, _, _, _), event in pending.items():
+            pending_handler(event)
+
+event_bus: EventBus = EventBus()
@@ -79,6 +79,9 @@ def __handle_shift_and_control(canvas_instance: Canvas, key: str) -> None:
     elif key == 'Right':
         canvas_instance.command_shape('resize')
 
+    elif key == 'Z':
+        canvas_instance.redo()
+
 def __handle_key(canvas_instance: Canvas, key: str) -> None:
     """
     Handles events where another key is being pressed.
@@ -127,6 +130,22 @@ def __handle_key(canvas_instance: Canvas, key: str) -> None:
         canvas_instance.move_camera([-1, 0, 0]) # right_vector
         return
 
+    elif key == 'F3':
+        canvas_instance.toggle_frame_statistics()
+        return
+
+    elif key == 'F4':
+        canvas_instance.toggle_frame_profiler()
+        return
+
+    elif key == 'F5':
+        canvas_instance.toggle_frame_percentiles()
+        return
+
+    elif key == 'F6':
+        canvas_instance.dump_frame_profile()
+        return
+
 def __handle_control(canvas_instance: Canvas, key: str) -> None:
     """
     Handles events where another key is being pressed. While the control key is being held
@@ -144,5 +163,11 @@ def __handle_control(canvas_instance: Canvas, key: str) -> None:
             return
 
         duplicated_shape: Shape = selected_shape.duplicate()
-        canvas_instance.shapes.append(duplicated_shape)
-        CTkToast.toast(f'{duplicated_shape.__class__.__name__} duplicated')
\ No newline at end of file
+        canvas_instance.add_shape(duplicated_shape)
+        CTkToast.toast(f'{duplicated_shape.__class__.__name__} duplicated')
+
+    elif key == 'z':
+        canvas_instance.undo()
+
+    elif key == 'y':
+        canvas_instance.redo()
\ No newline at end of file
@@ -38,3 +38,4 @@ def __handle_key(canvas_instance: Canvas, key: str) -> None:
             return
 
         selected_shape.rotate_shape = False
+        canvas_instance.mark_dirty()
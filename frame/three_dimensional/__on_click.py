@@ -2,9 +2,7 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Dict, Tuple
-
-from custom_types import RGB
+from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from frame.three_dimensional.canvas import Canvas
@@ -12,8 +10,6 @@ if TYPE_CHECKING:
 from tkinter import Event
 from typing import List
 
-import OpenGL.GL as GL
-
 def on_mouse_clicked(canvas_instance: Canvas, event: Event) -> None:
     """
     Handles mouse click events
@@ -34,31 +30,5 @@ def on_mouse_clicked(canvas_instance: Canvas, event: Event) -> None:
 
         mouse_y: int = canvas_instance.height - event.y  # Invert y-coordinate to match OpenGL
 
-        # Read color of the pixel at the mouse coordinates from the offscreen framebuffer
-        GL.glBindFramebuffer(GL.GL_FRAMEBUFFER, canvas_instance.offscreen_framebuffer_id)
-        GL.glReadBuffer(GL.GL_COLOR_ATTACHMENT0)
-        GL.glPixelStorei(GL.GL_PACK_ALIGNMENT, 1)
-
-        long_float_colors = GL.glReadPixels(event.x, mouse_y, 1, 1, GL.GL_RGB, GL.GL_FLOAT)[0][0]
-        picked_rgb: Tuple[int, int, int] = tuple(round(float(color), 2) for color in long_float_colors)
-
-        # Unbind the offscreen framebuffer
-        GL.glBindFramebuffer(GL.GL_FRAMEBUFFER, 0)
-        selected_shape_id: int|None = None
-
-        from geometry.three_dimensional.buffers import buffer_colors
-
-        for shape_id, shape_rgb in buffer_colors.items():
-            if picked_rgb == shape_rgb:
-                selected_shape_id = shape_id
-                break
-
-        for shape in canvas_instance.shapes:
-            shape.selected = shape.id == selected_shape_id
-
-            if shape.selected:
-                shape.notify_observers("shape_selected")
-
-        if selected_shape_id is None:
-            canvas_instance.properties.clear()
-
+        # The shape is looked up by the id encoded in the color of the picked pixel
+        canvas_instance.select_shape(canvas_instance.pick_shape(event.x, mouse_y))
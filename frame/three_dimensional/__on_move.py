@@ -28,7 +28,9 @@ def on_mouse_move(canvas_instance: Canvas, event: Event):
         if selected_shape is None:
             CTkToast.toast("Select a shape first to rotate")
         else:
+            # the shape follows the mouse while it is being drawn
             selected_shape.rotate_shape = True
+            canvas_instance.mark_dirty()
             return
 
     if canvas_instance.mouse_pressed != '':
@@ -41,5 +43,7 @@ def on_mouse_move(canvas_instance: Canvas, event: Event):
         canvas_instance.camera_x += delta_x
         canvas_instance.camera_y += delta_y
 
+        canvas_instance.mark_dirty()
+
     canvas_instance.previous_mouse_x = event.x
     canvas_instance.previous_mouse_y = event.y
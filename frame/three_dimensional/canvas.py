@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING, Any
 
-from constants import DEFAULT_PADDING
+from constants import CAMERA_ROTATION, CAMERA_SENSITIVITY, CAMERA_TRANSLATION, DEFAULT_PADDING, FIELD_OF_VIEW, JOURNAL_DIRECTORY, PROFILE_DIRECTORY
 
 if TYPE_CHECKING:
     from geometry.three_dimensional.shape import Shape
@@ -14,8 +14,12 @@ import OpenGL.GLU as GLU
 import OpenGL.GL as GL
 
 from tkinter import Event
-from typing import List
+from typing import Dict, List
+from datetime import datetime
+from time import perf_counter_ns
+from os import path
 import pyopengltk
+import atexit
 
 # key methods
 from .__key_released import handle_key_released
@@ -26,22 +30,42 @@ from .__on_release import on_mouse_released
 from .__on_click import on_mouse_clicked
 from .__on_move import on_mouse_move
 
+from geometry.three_dimensional.projection import MATRIX, perspective_matrix, unproject, view_matrix
+from geometry.three_dimensional.scene_file import load_scene, save_scene
+from geometry.three_dimensional.scene_journal import SceneJournal
+from geometry.three_dimensional.undo_history import UndoHistory
+from geometry.three_dimensional.frame_profiler import CANVAS_CATEGORY, frame_profiler
+from geometry.three_dimensional.frame_statistics import CANVAS_SOURCE, GRID_SOURCE, ONSCREEN_PASS, PICKING_PASS, frame_statistics
+from geometry.three_dimensional.scene_drawing import draw_shapes
+from geometry.three_dimensional.grid import grid_lines
+from geometry.three_dimensional.bvh import BoundingVolumeHierarchy
+from geometry.three_dimensional.static_batch import StaticBatch
+from geometry.three_dimensional.texture_cache import texture_cache
+from geometry.three_dimensional.vertex_buffer import VertexBuffer
 from geometry.three_dimensional.shapes.cube import Cube
+from geometry.rgb import rgb_to_id
 from properties.manager import Properties
-from observers import Observer
+from event_bus import SHAPE_CHANGED, SHAPE_DELETED, SHAPE_RESIZED, SHAPE_SELECTED, SHAPE_TRANSFORMED, ShapeEvent, event_bus
+from customtkinter import CTkLabel
 from CTkToast import CTkToast
 from custom_types import *
 from numpy import dot
 
-class Canvas(pyopengltk.OpenGLFrame, Observer):
+class Canvas(pyopengltk.OpenGLFrame):
 
-    camera_sensitivity: float = 0.8
+    camera_sensitivity: float = CAMERA_SENSITIVITY
 
     width: int = 1270
     height: int = 685
 
     offscreen_framebuffer_id: int = -1
     offscreen_texture_id: int = -1
+    offscreen_depth_buffer_id: int = -1
+    picking_region_size: int = 8
+    picking_mode: str = 'cpu' # 'cpu' casts a ray through the bounding volume hierarchy, 'gpu' reads the picking pass
+    static_batching: bool = True
+    texture_poll_interval: int = 50
+    profile_dump_frames: int = 300
     pressed_key: str = ''
     clip: bool = False
 
@@ -59,14 +83,35 @@ class Canvas(pyopengltk.OpenGLFrame, Observer):
         self.bind("<Button>", lambda event: on_mouse_clicked(self, event) )
         self.bind("<ButtonRelease>", lambda event: on_mouse_released(self, event) )
         self.shapes: List[Shape] = []
+        self.shapes_by_id: Dict[int, Shape] = {}
+        self.bounding_volumes: BoundingVolumeHierarchy = BoundingVolumeHierarchy()
+        self.static_batch: StaticBatch = StaticBatch()
+        self.selection: Optional[Shape] = None
 
         self.parent: App = parent
-        self.animate: int = 1
+
+        # Damage driven rendering only renders a frame after something marked the scene dirty,
+        # continuous rendering renders a frame every millisecond like before.
+        self.continuous_rendering: bool = False
+        self.frame_callback: Optional[str] = None
+
+        self.scene_dirty: bool = True
+        self.redraw_scheduled: bool = False
+
+        # The picking pass is only rendered when a shape is picked, around the mouse
+        self.picking_outdated: bool = True
+        self.picking_region: Optional[Tuple[int, int, int, int]] = None
+
+        # Textures decode in the background, a frame is rendered once they can be uploaded
+        self.texture_poll_scheduled: bool = False
+
+        # Shapes that stopped moving are baked into the static batch again by a later frame
+        self.settle_poll_scheduled: bool = False
 
         self.mouse_x: int = 0
         self.mouse_y: int = 0
-        self.camera_x: float = -25.0
-        self.camera_y: float = -90.2
+        self.camera_x: float = CAMERA_ROTATION[0]
+        self.camera_y: float = CAMERA_ROTATION[1]
 
         self.dragging: bool = False
         self.mouse_pressed: str = ''
@@ -74,12 +119,15 @@ class Canvas(pyopengltk.OpenGLFrame, Observer):
         self.previous_mouse_x: int = 0
         self.previous_mouse_y: int = 0
 
-        self.camera_y_translate: float = 11.039110913872719
-        self.camera_x_translate: float = -4.113748927600682
-        self.camera_zoom_translate: float = -3.8264689669013023
+        self.camera_x_translate: float = CAMERA_TRANSLATION[0]
+        self.camera_y_translate: float = CAMERA_TRANSLATION[1]
+        self.camera_zoom_translate: float = CAMERA_TRANSLATION[2]
 
         self.render_distance: int = 1000
 
+        self.grid_buffer: VertexBuffer = VertexBuffer()
+        self.grid_parameters: Optional[Tuple[int, float]] = None
+
         properties_width: int = 300
         properties_x_coordinate: int = Canvas.width - properties_width
         properties_y_coordinate: int = parent.navigation.winfo_height() + DEFAULT_PADDING
@@ -87,6 +135,39 @@ class Canvas(pyopengltk.OpenGLFrame, Observer):
         self.properties = Properties(parent, properties_x_coordinate, properties_y_coordinate, width=properties_width, height=0)
         self.properties.place(x=properties_x_coordinate, y=properties_y_coordinate)
 
+        # Shows the OpenGL calls and the phase percentiles of the last frames, placed while either is shown
+        self.hud: CTkLabel = CTkLabel(parent, text='', justify='left', anchor='nw', font=('Courier', 12))
+        self.hud_position: Tuple[int, int] = (DEFAULT_PADDING, properties_y_coordinate)
+        self.show_frame_percentiles: bool = False
+
+        # Moves and rotations are handled once per frame with their latest value, a drag sets them every frame
+        event_bus.schedule = self.after_idle
+        event_bus.subscribe(SHAPE_TRANSFORMED, self.__shape_transformed)
+        event_bus.subscribe(SHAPE_TRANSFORMED, self.__shape_transform_settled, coalesce=True)
+        event_bus.subscribe(SHAPE_CHANGED, self.__shape_changed)
+        event_bus.subscribe(SHAPE_RESIZED, self.__shape_changed)
+        event_bus.subscribe(SHAPE_DELETED, self.__shape_deleted)
+        event_bus.subscribe(SHAPE_SELECTED, self.__shape_selected)
+
+        # Changes are undone from the history, the recovered scene is not part of it
+        self.history: UndoHistory = UndoHistory(self.add_shape)
+
+        # Every change is appended to the journal, the scene of the last session is recovered from it
+        self.journal: Optional[SceneJournal] = SceneJournal(JOURNAL_DIRECTORY, self.after)
+
+        try:
+            recovered_shapes: List[Shape] = self.journal.recover()
+        except OSError as error:
+            CTkToast.toast(f'Journaling is disabled, the journal could not be opened: {error}')
+            self.journal = None
+        else:
+            for shape in recovered_shapes:
+                self.add_shape(shape)
+
+            atexit.register(self.journal.close)
+
+        self.history.clear()
+
     @property
     def camera_translation(self) -> List[float]:
         """
@@ -107,6 +188,131 @@ class Canvas(pyopengltk.OpenGLFrame, Observer):
         self.camera_y_translate += transformed_direction[1]
         self.camera_zoom_translate += transformed_direction[2]
 
+        self.mark_dirty()
+
+    def mark_dirty(self, affects_picking: bool = True) -> None:
+        """
+        Marks the scene as changed. In damage driven mode a single frame is rendered once Tk is idle,
+        no matter how many times the scene was marked dirty before then.
+
+        Arguments:
+            affects_picking (bool): If the change also needs the picking pass to be rendered again. Defaults to True.
+        """
+        self.scene_dirty = True
+        self.picking_outdated = self.picking_outdated or affects_picking
+
+        if self.continuous_rendering or self.redraw_scheduled:
+            return
+
+        self.redraw_scheduled = True
+        self.after_idle(self.__render_dirty_frame)
+
+    def __render_dirty_frame(self) -> None:
+        """
+        Renders a frame if the scene is still dirty
+        """
+        self.redraw_scheduled = False
+
+        if not self.scene_dirty or not self.context_created:
+            return
+
+        self._display()
+
+    def set_continuous_rendering(self, enabled: bool) -> None:
+        """
+        Switches between rendering every frame and only rendering frames after the scene changed
+
+        Arguments:
+            enabled (bool): If a frame should be rendered continuously.
+        """
+        if self.continuous_rendering == enabled:
+            return
+
+        self.continuous_rendering = enabled
+
+        if not enabled and self.frame_callback is not None:
+            self.after_cancel(self.frame_callback)
+            self.frame_callback = None
+
+        if enabled and self.context_created:
+            self.after_idle(self._display)
+
+    def _display(self) -> None:
+        """
+        Renders a frame, and schedules the next one while rendering continuously.
+        A frame rendered in between (after an expose or a change) replaces the scheduled one.
+        """
+        if self.frame_callback is not None:
+            self.after_cancel(self.frame_callback)
+            self.frame_callback = None
+
+        super()._display()
+
+        if self.continuous_rendering:
+            self.frame_callback = self.after(1, self.__render_next_frame)
+
+    def __render_next_frame(self) -> None:
+        """
+        Renders the next frame of continuous rendering
+        """
+        self.frame_callback = None
+        self._display()
+
+    def add_shape(self, shape: Shape) -> None:
+        """
+        Adds a shape to the canvas, its changes are handled through the event bus
+
+        Arguments:
+            shape (Shape): The shape to be added.
+        """
+        if self.journal is not None:
+            self.journal.track(shape)
+
+        self.history.track(shape)
+
+        self.shapes.append(shape)
+        self.shapes_by_id[shape.id] = shape
+        self.bounding_volumes.insert(shape)
+        self.mark_dirty()
+
+    def import_scene(self, file_path: str) -> None:
+        """
+        Adds the shapes of a scene file to the canvas
+
+        Arguments:
+            file_path (str): The path of the scene.
+        """
+        try:
+            shapes: List[Shape] = load_scene(file_path)
+        except (OSError, ValueError) as error:
+            CTkToast.toast(f'Could not import the scene: {error}')
+            return
+
+        # the whole import is undone at once
+        self.history.begin('import')
+
+        for shape in shapes:
+            self.add_shape(shape)
+
+        self.history.end()
+
+        CTkToast.toast(f'Imported {len(shapes)} shapes')
+
+    def export_scene(self, file_path: str) -> None:
+        """
+        Saves every shape of the canvas to a scene file
+
+        Arguments:
+            file_path (str): Where the scene is saved.
+        """
+        try:
+            save_scene(file_path, self.shapes)
+        except OSError as error:
+            CTkToast.toast(f'Could not export the scene: {error}')
+            return
+
+        CTkToast.toast(f'Exported {len(self.shapes)} shapes')
+
     def key_pressed(self, event: Event):
         """
         Handle key press events
@@ -123,46 +329,115 @@ class Canvas(pyopengltk.OpenGLFrame, Observer):
         """
         Returns the current selected shape
         """
-        for shape in self.shapes:
-            if shape.selected:
-                return shape
+        return self.selection
 
-        return None
+    def select_shape(self, shape: Optional[Shape]) -> None:
+        """
+        Selects the shape and deselects the previous one, clears the properties tab if the shape is None
 
-    def notify(self, message: str, observable: Shape, *args: Any, **kwargs: Any) -> None:
+        Arguments:
+            shape (Optional[Shape]): The shape to be selected.
         """
-        Gets called when any changes happens to the selected shape
+        if self.selection is not None:
+            self.selection.selected = False
+
+        self.selection = shape
+
+        if shape is None:
+            self.properties.clear()
+        else:
+            shape.selected = True
+            event_bus.publish(SHAPE_SELECTED, shape)
+
+        self.mark_dirty(affects_picking=False)
 
-        (Kind of like websockets and this method is the event.on() function)
+    def __shape_transformed(self, event: ShapeEvent) -> None:
+        """
+        Renders the moved or rotated shape on the next frame, it is held out of the static batch until it stops
 
         Arguments:
-            message (str): The message to enable if statements
-            observable (Observable|Shape): The instance that emitted the event
-            *args: Variable length argument list.
-            **kwargs: Additional keyword arguments to pass to the parent class initializer.
+            event (ShapeEvent): The SHAPE_TRANSFORMED event.
         """
-        super().notify(message, observable, *args, **kwargs)
-        selected_shape: Shape = observable
+        if event.shape.id not in self.shapes_by_id:
+            return
+
+        self.mark_dirty()
+        self.static_batch.hold(event.shape)
+
+    def __shape_transform_settled(self, event: ShapeEvent) -> None:
+        """
+        Updates the bounding box and the properties tab with the latest position or rotation of the frame
 
-        if self.properties is None:
+        Arguments:
+            event (ShapeEvent): The coalesced SHAPE_TRANSFORMED event.
+        """
+        if event.shape.id not in self.shapes_by_id:
             return
 
-        if message == 'shape_selected':
-            self.properties.create_shape_properties_tab(selected_shape)
+        self.bounding_volumes.invalidate(event.shape)
+
+        if event.field is not None and event.shape is self.selection and self.properties is not None:
+            self.properties.update_group_value(event.field, event.value)
+
+    def __shape_changed(self, event: ShapeEvent) -> None:
+        """
+        Renders the changed or resized shape on the next frame
+
+        Arguments:
+            event (ShapeEvent): The SHAPE_CHANGED or SHAPE_RESIZED event.
+        """
+        if event.shape.id not in self.shapes_by_id:
+            return
+
+        self.mark_dirty()
+
+        # the bounding box is only read again on the next pick
+        self.bounding_volumes.invalidate(event.shape)
 
-        elif message == 'shape_deleted':
+        # the shape is baked again with its new values by the next frame
+        self.static_batch.remove(event.shape)
+
+        if event.field is not None and event.shape is self.selection and self.properties is not None:
+            self.properties.update_group_value(event.field, event.value)
+
+    def __shape_deleted(self, event: ShapeEvent) -> None:
+        """
+        Removes the deleted shape from the canvas
+
+        Arguments:
+            event (ShapeEvent): The SHAPE_DELETED event.
+        """
+        deleted_shape: Shape = event.shape
+
+        if self.shapes_by_id.pop(deleted_shape.id, None) is None:
+            return
+
+        self.mark_dirty()
+        self.static_batch.remove(deleted_shape)
+        self.bounding_volumes.remove(deleted_shape)
+
+        if self.properties is not None:
             self.properties.clear()
 
-            for shape in self.shapes:
-                if shape.id != selected_shape.id:
-                    continue
+        if self.selection is deleted_shape:
+            self.selection = None
+
+        for shape in self.shapes:
+            if shape.id != deleted_shape.id:
+                continue
 
-                self.shapes.remove(shape)
-                break
+            self.shapes.remove(shape)
+            break
 
-        elif 'shape_setter_' in message:
-            shape_property_setter_name: str = message.replace('shape_setter_', '')
-            self.properties.update_group_value(shape_property_setter_name, *args)
+    def __shape_selected(self, event: ShapeEvent) -> None:
+        """
+        Shows the properties of the selected shape
+
+        Arguments:
+            event (ShapeEvent): The SHAPE_SELECTED event.
+        """
+        if self.properties is not None:
+            self.properties.create_shape_properties_tab(event.shape)
 
     def command_shape(self, method_reference: str, *args, **kwargs) -> None:
         """
@@ -191,25 +466,64 @@ class Canvas(pyopengltk.OpenGLFrame, Observer):
             CTkToast.toast(f"To {method_reference.replace('_', ' ')}, select a shape first")
             return
 
-        getattr(selected_shape, method_reference)(*args, **kwargs)
+        # repeated moves and resizes of the same shape are undone at once
+        self.history.begin('move' if method_reference.startswith('move_') else method_reference, selected_shape)
+
+        try:
+            getattr(selected_shape, method_reference)(*args, **kwargs)
+        finally:
+            self.history.end()
+
+    def undo(self) -> None:
+        """
+        Reverts the last change to the shapes
+        """
+        label: Optional[str] = self.history.undo()
+
+        if label is None:
+            CTkToast.toast('Nothing to undo')
+            return
+
+        CTkToast.toast(f"Undid {label.replace('_', ' ')}")
+
+    def redo(self) -> None:
+        """
+        Applies the last undone change to the shapes again
+        """
+        label: Optional[str] = self.history.redo()
+
+        if label is None:
+            CTkToast.toast('Nothing to redo')
+            return
+
+        CTkToast.toast(f"Redid {label.replace('_', ' ')}")
 
     def init_offscreen_buffer(self) -> None:
         """
         Initializes the offscreen framebuffer and texture
         """
-        # Generate framebuffer and texture IDs
+        # Generate framebuffer, texture and depth buffer IDs
         self.offscreen_framebuffer_id = GL.glGenFramebuffers(1)
         self.offscreen_texture_id = GL.glGenTextures(1)
+        self.offscreen_depth_buffer_id = GL.glGenRenderbuffers(1)
 
         GL.glBindFramebuffer(GL.GL_FRAMEBUFFER, self.offscreen_framebuffer_id)
         GL.glBindTexture(GL.GL_TEXTURE_2D, self.offscreen_texture_id)
-        GL.glTexImage2D(GL.GL_TEXTURE_2D, 0, GL.GL_RGB, Canvas.width, Canvas.height, 0, GL.GL_RGB, GL.GL_UNSIGNED_BYTE, None)
+
+        # 8 bits per channel so the ids encoded by id_to_rgb are read back exactly
+        GL.glTexImage2D(GL.GL_TEXTURE_2D, 0, GL.GL_RGB8, Canvas.width, Canvas.height, 0, GL.GL_RGB, GL.GL_UNSIGNED_BYTE, None)
 
         GL.glTexParameteri(GL.GL_TEXTURE_2D, GL.GL_TEXTURE_MIN_FILTER, GL.GL_NEAREST)
         GL.glTexParameteri(GL.GL_TEXTURE_2D, GL.GL_TEXTURE_MAG_FILTER, GL.GL_NEAREST)
 
         GL.glFramebufferTexture2D(GL.GL_FRAMEBUFFER, GL.GL_COLOR_ATTACHMENT0, GL.GL_TEXTURE_2D, self.offscreen_texture_id, 0)
 
+        # Without a depth buffer the last drawn shape would be picked instead of the nearest one
+        GL.glBindRenderbuffer(GL.GL_RENDERBUFFER, self.offscreen_depth_buffer_id)
+        GL.glRenderbufferStorage(GL.GL_RENDERBUFFER, GL.GL_DEPTH_COMPONENT24, Canvas.width, Canvas.height)
+        GL.glFramebufferRenderbuffer(GL.GL_FRAMEBUFFER, GL.GL_DEPTH_ATTACHMENT, GL.GL_RENDERBUFFER, self.offscreen_depth_buffer_id)
+        GL.glBindRenderbuffer(GL.GL_RENDERBUFFER, 0)
+
         if GL.glCheckFramebufferStatus(GL.GL_FRAMEBUFFER) != GL.GL_FRAMEBUFFER_COMPLETE:
             raise Exception("Error: Offscreen framebuffer is incomplete")
 
@@ -229,51 +543,157 @@ class Canvas(pyopengltk.OpenGLFrame, Observer):
         GL.glEnable(GL.GL_BLEND)
         GL.glBlendFunc(GL.GL_SRC_ALPHA, GL.GL_ONE_MINUS_SRC_ALPHA)
 
-        # Initial shape
-        cube: Cube = Cube()
-        cube.subscribe(self.parent.canvas)
+        # Initial shape, unless the journal recovered the scene of the last session
+        if len(self.shapes) <= 0:
+            self.add_shape(Cube())
+            self.history.clear()
+
+    def __build_grid(self, distance: int, opacity: float) -> None:
+        """
+        Uploads the grid lines and their colors into the grid buffer
+
+        Arguments:
+            distance (int): How far the grid lines reach from the origin.
+            opacity (float): The opacity of the grid lines that are not axes.
+        """
+        vertices, colors = grid_lines(distance, opacity)
 
-        self.shapes.append(cube)
+        self.grid_buffer.upload(vertices, colors=colors)
+        self.grid_parameters = (distance, opacity)
 
     def __draw_grid(self, distance: int = 200, opacity: float = 0.05) -> None:
         """
-        Draw grid lines
+        Draw grid lines, the lines are only rebuilt when the distance or opacity changes
         """
-        green: RGBA = (0.0, 1.0, 0.0, 0.4)
-        red: RGBA = (1.0, 0.0, 0.0, 0.4)
-        default_color: RGBA = (0.7, 0.7, 0.7, opacity)
+        if self.grid_parameters != (distance, opacity):
+            self.__build_grid(distance, opacity)
 
         GL.glLineWidth(0.5)
-        GL.glBegin(GL.GL_LINES)
+        self.grid_buffer.draw(GL.GL_LINES)
+        GL.glLineWidth(1.0)
 
-        # Draw lines along the X-axis
-        for index in range(-distance, distance + 1):
-            GL.glColor4f(*green if index == 0 else default_color)
-            GL.glVertex3f(index, -distance, 0)
-            GL.glVertex3f(index, distance, 0)
+    def draw_picking_pass(self, x: int, y: int) -> None:
+        """
+        Renders the shapes into the offscreen framebuffer around the coordinate
+        unless the scene and camera did not change since the last pick at that area.
 
-        # Draw lines along the Y-axis
-        for index in range(-distance, distance + 1):
-            GL.glColor4f(*red if index == 0 else default_color)
-            GL.glVertex3f(-distance, index, 0)
-            GL.glVertex3f(distance, index, 0)
+        Arguments:
+            x (int): The x-coordinate of the pixel to be picked.
+            y (int): The y-coordinate of the pixel to be picked, starting from the bottom.
+        """
+        if not self.picking_outdated and self.picking_region is not None:
+            region_x, region_y, region_width, region_height = self.picking_region
 
-        GL.glEnd()
-        GL.glLineWidth(1.0)
+            if region_x <= x < region_x + region_width and region_y <= y < region_y + region_height:
+                return
+
+        half_size: int = Canvas.picking_region_size // 2
+        region: Tuple[int, int, int, int] = (x - half_size, y - half_size, Canvas.picking_region_size, Canvas.picking_region_size)
+
+        self.tkMakeCurrent()
+
+        if frame_statistics.enabled:
+            frame_statistics.pass_name = PICKING_PASS
+
+        started: int = perf_counter_ns() if frame_profiler.enabled else 0
+        self.__draw_offscreen(region)
+
+        if frame_profiler.enabled:
+            frame_profiler.record('picking pass', CANVAS_CATEGORY, started)
+
+        if frame_statistics.enabled:
+            frame_statistics.pass_name = ONSCREEN_PASS
+
+        self.picking_region = region
+        self.picking_outdated = False
+
+    def pick_shape(self, x: int, y: int) -> Optional[Shape]:
+        """
+        Returns the shape drawn at the coordinate using the picking_mode
+
+        Arguments:
+            x (int): The x-coordinate of the pixel to be picked.
+            y (int): The y-coordinate of the pixel to be picked, starting from the bottom.
+        """
+        # moves waiting for the end of the frame are applied to the bounding boxes first
+        event_bus.flush()
+
+        if Canvas.picking_mode == 'cpu':
+            return self.raycast_shape(x, y)
+
+        return self.read_picked_shape(x, y)
+
+    def raycast_shape(self, x: int, y: int) -> Optional[Shape]:
+        """
+        Returns the nearest shape under the coordinate by casting a ray from the camera,
+        nothing is rendered or read back from the GPU
+
+        Arguments:
+            x (int): The x-coordinate of the pixel to be picked.
+            y (int): The y-coordinate of the pixel to be picked, starting from the bottom.
+        """
+        projection, view = self.camera_matrices()
+        origin, direction = unproject(x, y, self.width, self.height, projection, view)
+        return self.bounding_volumes.raycast(origin, direction)
 
-    def __draw_offscreen(self) -> None:
+    def camera_matrices(self) -> Tuple[MATRIX, MATRIX]:
+        """
+        Returns the projection matrix and camera transform both passes load before drawing the shapes
+        """
+        projection: MATRIX = perspective_matrix(FIELD_OF_VIEW, (Canvas.width / Canvas.height), 1, self.render_distance)
+        view: MATRIX = view_matrix(self.camera_x, self.camera_y, self.camera_translation, Canvas.camera_sensitivity)
+
+        return projection, view
+
+    def read_picked_shape(self, x: int, y: int) -> Optional[Shape]:
+        """
+        Returns the shape drawn at the coordinate by decoding the id from the picking pass
+
+        Arguments:
+            x (int): The x-coordinate of the pixel to be picked.
+            y (int): The y-coordinate of the pixel to be picked, starting from the bottom.
+        """
+        # Renders the shapes around the mouse if they changed since the last pick
+        self.draw_picking_pass(x, y)
+
+        # Read color of the pixel at the mouse coordinates from the offscreen framebuffer
+        GL.glBindFramebuffer(GL.GL_FRAMEBUFFER, self.offscreen_framebuffer_id)
+        GL.glReadBuffer(GL.GL_COLOR_ATTACHMENT0)
+        GL.glPixelStorei(GL.GL_PACK_ALIGNMENT, 1)
+
+        pixel: bytearray = bytearray(GL.glReadPixels(x, y, 1, 1, GL.GL_RGB, GL.GL_UNSIGNED_BYTE))
+
+        # Unbind the offscreen framebuffer
+        GL.glBindFramebuffer(GL.GL_FRAMEBUFFER, 0)
+
+        return self.shapes_by_id.get(rgb_to_id(pixel[:3]), None)
+
+    def __draw_offscreen(self, region: Tuple[int, int, int, int]) -> None:
         """
         Performs offscreen drawing operations for color picking purposes
+
+        Arguments:
+            region (Tuple[int, int, int, int]): The x, y, width and height of the area to be rendered.
         """
         # Bind the offscreen framebuffer
         GL.glBindFramebuffer(GL.GL_FRAMEBUFFER, self.offscreen_framebuffer_id)
 
+        # Only the pixels around the mouse are cleared and rendered
+        GL.glEnable(GL.GL_SCISSOR_TEST)
+        GL.glScissor(*region)
+
+        # The background clears to id 0 and nothing may alter the encoded ids
+        GL.glPushAttrib(GL.GL_COLOR_BUFFER_BIT | GL.GL_ENABLE_BIT)
+        GL.glClearColor(0.0, 0.0, 0.0, 1.0)
+        GL.glDisable(GL.GL_BLEND)
+        GL.glDisable(GL.GL_DITHER)
+
         GL.glClear(GL.GL_COLOR_BUFFER_BIT)
         GL.glClear(GL.GL_DEPTH_BUFFER_BIT)
 
         GL.glMatrixMode(GL.GL_PROJECTION)
         GL.glLoadIdentity()
-        GLU.gluPerspective(45, (Canvas.width / Canvas.height), 1, self.render_distance)
+        GLU.gluPerspective(FIELD_OF_VIEW, (Canvas.width / Canvas.height), 1, self.render_distance)
 
         GL.glMatrixMode(GL.GL_MODELVIEW)
         GL.glLoadIdentity()
@@ -284,9 +704,10 @@ class Canvas(pyopengltk.OpenGLFrame, Observer):
         # camera movement
         GL.glTranslatef(*self.camera_translation)
 
-        if len(self.shapes) > 0:
-            for shape in self.shapes:
-                shape.draw_to_canvas(True)
+        self.__draw_shapes(offscreen=True)
+
+        GL.glPopAttrib()
+        GL.glDisable(GL.GL_SCISSOR_TEST)
 
         # Unbind the offscreen framebuffer
         GL.glBindFramebuffer(GL.GL_FRAMEBUFFER, 0)
@@ -300,7 +721,7 @@ class Canvas(pyopengltk.OpenGLFrame, Observer):
 
         GL.glMatrixMode(GL.GL_PROJECTION)
         GL.glLoadIdentity()
-        GLU.gluPerspective(45, (Canvas.width / Canvas.height), 1, self.render_distance)
+        GLU.gluPerspective(FIELD_OF_VIEW, (Canvas.width / Canvas.height), 1, self.render_distance)
 
         GL.glMatrixMode(GL.GL_MODELVIEW)
         GL.glLoadIdentity()
@@ -311,12 +732,178 @@ class Canvas(pyopengltk.OpenGLFrame, Observer):
         # camera movement
         GL.glTranslatef(*self.camera_translation)
 
+        if frame_statistics.enabled:
+            frame_statistics.source = GRID_SOURCE
+
+        started: int = perf_counter_ns() if frame_profiler.enabled else 0
         self.__draw_grid()
 
-        if len(self.shapes) > 0:
-            for shape in self.shapes:
-                shape.draw_to_canvas()
+        if frame_profiler.enabled:
+            frame_profiler.record('grid', CANVAS_CATEGORY, started)
+
+        if frame_statistics.enabled:
+            frame_statistics.source = CANVAS_SOURCE
+
+        self.__draw_shapes()
+
+    def __draw_shapes(self, offscreen: bool = False) -> None:
+        """
+        Draws the batched shapes with a few draw calls, then every other shape inside the view frustum on its own
+
+        Arguments:
+            offscreen (bool): If the shapes are drawn for the picking pass.
+        """
+        if not Canvas.static_batching:
+            self.static_batch.clear()
+
+        projection, view = self.camera_matrices()
+        draw_shapes(self.shapes, projection, view, self.height, self.static_batch if Canvas.static_batching else None, offscreen)
 
     def redraw(self) -> None:
-        self.__draw_offscreen()
-        self.__draw_onscreen()
\ No newline at end of file
+        """
+        Renders a frame, called by pyopengltk. The picking pass is rendered on click by draw_picking_pass.
+        """
+        profiling: bool = frame_profiler.enabled
+
+        if profiling:
+            frame_profiler.begin_frame()
+
+        started: int = perf_counter_ns() if profiling else 0
+        texture_cache.upload_decoded()
+
+        if profiling:
+            frame_profiler.record('texture upload', CANVAS_CATEGORY, started)
+
+        self.__draw_onscreen()
+
+        # changes made while drawing (like the rotation of a shape that follows the mouse) are already in this frame
+        self.scene_dirty = False
+        self.__watch_texture_decoding()
+        self.__watch_settling_shapes()
+
+        if profiling:
+            frame_profiler.end_frame()
+
+        if frame_statistics.enabled:
+            frame_statistics.end_frame()
+
+        if frame_statistics.enabled or self.show_frame_percentiles:
+            self.__update_hud()
+
+    def toggle_frame_statistics(self) -> None:
+        """
+        Starts or stops counting the OpenGL calls of every frame and shows or hides them over the canvas.
+        A picking pass is counted with the frame drawn after it.
+        """
+        if frame_statistics.enabled:
+            frame_statistics.disable()
+        else:
+            frame_statistics.enable()
+
+        self.__update_hud()
+        self.mark_dirty(affects_picking=False)
+
+    def toggle_frame_profiler(self) -> None:
+        """
+        Starts or stops timing the phases of every frame, a picking pass is timed with the frame drawn after it
+        """
+        if frame_profiler.enabled:
+            frame_profiler.disable()
+            self.show_frame_percentiles = False
+            self.__update_hud()
+
+            CTkToast.toast('Stopped profiling frames')
+            return
+
+        frame_profiler.enable()
+        CTkToast.toast('Profiling frames')
+
+    def toggle_frame_percentiles(self) -> None:
+        """
+        Shows or hides the p50, p95 and p99 of every frame phase over the canvas, profiling the frames if they were not
+        """
+        self.show_frame_percentiles = not self.show_frame_percentiles
+
+        if self.show_frame_percentiles and not frame_profiler.enabled:
+            frame_profiler.enable()
+
+        self.__update_hud()
+
+    def dump_frame_profile(self) -> None:
+        """
+        Saves the last profiled frames as a Chrome trace event file in the PROFILE_DIRECTORY
+        """
+        if len(frame_profiler.frames) <= 0:
+            CTkToast.toast('No profiled frames, press F4 to start profiling')
+            return
+
+        file_path: str = path.join(PROFILE_DIRECTORY, f'frames-{datetime.now():%Y%m%d-%H%M%S}.json')
+
+        try:
+            frame_count: int = frame_profiler.dump_chrome_trace(file_path, Canvas.profile_dump_frames)
+        except OSError as error:
+            CTkToast.toast(f'Could not save the profile: {error}')
+            return
+
+        CTkToast.toast(f'Saved {frame_count} frames to {file_path}')
+
+    def __update_hud(self) -> None:
+        """
+        Shows the reports that are turned on over the canvas, hides the HUD if none are
+        """
+        reports: List[str] = []
+
+        if frame_statistics.enabled:
+            reports.append(frame_statistics.report())
+
+        if self.show_frame_percentiles:
+            reports.append(frame_profiler.report())
+
+        if len(reports) <= 0:
+            self.hud.place_forget()
+            return
+
+        hud_x, hud_y = self.hud_position
+
+        self.hud.configure(text='\n\n'.join(reports))
+        self.hud.place(x=hud_x, y=hud_y)
+        self.hud.lift()
+
+    def __watch_texture_decoding(self) -> None:
+        """
+        Checks back on the textures that are still decoding, shapes use their background color until then
+        """
+        if self.texture_poll_scheduled or not texture_cache.is_decoding():
+            return
+
+        self.texture_poll_scheduled = True
+        self.after(Canvas.texture_poll_interval, self.__poll_texture_decoding)
+
+    def __poll_texture_decoding(self) -> None:
+        """
+        Renders a frame to upload the decoded textures, or keeps waiting for them
+        """
+        self.texture_poll_scheduled = False
+
+        if texture_cache.has_decoded():
+            self.mark_dirty(affects_picking=False)
+            return
+
+        self.__watch_texture_decoding()
+
+    def __watch_settling_shapes(self) -> None:
+        """
+        Renders a frame once the shapes held out of the static batch could have stopped moving
+        """
+        if self.settle_poll_scheduled or not self.static_batch.is_settling():
+            return
+
+        self.settle_poll_scheduled = True
+        self.after(int(StaticBatch.settle_interval * 1000), self.__poll_settling_shapes)
+
+    def __poll_settling_shapes(self) -> None:
+        """
+        Renders a frame that bakes the shapes that stopped moving
+        """
+        self.settle_poll_scheduled = False
+        self.mark_dirty(affects_picking=False)
\ No newline at end of file
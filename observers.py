@@ -18,6 +18,9 @@ class Observable:
         Arguments:
             observer (Observer): The observer to subscribe.
         """
+        if observer in self._observers:
+            return
+
         self._observers.append(observer)
 
     def notify_observers(self, message, *args: Any, **kwargs: Any) -> None:
@@ -48,8 +48,8 @@ class PropertyGroup(CTkFrame):
         self.selected_shape: Callable[[], Optional[Shape]] = lambda: self.properties.app.canvas.selected_shape()
 
         if title == 'Background color':
-            value_setter = ColorPickerToggle(self, rgb_to_hex(self.initial_value), self.selected_shape, width=30)
-            value_setter.grid(row=0, column=1, sticky="w")
+            self.value_setter = ColorPickerToggle(self, rgb_to_hex(self.initial_value), self.selected_shape, width=30)
+            self.value_setter.grid(row=0, column=1, sticky="w")
             return
 
         elif 'path' in title.lower():
@@ -61,6 +61,34 @@ class PropertyGroup(CTkFrame):
         else:
             self.value_setter = self.__generate_entry_setter_group()
 
+    def show_value(self, value: Any) -> None:
+        """
+        Shows the value of a newly selected shape, the widgets are kept and only what they show changes.
+        Text typed into the entry for the previous shape is removed.
+
+        Arguments:
+            value (Any): The value of the property of the selected shape.
+        """
+        self.initial_value = value
+
+        if self.value_setter is None:
+            return
+
+        setter_type: Type[CTkButton]|Type[CTkEntry]|Type[CTkSwitch]|Type[ColorPickerToggle] = type(self.value_setter)
+
+        if setter_type == ColorPickerToggle:
+            self.value_setter.configure(fg_color=rgb_to_hex(value) if value else "white")
+
+        elif setter_type == CTkSwitch:
+            self.value_setter.select() if value == True else self.value_setter.deselect()
+
+        elif setter_type == CTkEntry:
+            self.value_setter.delete(0, 'end')
+            self.value_setter.configure(placeholder_text="{:.2f}".format(value) if type(value) == float else value)
+
+        elif setter_type == CTkButton:
+            self.update_setter_value(value)
+
     def update_setter_value(self, new_value: Any) -> None:
         """
         Updates the value of the setter
@@ -1,9 +1,10 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any, Callable, Dict, Optional
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Type
 
 if TYPE_CHECKING:
     from frame.three_dimensional.canvas import Canvas
+    from geometry.three_dimensional.shape import Shape
     from Program import App
 
 from utilities.class_methods import get_instance_properties
@@ -19,9 +20,14 @@ class Properties(CTkFrame, Observer):
 
     Attributes:
         _instance (Optional[Properties]): The singleton instance of self.
-        groups (Dict[str, PropertyGroup]): A dictionary of property groups.
+        groups (Dict[str, PropertyGroup]): The property groups of the shown shape class.
+        templates (Dict[Type[Shape], Dict[str, PropertyGroup]]): The property groups of every shape class shown so far,
+            selecting a shape shows the groups of its class with the values of the shape instead of creating them again.
         active_entry_widget (Optional[CTkEntry]): The currently active entry widget.
         hidden (bool): A boolean indicating whether the properties frame is hidden.
+        shape_instance (Optional[Shape]): The shape whose properties are shown.
+        pending_values (Dict[str, Any]): The latest value of every property waiting to be shown, by property name.
+        refresh_scheduled (bool): If the pending values will be shown once Tk is idle.
         default_x (int): The default x-coordinate position of the properties frame.
         default_y (int): The default y-coordinate position of the properties frame.
     """
@@ -40,9 +46,16 @@ class Properties(CTkFrame, Observer):
         self.grid_columnconfigure(0, minsize=150)
 
         self.groups: Dict[str, PropertyGroup] = {}
+        self.templates: Dict[Type[Shape], Dict[str, PropertyGroup]] = {}
         self.active_entry_widget: Optional[CTkEntry] = None
 
         self.hidden: bool = True
+        self.shape_instance: Optional[Shape] = None
+
+        # Values set every frame by a drag or a held key are shown once per frame, the latest one
+        self.pending_values: Dict[str, Any] = {}
+        self.refresh_scheduled: bool = False
+
         self.default_x: int = x_coordinate
         self.default_y: int = y_coordinate
 
@@ -50,11 +63,14 @@ class Properties(CTkFrame, Observer):
 
     def clear(self) -> None:
         """
-        Clears the Properties tab and hides it
+        Hides the Properties tab, its groups are kept for the next selected shape
         """
-        for child_widget in self.winfo_children():
-            child_widget.destroy()
+        for property_group_instance in self.groups.values():
+            property_group_instance.grid_remove()
 
+        self.groups = {}
+        self.pending_values.clear()
+        self.shape_instance = None
         self.hide()
 
     def check_active_entry(self, event) -> None:
@@ -81,11 +97,50 @@ class Properties(CTkFrame, Observer):
         """
         self.place(x=self.default_x, y=self.default_y)
 
-    def create_shape_properties_tab(self, shape_instance):
+    def create_shape_properties_tab(self, shape_instance: Shape) -> None:
+        """
+        Shows the property groups of the class of the shape with the values of the shape,
+        the groups of a class are only created the first time one of its shapes is selected
+
+        Arguments:
+            shape_instance (Shape): The selected shape.
+        """
+        shape_class: Type[Shape] = shape_instance.__class__
+        groups: Optional[Dict[str, PropertyGroup]] = self.templates.get(shape_class, None)
+
+        if groups is None:
+            groups = self.templates[shape_class] = self.__create_template(shape_instance)
+
+        if groups is not self.groups:
+            for property_group_instance in self.groups.values():
+                property_group_instance.grid_remove()
+
+            for property_group_instance in groups.values():
+                property_group_instance.grid()
+
+            self.groups = groups
+
+        self.shape_instance = shape_instance
+        self.pending_values.clear()
+
+        # showing the frame shows the values of the shape
+        if self.hidden:
+            self.show()
+        else:
+            self.__show_shape_values()
+
+    def __create_template(self, shape_instance: Shape) -> Dict[str, PropertyGroup]:
         """
-        Creates several buttons using the shapes property data
+        Creates the property groups of the class of the shape, hidden until the template is shown
+
+        Arguments:
+            shape_instance (Shape): The first selected shape of its class.
+
+        Returns:
+            The property groups by property name
         """
         shape_data = get_instance_properties(shape_instance.__class__)
+        groups: Dict[str, PropertyGroup] = {}
 
         for index, (field_name, field_data) in enumerate(shape_data.items()):
             title: str = field_name.capitalize().replace('_', ' ')
@@ -93,12 +148,23 @@ class Properties(CTkFrame, Observer):
             setter: Callable = field_data.get("setter")
 
             initial_value: bool|str = getter(shape_instance)
-            self.groups[field_name] = PropertyGroup(self, title, initial_value, setter, getter)
+            groups[field_name] = PropertyGroup(self, title, initial_value, setter, getter)
 
             padding_y: Tuple[int, int]|Literal[0] = BOTTOM_PADDING_ONLY if index != len(shape_data) - 1 else 0
-            self.groups[field_name].grid(row=index, column=0, sticky="nsew", pady=padding_y)
+            groups[field_name].grid(row=index, column=0, sticky="nsew", pady=padding_y)
+            groups[field_name].grid_remove()
+
+        return groups
 
-        self.show()
+    def __show_shape_values(self) -> None:
+        """
+        Shows the current values of the shown shape in its property groups
+        """
+        if self.shape_instance is None:
+            return
+
+        for property_group_instance in self.groups.values():
+            property_group_instance.show_value(property_group_instance.property_getter(self.shape_instance))
 
     def hide(self) -> None:
         """
@@ -113,17 +179,44 @@ class Properties(CTkFrame, Observer):
 
     def update_group_value(self, shape_method_name: str, new_value: Any) -> None:
         """
-        Updates the value of a property with the current value of the setter
+        Queues the new value of a property, the queued values are shown once Tk is idle and only the latest value
+        of each property is shown. Nothing is queued while the frame is hidden, showing it reads the values again.
         This allows the value of the properties to update its value whenever a different method is used for updating the shape.
 
         ex: Moving a shape by arrow keys also updates its x, y, z values in the properties tab.
+
+        Arguments:
+            shape_method_name (str): The name of the property.
+            new_value (Any): The value to be shown.
+        """
+        if self.hidden or shape_method_name not in self.groups:
+            return
+
+        self.pending_values[shape_method_name] = new_value
+
+        if self.refresh_scheduled:
+            return
+
+        self.refresh_scheduled = True
+        self.after_idle(self.__show_pending_values)
+
+    def __show_pending_values(self) -> None:
+        """
+        Shows the latest queued value of every property
         """
-        property_group_instance: Optional[PropertyGroup] = self.groups.get(shape_method_name, None)
+        self.refresh_scheduled = False
 
-        if property_group_instance is None:
+        pending_values: Dict[str, Any] = self.pending_values
+        self.pending_values = {}
+
+        if self.hidden:
             return
 
-        property_group_instance.update_setter_value(new_value)
+        for shape_method_name, new_value in pending_values.items():
+            property_group_instance: Optional[PropertyGroup] = self.groups.get(shape_method_name, None)
+
+            if property_group_instance is not None:
+                property_group_instance.update_setter_value(new_value)
 
     def show(self) -> None:
         """
@@ -135,6 +228,9 @@ class Properties(CTkFrame, Observer):
         self.hidden = False
         self.place_default()
 
+        # the values that changed while it was hidden were skipped
+        self.__show_shape_values()
+
     def toggle(self):
         """
         Toggles the visibility of the Properties frame.
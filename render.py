@@ -0,0 +1,405 @@
+"""
+Renders scene files to PNG images without a window, through an EGL or OSMesa context.
+
+    python -m render scene.shapes other.shapes --width 1920 --height 1080 --output-directory renders
+
+Every scene is rendered by a process of a pool, each process keeps its own context
+and draws into a framebuffer of the requested size.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from argparse import ArgumentParser, BooleanOptionalAction, Namespace
+from typing import TYPE_CHECKING, Any, Dict, Sequence
+from custom_types import *
+from constants import *
+from time import perf_counter
+from os import path
+
+import ctypes
+import sys
+import os
+
+if TYPE_CHECKING:
+    from geometry.three_dimensional.static_batch import StaticBatch
+    from geometry.three_dimensional.shape import Shape
+
+PLATFORMS: Tuple[str, ...] = ('egl', 'osmesa')
+
+# The context of the worker process, kept alive until the process exits
+worker_context: Optional[Any] = None
+
+class RenderSettings:
+    """
+    The image size and camera every scene of a render is drawn with
+    """
+
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        camera_rotation: Tuple[float, float] = CAMERA_ROTATION,
+        camera_translation: Tuple[float, float, float] = CAMERA_TRANSLATION,
+        render_distance: int = 1000,
+        show_grid: bool = True
+    ) -> None:
+        """
+        Initializes the settings
+
+        Arguments:
+            width (int): The width of the image in pixels.
+            height (int): The height of the image in pixels.
+            camera_rotation (Tuple[float, float]): The camera_x and camera_y of the Canvas. Defaults to CAMERA_ROTATION
+            camera_translation (Tuple[float, float, float]): The x, y, z translation of the camera. Defaults to CAMERA_TRANSLATION
+            render_distance (int): The distance to the far clipping plane. Defaults to 1000
+            show_grid (bool): If the grid lines are drawn under the shapes. Defaults to True
+        """
+        self.width: int = width
+        self.height: int = height
+        self.camera_rotation: Tuple[float, float] = camera_rotation
+        self.camera_translation: Tuple[float, float, float] = camera_translation
+        self.render_distance: int = render_distance
+        self.show_grid: bool = show_grid
+
+def create_egl_context() -> Any:
+    """
+    Creates an EGL context with a 1x1 pbuffer, the scenes are drawn into framebuffers instead
+    """
+    from OpenGL import EGL
+
+    display = EGL.eglGetDisplay(EGL.EGL_DEFAULT_DISPLAY)
+    major, minor = EGL.EGLint(), EGL.EGLint()
+
+    if not EGL.eglInitialize(display, ctypes.pointer(major), ctypes.pointer(minor)):
+        raise RuntimeError('Could not initialize the EGL display')
+
+    attributes = (EGL.EGLint * 13)(
+        EGL.EGL_SURFACE_TYPE, EGL.EGL_PBUFFER_BIT,
+        EGL.EGL_RED_SIZE, 8,
+        EGL.EGL_GREEN_SIZE, 8,
+        EGL.EGL_BLUE_SIZE, 8,
+        EGL.EGL_DEPTH_SIZE, 24,
+        EGL.EGL_RENDERABLE_TYPE, EGL.EGL_OPENGL_BIT,
+        EGL.EGL_NONE
+    )
+
+    config = EGL.EGLConfig()
+    config_count = EGL.EGLint()
+
+    if not EGL.eglChooseConfig(display, attributes, ctypes.pointer(config), 1, ctypes.pointer(config_count)) or config_count.value <= 0:
+        raise RuntimeError('No EGL configuration can render OpenGL')
+
+    surface = EGL.eglCreatePbufferSurface(display, config, (EGL.EGLint * 5)(EGL.EGL_WIDTH, 1, EGL.EGL_HEIGHT, 1, EGL.EGL_NONE))
+
+    # the shapes draw with the compatibility profile, not OpenGL ES
+    EGL.eglBindAPI(EGL.EGL_OPENGL_API)
+    context = EGL.eglCreateContext(display, config, EGL.EGL_NO_CONTEXT, None)
+
+    if not EGL.eglMakeCurrent(display, surface, surface, context):
+        raise RuntimeError('Could not make the EGL context current')
+
+    return (display, surface, context)
+
+def create_osmesa_context() -> Any:
+    """
+    Creates a software OSMesa context with a 1x1 buffer, the scenes are drawn into framebuffers instead
+    """
+    from OpenGL import arrays, osmesa
+    import OpenGL.GL as GL
+
+    context = osmesa.OSMesaCreateContextExt(osmesa.OSMESA_RGBA, 24, 0, 0, None)
+
+    if not context:
+        raise RuntimeError('Could not create the OSMesa context')
+
+    buffer = arrays.GLubyteArray.zeros((1, 1, 4))
+
+    if not osmesa.OSMesaMakeCurrent(context, buffer, GL.GL_UNSIGNED_BYTE, 1, 1):
+        raise RuntimeError('Could not make the OSMesa context current')
+
+    # OSMesa draws into the buffer, it has to outlive the context
+    return (context, buffer)
+
+def initialize_worker(platform: str) -> None:
+    """
+    Creates the context of a worker process, runs once before the process renders its first scene
+
+    Arguments:
+        platform (str): 'egl' or 'osmesa'.
+    """
+    global worker_context
+
+    worker_context = create_osmesa_context() if platform == 'osmesa' else create_egl_context()
+
+    import OpenGL.GL as GL
+    from geometry.three_dimensional.texture_cache import texture_cache
+
+    # there is no window to toast on
+    texture_cache.report_error = lambda message: print(message, file=sys.stderr)
+
+    GL.glClearColor(0.17, 0.17, 0.17, 1.0)
+    GL.glEnable(GL.GL_DEPTH_TEST)
+
+    GL.glEnable(GL.GL_BLEND)
+    GL.glBlendFunc(GL.GL_SRC_ALPHA, GL.GL_ONE_MINUS_SRC_ALPHA)
+
+def create_framebuffer(width: int, height: int) -> Tuple[int, int, int]:
+    """
+    Creates and binds a framebuffer with a color and a depth buffer of the size of the image
+
+    Arguments:
+        width (int): The width of the image in pixels.
+        height (int): The height of the image in pixels.
+
+    Returns:
+        The ids of the framebuffer, its color buffer and its depth buffer
+    """
+    import OpenGL.GL as GL
+
+    framebuffer_id: int = GL.glGenFramebuffers(1)
+    color_buffer_id: int = GL.glGenRenderbuffers(1)
+    depth_buffer_id: int = GL.glGenRenderbuffers(1)
+
+    GL.glBindFramebuffer(GL.GL_FRAMEBUFFER, framebuffer_id)
+
+    GL.glBindRenderbuffer(GL.GL_RENDERBUFFER, color_buffer_id)
+    GL.glRenderbufferStorage(GL.GL_RENDERBUFFER, GL.GL_RGBA8, width, height)
+    GL.glFramebufferRenderbuffer(GL.GL_FRAMEBUFFER, GL.GL_COLOR_ATTACHMENT0, GL.GL_RENDERBUFFER, color_buffer_id)
+
+    GL.glBindRenderbuffer(GL.GL_RENDERBUFFER, depth_buffer_id)
+    GL.glRenderbufferStorage(GL.GL_RENDERBUFFER, GL.GL_DEPTH_COMPONENT24, width, height)
+    GL.glFramebufferRenderbuffer(GL.GL_FRAMEBUFFER, GL.GL_DEPTH_ATTACHMENT, GL.GL_RENDERBUFFER, depth_buffer_id)
+    GL.glBindRenderbuffer(GL.GL_RENDERBUFFER, 0)
+
+    if GL.glCheckFramebufferStatus(GL.GL_FRAMEBUFFER) != GL.GL_FRAMEBUFFER_COMPLETE:
+        delete_framebuffer((framebuffer_id, color_buffer_id, depth_buffer_id))
+        raise RuntimeError(f'Could not create a {width}x{height} framebuffer')
+
+    GL.glDrawBuffer(GL.GL_COLOR_ATTACHMENT0)
+    GL.glReadBuffer(GL.GL_COLOR_ATTACHMENT0)
+
+    return framebuffer_id, color_buffer_id, depth_buffer_id
+
+def delete_framebuffer(framebuffer: Tuple[int, int, int]) -> None:
+    """
+    Unbinds and frees a framebuffer created by create_framebuffer
+
+    Arguments:
+        framebuffer (Tuple[int, int, int]): The ids of the framebuffer, its color buffer and its depth buffer.
+    """
+    import OpenGL.GL as GL
+
+    framebuffer_id, color_buffer_id, depth_buffer_id = framebuffer
+
+    GL.glBindFramebuffer(GL.GL_FRAMEBUFFER, 0)
+    GL.glDeleteRenderbuffers(2, [color_buffer_id, depth_buffer_id])
+    GL.glDeleteFramebuffers(1, [framebuffer_id])
+
+def draw_scene(shapes: List[Shape], settings: RenderSettings, static_batch: Optional[StaticBatch] = None) -> None:
+    """
+    Draws the shapes with the draw_shapes of Canvas.redraw, batched shapes with a few calls and the rest inside the view frustum on their own
+
+    Arguments:
+        shapes (List[Shape]): The shapes of the scene.
+        settings (RenderSettings): The image size and camera.
+        static_batch (Optional[StaticBatch]): The batch kept between frames, only baked again when its shapes change. Defaults to a batch freed after drawing
+    """
+    from geometry.three_dimensional.projection import perspective_matrix, view_matrix
+    from geometry.three_dimensional.scene_drawing import draw_shapes
+    from geometry.three_dimensional.static_batch import StaticBatch
+    from geometry.three_dimensional.vertex_buffer import VertexBuffer
+    from geometry.three_dimensional.grid import grid_lines
+
+    import OpenGL.GLU as GLU
+    import OpenGL.GL as GL
+
+    camera_x, camera_y = settings.camera_rotation
+    aspect: float = settings.width / settings.height
+
+    GL.glViewport(0, 0, settings.width, settings.height)
+    GL.glClear(GL.GL_COLOR_BUFFER_BIT | GL.GL_DEPTH_BUFFER_BIT)
+
+    GL.glMatrixMode(GL.GL_PROJECTION)
+    GL.glLoadIdentity()
+    GLU.gluPerspective(FIELD_OF_VIEW, aspect, 1, settings.render_distance)
+
+    GL.glMatrixMode(GL.GL_MODELVIEW)
+    GL.glLoadIdentity()
+
+    GL.glRotatef(camera_y * CAMERA_SENSITIVITY, 1, 0, 0)
+    GL.glRotatef(camera_x * CAMERA_SENSITIVITY, 0, 0, 1)
+    GL.glTranslatef(*settings.camera_translation)
+
+    if settings.show_grid:
+        grid_buffer: VertexBuffer = VertexBuffer()
+        vertices, colors = grid_lines(200, 0.05)
+        grid_buffer.upload(vertices, colors=colors)
+
+        GL.glLineWidth(0.5)
+        grid_buffer.draw(GL.GL_LINES)
+        GL.glLineWidth(1.0)
+
+        grid_buffer.delete()
+
+    if len(shapes) <= 0:
+        return
+
+    projection = perspective_matrix(FIELD_OF_VIEW, aspect, 1, settings.render_distance)
+    view = view_matrix(camera_x, camera_y, settings.camera_translation, CAMERA_SENSITIVITY)
+
+    frame_batch: StaticBatch = StaticBatch() if static_batch is None else static_batch
+    draw_shapes(shapes, projection, view, settings.height, frame_batch)
+
+    if static_batch is None:
+        frame_batch.clear()
+
+def render_scene(scene_path: str, output_path: str, settings: RenderSettings) -> Tuple[int, float]:
+    """
+    Loads a scene file and saves it as a PNG image, runs in a worker process
+
+    Arguments:
+        scene_path (str): The path of the scene file.
+        output_path (str): Where the image is saved.
+        settings (RenderSettings): The image size and camera.
+
+    Returns:
+        The number of shapes and the seconds it took to render the scene
+    """
+    from geometry.three_dimensional.geometry_cache import geometry_cache
+    from geometry.three_dimensional.texture_cache import texture_cache
+    from geometry.three_dimensional.scene_file import load_scene
+    from numpy import frombuffer, uint8
+    from PIL import Image
+
+    import OpenGL.GL as GL
+
+    start: float = perf_counter()
+    shapes: List[Shape] = load_scene(scene_path)
+
+    # a window shows the background color until the texture is ready, an image only has one frame
+    texture_cache.wait_for_decoding()
+
+    framebuffer: Tuple[int, int, int] = create_framebuffer(settings.width, settings.height)
+
+    try:
+        draw_scene(shapes, settings)
+
+        GL.glPixelStorei(GL.GL_PACK_ALIGNMENT, 1)
+        pixels = GL.glReadPixels(0, 0, settings.width, settings.height, GL.GL_RGBA, GL.GL_UNSIGNED_BYTE)
+    finally:
+        delete_framebuffer(framebuffer)
+
+        for shape in shapes:
+            shape.delete()
+
+        geometry_cache.clear()
+        texture_cache.clear()
+
+    # OpenGL rows start from the bottom
+    image = frombuffer(pixels, dtype=uint8).reshape(settings.height, settings.width, 4)[::-1]
+
+    output_directory: str = path.dirname(output_path)
+
+    if output_directory:
+        os.makedirs(output_directory, exist_ok=True)
+
+    Image.fromarray(image[:, :, :3], 'RGB').save(output_path)
+
+    return len(shapes), perf_counter() - start
+
+def output_path_of(scene_path: str, output_directory: str) -> str:
+    """
+    Returns where the image of a scene is saved, the name of the scene file with a .png extension
+
+    Arguments:
+        scene_path (str): The path of the scene file.
+        output_directory (str): The directory of the images.
+    """
+    name, _ = path.splitext(path.basename(scene_path))
+    return path.join(output_directory, f'{name}.png')
+
+def parse_arguments(arguments: Optional[Sequence[str]] = None) -> Namespace:
+    """
+    Parses the command line
+
+    Arguments:
+        arguments (Optional[Sequence[str]]): The arguments, None to read sys.argv.
+    """
+    parser = ArgumentParser(prog='python -m render', description='Renders scene files to PNG images without a window.')
+
+    parser.add_argument('scenes', nargs='+', help=f'the {SCENE_FILE_EXTENSION} files to render')
+    parser.add_argument('--output-directory', default='.', help='where the images are saved, named after the scene files')
+    parser.add_argument('--width', type=int, default=1270, help='the width of the images in pixels')
+    parser.add_argument('--height', type=int, default=685, help='the height of the images in pixels')
+    parser.add_argument('--camera-rotation', type=float, nargs=2, default=CAMERA_ROTATION, metavar=('X', 'Y'), help='the camera rotation, like dragging the canvas')
+    parser.add_argument('--camera-translation', type=float, nargs=3, default=CAMERA_TRANSLATION, metavar=('X', 'Y', 'Z'), help='the camera position, the last value zooms')
+    parser.add_argument('--render-distance', type=int, default=1000, help='the distance to the far clipping plane')
+    parser.add_argument('--grid', action=BooleanOptionalAction, default=True, help='draw the grid lines under the shapes')
+    parser.add_argument('--platform', choices=PLATFORMS, default='egl', help='the headless OpenGL platform, osmesa needs no GPU')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='the number of scenes rendered at the same time')
+
+    parsed_arguments: Namespace = parser.parse_args(arguments)
+
+    if parsed_arguments.width <= 0 or parsed_arguments.height <= 0:
+        parser.error('the width and height must be positive')
+
+    if parsed_arguments.workers is None or parsed_arguments.workers <= 0:
+        parsed_arguments.workers = 1
+
+    return parsed_arguments
+
+def main(arguments: Optional[Sequence[str]] = None) -> int:
+    """
+    Renders every scene of the command line on a process pool
+
+    Arguments:
+        arguments (Optional[Sequence[str]]): The arguments, None to read sys.argv.
+
+    Returns:
+        The exit code, 1 if any scene could not be rendered
+    """
+    parsed_arguments: Namespace = parse_arguments(arguments)
+
+    # PyOpenGL picks the platform when it is first imported, the workers inherit it
+    os.environ['PYOPENGL_PLATFORM'] = parsed_arguments.platform
+
+    # without a display Mesa only finds an EGL device through the surfaceless platform
+    if parsed_arguments.platform == 'egl' and not os.environ.get('DISPLAY'):
+        os.environ.setdefault('EGL_PLATFORM', 'surfaceless')
+
+    settings: RenderSettings = RenderSettings(
+        parsed_arguments.width,
+        parsed_arguments.height,
+        tuple(parsed_arguments.camera_rotation),
+        tuple(parsed_arguments.camera_translation),
+        parsed_arguments.render_distance,
+        parsed_arguments.grid
+    )
+
+    worker_count: int = min(parsed_arguments.workers, len(parsed_arguments.scenes))
+    failed: bool = False
+
+    with ProcessPoolExecutor(max_workers=worker_count, initializer=initialize_worker, initargs=(parsed_arguments.platform,)) as pool:
+        renders: Dict[Future, Tuple[str, str]] = {}
+
+        for scene_path in parsed_arguments.scenes:
+            output_path: str = output_path_of(scene_path, parsed_arguments.output_directory)
+            renders[pool.submit(render_scene, scene_path, output_path, settings)] = (scene_path, output_path)
+
+        for render in as_completed(renders):
+            scene_path, output_path = renders[render]
+
+            try:
+                shape_count, seconds = render.result()
+            except Exception as error:
+                print(f'{scene_path}: {error}', file=sys.stderr)
+                failed = True
+                continue
+
+            print(f'{scene_path} -> {output_path} ({shape_count} shapes, {seconds:.2f}s)')
+
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,5 +1,6 @@
 from tkinter import filedialog, Tk
 from typing import Optional
+from constants import SCENE_FILE_EXTENSION
 
 def open_file_dialog() -> Optional[str]:
     """
@@ -26,4 +27,38 @@ def save_file_dialog() -> Optional[str]:
         ]
     )
 
-    return file_path if file_path else None
\ No newline at end of file
+    return file_path if file_path else None
+
+def open_scene_dialog() -> Optional[str]:
+    """
+    Prompts the user which scene to import
+    """
+    root: Tk = Tk()
+    root.withdraw()
+
+    file_path: str = filedialog.askopenfilename(
+        defaultextension=SCENE_FILE_EXTENSION,
+        filetypes=[
+            ("Scene", f"*{SCENE_FILE_EXTENSION}"),
+            ("All files", "*.*")
+        ]
+    )
+
+    return file_path if file_path else None
+
+def save_scene_dialog() -> Optional[str]:
+    """
+    Prompts the user on where to export the scene
+    """
+    root: Tk = Tk()
+    root.withdraw()
+
+    file_path: str = filedialog.asksaveasfilename(
+        defaultextension=SCENE_FILE_EXTENSION,
+        filetypes=[
+            ("Scene", f"*{SCENE_FILE_EXTENSION}"),
+            ("All files", "*.*")
+        ]
+    )
+
+    return file_path if file_path else None
@@ -17,6 +17,10 @@ def get_instance_properties(class_reference):
         if not isinstance(field, property):
             continue
 
+        # read only properties cannot be edited from the properties tab
+        if field.fset is None:
+            continue
+
         getter_method = getattr(class_reference, field_name).fget
 
         class_data[field_name] = {